@@ -1,31 +1,60 @@
-from enum import Enum, auto
-from typing import Type
+import logging
+from functools import partial
+from pathlib import Path
+from typing import Mapping, Optional, Tuple, Type
 
 import arcade
 import pyglet.gl as gl
 from arcade import SpriteList
-from arcade.gui import UIManager, UILabel
+from arcade.gui import UIManager
 from arcade.gui.ui_style import UIStyle
 
-from CatBurglar.entity.physics import RunnerPhysicsEngine
-from CatBurglar.entity.spawner import EnemySpawner
-from CatBurglar.entity.terrain import AnimatedFloorTile, TILE_SIZE_PX, WIDTH_IN_TILES, HEIGHT_IN_TILES
+from CatBurglar.entity.physics import NARROW_PHASE_POLYGON
+from CatBurglar.entity.pool import DEFAULT_MAX_POOLED_ENEMIES
+from CatBurglar.entity.spawn_profile import SpawnProfile, load_spawn_profile
+from CatBurglar.entity.terrain import TILE_SIZE_PX, WIDTH_IN_TILES, HEIGHT_IN_TILES, GROUND_ANIMATION_TABLE, \
+    GROUND_SCROLL_SPEED_PX_PER_SEC
 from CatBurglar.input.KeyHandler import KeyHandler
 from CatBurglar.graphics.Camera import Camera
-from CatBurglar.entity.Player import Player, MoveState
-from CatBurglar.entity.cop import BasicRunnerCop, Drone
-from CatBurglar.util import StopwatchTimer, CountdownTimer
+from CatBurglar.graphics.interpolation import PositionInterpolator
+from CatBurglar.graphics.layered_renderer import LayeredRenderer, RenderLayer
+from CatBurglar.graphics.pixel_canvas import PixelCanvas
+from CatBurglar.graphics.scrolling_strip import ScrollingStrip
+from CatBurglar.graphics.text_cache import CachedLabel
+from CatBurglar.entity.Player import Player
+from CatBurglar.replay import Replay, ReplayPlayer
+from CatBurglar.simulation import GameSimulation, GameState, SIMULATION_STEP_SEC, check_step
+from CatBurglar.util import CountdownTimer, FixedTimestep
+from CatBurglar.util.asset_registry import ASSET_REGISTRY
+from CatBurglar.util.texture_cache import ASSET_DISK_CACHE
+from CatBurglar.util.texture_dedupe import ENTITY_TEXTURE_DEDUPLICATOR
+
+LOG = logging.getLogger('arcade')
 
 # size of display before viewport scaling
 BASE_WIDTH_PX = WIDTH_IN_TILES * TILE_SIZE_PX
 BASE_HEIGHT_PX = HEIGHT_IN_TILES * TILE_SIZE_PX
 
-# upscaling for viewport size
+# most ticks to catch up on in one frame before letting the game slow down
+MAX_CATCH_UP_STEPS = 5
+
+# starting window size as a multiple of the base size, the scene is drawn
+# at base size and scaled by the largest whole multiple that fits the window
 ZOOM_FACTOR = 4
 SCALED_WIDTH_PX = BASE_WIDTH_PX * ZOOM_FACTOR
 SCALED_HEIGHT_PX = BASE_HEIGHT_PX * ZOOM_FACTOR
 
 
+# most frames per second to update and draw in each game state. the
+# scene is static outside of play, so there's no need to run flat out
+DEFAULT_FRAME_RATE = 60.0
+FRAME_RATE_CAPS = {
+    GameState.INTRO: 20.0,
+    GameState.PLAYING: DEFAULT_FRAME_RATE,
+    GameState.LOST: 20.0,
+    GameState.WON: 20.0
+}
+
 TITLE = "Cat Burglar"
 
 RESIZABLE = False
@@ -42,45 +71,99 @@ def spawn_entities_from_map_layer(
             new_entity.set_position(reference.center_x, reference.center_y)
             destination_list.append(new_entity)
 
-class GameState(Enum):
-    INTRO = auto()
-    PLAYING = auto()
-    LOST = auto()
-    WON = auto()
-
 INTRO_MESSAGE = """
 They framed your cat for illegal stonks trades.
 You're busting her out of jail.
 Avoid the enemies for 2 minutes to escape!
 Press SPACE to start!
 """
+JUMP_HINT_MESSAGE = "Presss SPACE to jump"
+LOST_MESSAGE = "You have failed to escape!\nPress SPACE again to exit."
+WON_MESSAGE = "You have rescued your cat!\nPress SPACE again to exit."
+
+# every message the message box shows, rendered up front so none hitch
+MESSAGES = (INTRO_MESSAGE, JUMP_HINT_MESSAGE, LOST_MESSAGE, WON_MESSAGE, "")
 
 class GameView(arcade.View):
 
-    def __init__(self):
+    def __init__(
+            self,
+            max_pooled_enemies: int = DEFAULT_MAX_POOLED_ENEMIES,
+            seed: Optional[int] = None,
+            replay: Optional[Replay] = None,
+            record_path: Optional[Path] = None,
+            spawn_profile: Optional[SpawnProfile] = None,
+            frame_rate_caps: Optional[Mapping[GameState, float]] = None,
+            narrow_phase: str = NARROW_PHASE_POLYGON
+    ):
+        """
+        :param max_pooled_enemies: most idle enemies of each type to keep for reuse
+        :param seed: seed for the game, random if None
+        :param replay: play this recording back instead of reading the keyboard
+        :param record_path: save a replay of the game here once it ends
+        :param spawn_profile: how enemies spawn, the default profile if None
+        :param frame_rate_caps: most frames per second in each state, FRAME_RATE_CAPS if None
+        :param narrow_phase: NARROW_PHASE_POLYGON or NARROW_PHASE_PIXEL
+        """
         super().__init__()
 
-        self.physics_engine: RunnerPhysicsEngine = None
-        self.wall_list: SpriteList = None
+        self.max_pooled_enemies = max_pooled_enemies
+        self.seed = seed
+        self.spawn_profile = spawn_profile
+        self.narrow_phase = narrow_phase
+        self.replay = replay
+        self.record_path = record_path
+
         self.key_handler: KeyHandler = None
         self.zoom_speed: float = None
-        self.player: Player = None
         self.camera: None = None
-        self.sprite_list: SpriteList = None
-        self.enemy_list: SpriteList = None
+        self.ground: ScrollingStrip = None
 
-        self.global_time_elapsed: StopwatchTimer = None
-        self.enemy_spawner: EnemySpawner = None
+        # the game itself, this view only draws it and handles input
+        self.simulation: GameSimulation = None
 
-        self.message_display_box: UILabel = None
+        # replays carry their tick length, which must be the one we play at
+        if replay is not None:
+            check_step(replay.step)
+        self.timestep = FixedTimestep(SIMULATION_STEP_SEC, MAX_CATCH_UP_STEPS)
+        self.interpolator: PositionInterpolator = None
+
+        # the scene is drawn here at base size, then scaled up in one blit
+        self.canvas: PixelCanvas = None
+        self.renderer: LayeredRenderer = None
+
+        # tick and interpolation alpha of the scene in the canvas, so
+        # frames where nothing moved only blit it again
+        self._canvas_frame: Optional[Tuple[int, float]] = None
+
+        self.frame_rate_caps = dict(FRAME_RATE_CAPS if frame_rate_caps is None else frame_rate_caps)
+        self._paced_state: Optional[GameState] = None
+
+        self.message_display_box: CachedLabel = None
         self.message_timer = CountdownTimer()
 
         self.ui_manager = UIManager()
-        self.game_state: GameState = GameState.INTRO
 
         # kludge to debounce the jump key
         self.game_over_debounce: bool = False
 
+    @property
+    def game_state(self) -> GameState:
+        return self.simulation.game_state
+
+    # shortcuts to the simulation's sprites for drawing
+    @property
+    def player(self) -> Player:
+        return self.simulation.player
+
+    @property
+    def sprite_list(self) -> SpriteList:
+        return self.simulation.sprite_list
+
+    @property
+    def enemy_list(self) -> SpriteList:
+        return self.simulation.enemy_list
+
     def show_message(self, msg: str, duration: float = 2.0):
 
         # Extend timer instead of redrawing text
@@ -94,9 +177,16 @@ class GameView(arcade.View):
 
 
     def setup(self):
+        # load everything up front so the first spawns don't hitch
+        ASSET_REGISTRY.prefetch()
+        ENTITY_TEXTURE_DEDUPLICATOR.log_summary()
+
+        # every asset has been through the disk cache now, so the rest is stale
+        ASSET_DISK_CACHE.prune()
+
         self.ui_manager.purge_ui_elements()
 
-        self.message_display_box = UILabel(
+        self.message_display_box = CachedLabel(
             INTRO_MESSAGE,
             center_x=BASE_WIDTH_PX / 2,
             center_y=3 * (BASE_HEIGHT_PX / 4),
@@ -112,72 +202,96 @@ class GameView(arcade.View):
         self.ui_manager.add_ui_element(
             self.message_display_box
         )
+        self.message_display_box.prewarm(MESSAGES)
 
-        ground_level_y = TILE_SIZE_PX
-        self.sprite_list = arcade.SpriteList()
         self.key_handler = KeyHandler()
 
+        # the keyboard still starts and exits the game during playback
+        if self.replay is not None:
+            controller = ReplayPlayer(self.replay)
+            game_input = controller.input
+            seed = self.replay.seed
+            spawn_profile = load_spawn_profile(self.replay.spawn_profile)
+            invulnerable = self.replay.invulnerable
+            narrow_phase = self.replay.narrow_phase
+        else:
+            controller = None
+            game_input = self.key_handler
+            seed = self.seed
+            spawn_profile = self.spawn_profile
+            invulnerable = False
+            narrow_phase = self.narrow_phase
+
+        self.simulation = GameSimulation(
+            game_input,
+            controller=controller,
+            max_pooled_enemies=self.max_pooled_enemies,
+            seed=seed,
+            spawn_profile=spawn_profile,
+            invulnerable=invulnerable,
+            narrow_phase=narrow_phase
+        )
+        self.simulation.setup()
+
+        if self.record_path is not None:
+            self.simulation.start_recording()
+
+        # the ground scrolls to create the illusion of motion
+        # instead of moving the floor. the player never moves.
+        self.ground = ScrollingStrip(
+            GROUND_ANIMATION_TABLE.get()["ground_left"][0],
+            left=0,
+            bottom=0,
+            width=BASE_WIDTH_PX,
+            height=TILE_SIZE_PX,
+            speed_px_per_sec=GROUND_SCROLL_SPEED_PX_PER_SEC
+        )
 
-        self.player = Player(self.key_handler)
-        self.player.set_position(2 * TILE_SIZE_PX, ground_level_y * 2)
-        self.sprite_list.append(self.player)
-
-        # the ground will animate to create the illusion of motion
-        # instead of moving the floor tiles. the player never moves.
-        self.wall_list = SpriteList(use_spatial_hash=True)
+        self.interpolator = PositionInterpolator(self.sprite_list, self.enemy_list)
 
-        # Enemies will be moving instead of the player and the ground
-        self.enemy_list = SpriteList(use_spatial_hash=False)
+        # every sprite is drawn in one batch, with the ground as the only other draw
+        self.renderer = LayeredRenderer(preload=ENTITY_TEXTURE_DEDUPLICATOR.textures)
+        self.renderer.add_drawable(self.ground, RenderLayer.TERRAIN)
+        self.renderer.add_sprite_list(self.sprite_list, RenderLayer.PLAYER)
+        self.renderer.add_sprite_list(self.enemy_list, RenderLayer.ENEMIES)
+        self.simulation.enemy_spawner.spawn_listeners.append(
+            partial(self.renderer.add_sprite, layer=RenderLayer.ENEMIES)
+        )
+        self._canvas_frame = None
 
-        # game is 2 minutes long
-        self.global_time_elapsed = StopwatchTimer(running=True, maximum=2 * 60.0)
+        self.canvas = PixelCanvas(BASE_WIDTH_PX, BASE_HEIGHT_PX, ctx=self.window.ctx)
 
-        self.enemy_spawner = EnemySpawner(self.enemy_list, self.global_time_elapsed)
+    def pace_frames(self) -> None:
+        """
+        Apply the frame rate cap for the current game state if it changed.
 
-        # create the ground
-        for x_position in range(0, WIDTH_IN_TILES * TILE_SIZE_PX, TILE_SIZE_PX):
-            floor_tile = AnimatedFloorTile()
-            floor_tile.set_position(TILE_SIZE_PX / 2 + x_position, TILE_SIZE_PX / 2)
-            self.wall_list.append(floor_tile)
+        Pyglet draws after every update, so this caps drawing too.
 
-        self.physics_engine = RunnerPhysicsEngine(
-            self.player,
-            self.key_handler,
-            self.enemy_list
-        )
+        :return:
+        """
+        game_state = self.game_state
+        if game_state == self._paced_state:
+            return
+        self._paced_state = game_state
+        self.window.set_update_rate(1 / self.frame_rate_caps.get(game_state, DEFAULT_FRAME_RATE))
 
     def on_update(self, delta_time):
+        self.pace_frames()
 
         if self.game_state == GameState.INTRO and self.key_handler.is_pressed("JUMP"):
-            self.game_state = GameState.PLAYING
-            self.show_message("Presss SPACE to jump")
+            self.simulation.start()
+            self.show_message(JUMP_HINT_MESSAGE)
             return
 
         elif self.game_state == GameState.PLAYING:
 
-            self.global_time_elapsed.update(delta_time=delta_time)
-            self.message_timer.update(delta_time=delta_time)
-
-            # clear messages if need be
-            if self.message_display_box.text and self.message_timer.remaining == 0:
-                self.message_display_box.text = ""
-
-            self.enemy_spawner.update(delta_time=delta_time)
-            self.sprite_list.update()
-            self.enemy_list.update()
+            # run whole simulation ticks for however much time has passed
+            for _ in range(self.timestep.advance(delta_time)):
+                self.interpolator.snapshot()
+                self.simulate_tick()
 
-            collisions = self.physics_engine.update()
-            if collisions:
-                self.game_state = GameState.LOST
-                self.show_message("You have failed to escape!\nPress SPACE again to exit.")
-
-            self.enemy_list.update_animation(delta_time=delta_time)
-            self.sprite_list.update_animation(delta_time=delta_time)
-            self.wall_list.update_animation(delta_time=delta_time)
-
-            if self.global_time_elapsed.completion == 1.0:
-                self.game_state = GameState.WON
-                self.show_message("You have rescued your cat!\nPress SPACE again to exit.")
+                if self.game_state != GameState.PLAYING:
+                    break
 
         elif self.game_state == GameState.LOST:
             if self.key_handler.is_pressed("JUMP"):
@@ -199,16 +313,65 @@ class GameView(arcade.View):
                 self.game_over_debounce = True
 
 
+    def simulate_tick(self):
+        """
+        Advance the game by one tick, along with the UI timers around it.
+
+        :return:
+        """
+        delta_time = self.timestep.step
+        self.message_timer.update(delta_time=delta_time)
+
+        # clear messages if need be
+        if self.message_display_box.text and self.message_timer.remaining == 0:
+            self.message_display_box.text = ""
+
+        game_state = self.simulation.tick()
+        self.ground.update(delta_time=delta_time)
+
+        if game_state != GameState.PLAYING:
+            self.end_game()
+
+        if game_state == GameState.LOST:
+            self.show_message(LOST_MESSAGE)
+        elif game_state == GameState.WON:
+            self.show_message(WON_MESSAGE)
+
+    def end_game(self) -> None:
+        """
+        Save the recording, or check the playback, of a game that just ended.
+
+        :return:
+        """
+        simulation = self.simulation
+
+        if self.record_path is not None:
+            replay = simulation.finish_recording()
+            if replay is not None:
+                replay.save(self.record_path)
+                LOG.info(f"Saved replay of seed {replay.seed} to {self.record_path}")
+
+        if self.replay is not None:
+            if simulation.state_digest() == self.replay.digest:
+                LOG.info("Replay playback matched the recording")
+            else:
+                LOG.warning("Replay playback diverged from the recording")
+
     def on_draw(self):
         arcade.start_render()
 
-        # upscale by 4x
-        arcade.set_viewport(0, SCALED_WIDTH_PX / 4, 0, SCALED_HEIGHT_PX / 4)
-
-        # self.camera.set_viewport()
-        self.sprite_list.draw(filter=gl.GL_NEAREST)
-        self.enemy_list.draw(filter=gl.GL_NEAREST)
-        self.wall_list.draw(filter=gl.GL_NEAREST)
+        # the scene only changes when a tick runs or interpolation moves,
+        # otherwise the last frame in the canvas is still good
+        frame = (self.simulation.ticks, self.timestep.alpha)
+        if frame != self._canvas_frame:
+            # self.camera.set_viewport()
+            with self.canvas.render():
+                with self.interpolator.interpolated(self.timestep.alpha):
+                    self.renderer.draw(filter=gl.GL_NEAREST)
+            self._canvas_frame = frame
+
+        # leaves the projection in base pixels for the UI drawn after us
+        self.canvas.draw_scaled(self.window.get_framebuffer_size())
 
     def on_key_press(self, key, modifiers):
         self.key_handler.on_key_press(key, modifiers)
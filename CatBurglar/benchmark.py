@@ -0,0 +1,405 @@
+"""
+Timing benchmarks for the simulation tick and asset loading.
+
+The tick benchmark holds the enemy count fixed at each of several sizes and
+times every stage of a GameSimulation tick separately, plus the ground
+scrolling GameView runs alongside it. Enemies that leave the screen are
+replaced off the right edge outside the timed stages, so the count never
+drifts. Nothing is drawn, so no window is needed.
+
+The game checks collisions with arcade's polygon test unless told to use
+pixel masks, so the pixel_collision_check stage reruns the collision check
+with the pixel narrow phase over the same sprites for comparison.
+
+The asset benchmark times each preload_* function for every registered
+texture table three ways:
+    - uncached, decoding every file with arcade's load_texture
+    - cold_cache, with the game's load options and an empty disk cache
+    - warm_cache, with the game's load options and a filled disk cache
+
+Results are written as JSON. A previous result can be passed as a baseline
+to flag stages that got slower.
+
+Run it with the catburglar-benchmark command.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from random import Random
+from typing import Any, Callable, Dict, List, Sequence
+
+import pyglet
+
+# no display is needed, so don't let pyglet open its hidden GL window
+pyglet.options["shadow_window"] = False
+
+import arcade
+import numpy as np
+
+from CatBurglar.entity.cop import BasicRunnerCop, Drone
+from CatBurglar.entity.physics import RunnerPhysicsEngine, NARROW_PHASE_PIXEL
+from CatBurglar.entity.terrain import GROUND_ANIMATION_TABLE, GROUND_SCROLL_SPEED_PX_PER_SEC, TILE_SIZE_PX, \
+    WIDTH_IN_TILES, HEIGHT_IN_TILES
+from CatBurglar.graphics.scrolling_strip import ScrollingStrip
+from CatBurglar.input.scripted import ScriptedInput
+from CatBurglar.simulation import GameSimulation, SIMULATION_STEP_SEC
+from CatBurglar.util.asset_loading import (
+    ASSET_LOAD_EXECUTOR,
+    preload_entity_texture_table,
+    preload_entity_texture_alt_skin_table
+)
+from CatBurglar.util.asset_manifest import ASSET_MANIFEST
+from CatBurglar.util.asset_registry import ASSET_REGISTRY
+from CatBurglar.util.texture_cache import TextureDiskCache
+from CatBurglar.util.texture_dedupe import TextureDeduplicator
+
+BENCHMARK_FORMAT_VERSION = 1
+
+DEFAULT_ENEMY_COUNTS = (10, 100, 1000, 10000)
+DEFAULT_TICKS = 200
+DEFAULT_WARMUP_TICKS = 20
+DEFAULT_ASSET_REPEATS = 10
+
+# stages slower than the baseline by more than this fraction are regressions
+DEFAULT_TOLERANCE = 0.25
+
+# differences smaller than this are timer noise, not regressions
+NOISE_FLOOR_US = 50.0
+
+# where enemies are spread and respawned, in px
+SPAWN_X_RANGE = (0.0, (WIDTH_IN_TILES + 2) * TILE_SIZE_PX)
+RESPAWN_X = (WIDTH_IN_TILES + 2) * TILE_SIZE_PX
+
+TICK_STAGES = (
+    "spawner_update",
+    "sprite_list_update",
+    "enemy_list_update",
+    "despawn_offscreen",
+    "physics_update",
+    "pixel_collision_check",
+    "animator_update",
+    "floor_animation_update"
+)
+
+
+def summarize_times(samples_ns: Sequence[int]) -> Dict[str, float]:
+    """
+    Reduce timings to summary statistics in microseconds.
+
+    :param samples_ns: one duration per sample in nanoseconds
+    :return:
+    """
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1000.0
+    return {
+        "mean_us": float(samples.mean()),
+        "median_us": float(np.median(samples)),
+        "p95_us": float(np.percentile(samples, 95)),
+        "max_us": float(samples.max())
+    }
+
+
+def _spawn_enemy(simulation: GameSimulation, rng: Random, x: float) -> None:
+    if rng.random() > 0.5:
+        enemy = simulation.enemy_spawner.pool.acquire(BasicRunnerCop, x, TILE_SIZE_PX * 2, rng)
+    else:
+        y = rng.uniform(TILE_SIZE_PX * 1.5, TILE_SIZE_PX * HEIGHT_IN_TILES)
+        enemy = simulation.enemy_spawner.pool.acquire(Drone, x, y, rng)
+    simulation.enemy_spawner.add(enemy)
+
+
+def benchmark_ticks(
+        enemy_count: int,
+        ticks: int = DEFAULT_TICKS,
+        warmup_ticks: int = DEFAULT_WARMUP_TICKS,
+        seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Time every stage of the tick with a fixed number of enemies alive.
+
+    :param enemy_count: how many enemies to keep on screen
+    :param ticks: how many ticks to time
+    :param warmup_ticks: ticks to run untimed first
+    :param seed: seed for the simulation and enemy placement
+    :return: per-stage and whole-tick timing summaries
+    """
+    rng = Random(seed)
+    simulation = GameSimulation(ScriptedInput(), seed=seed)
+    simulation.setup()
+    simulation.start()
+
+    # shares the player and enemies, but keeps its own broad phase
+    pixel_engine = RunnerPhysicsEngine(
+        simulation.player,
+        simulation.key_handler,
+        simulation.enemy_list,
+        narrow_phase=NARROW_PHASE_PIXEL
+    )
+    simulation.enemy_spawner.spawn_listeners.append(pixel_engine.broad_phase.insert)
+    simulation.enemy_spawner.despawn_listeners.append(pixel_engine.broad_phase.remove_all)
+
+    for _ in range(enemy_count):
+        _spawn_enemy(simulation, rng, rng.uniform(*SPAWN_X_RANGE))
+
+    ground = ScrollingStrip(
+        GROUND_ANIMATION_TABLE.get()["ground_left"][0],
+        left=0,
+        bottom=0,
+        width=WIDTH_IN_TILES * TILE_SIZE_PX,
+        speed_px_per_sec=GROUND_SCROLL_SPEED_PX_PER_SEC
+    )
+
+    stages: Dict[str, Callable[[], Any]] = {
+        "spawner_update": lambda: simulation.enemy_spawner.update(delta_time=SIMULATION_STEP_SEC),
+        "sprite_list_update": simulation.sprite_list.update,
+        "enemy_list_update": simulation.enemy_list.update,
+        "despawn_offscreen": simulation.enemy_spawner.despawn_offscreen,
+        "physics_update": lambda: simulation.physics_engine.update(),
+        "pixel_collision_check": pixel_engine.check_for_enemy_collisions,
+        "animator_update": lambda: simulation.animator.update(delta_time=SIMULATION_STEP_SEC),
+        "floor_animation_update": lambda: ground.update(delta_time=SIMULATION_STEP_SEC)
+    }
+
+    samples: Dict[str, List[int]] = {name: [] for name in TICK_STAGES}
+    totals: List[int] = []
+    candidates: List[int] = []
+    perf_counter_ns = time.perf_counter_ns
+
+    for tick in range(warmup_ticks + ticks):
+        tick_start = perf_counter_ns()
+        for name in TICK_STAGES:
+            stage_start = perf_counter_ns()
+            stages[name]()
+            if tick >= warmup_ticks:
+                samples[name].append(perf_counter_ns() - stage_start)
+        if tick >= warmup_ticks:
+            totals.append(perf_counter_ns() - tick_start)
+            candidates.append(simulation.physics_engine.last_candidate_count)
+
+        # keep the count fixed, outside of the timed stages
+        for _ in range(enemy_count - len(simulation.enemy_list)):
+            _spawn_enemy(simulation, rng, RESPAWN_X + rng.uniform(0.0, TILE_SIZE_PX))
+
+    return {
+        "enemies": enemy_count,
+        "ticks": ticks,
+        "mean_collision_candidates": float(np.mean(candidates)),
+        "tick": summarize_times(totals),
+        "stages": {name: summarize_times(samples[name]) for name in TICK_STAGES}
+    }
+
+
+def _time_loads(load: Callable[[], Any], repeats: int, before: Callable[[], Any] = None) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        if before is not None:
+            before()
+        start = time.perf_counter_ns()
+        load()
+        samples.append(time.perf_counter_ns() - start)
+    return summarize_times(samples)
+
+
+def benchmark_asset_loading(repeats: int = DEFAULT_ASSET_REPEATS) -> Dict[str, Any]:
+    """
+    Time the preload_* function of every registered texture table.
+
+    :param repeats: how many times to load each table per mode
+    :return: timing summaries by table name and mode
+    """
+    results = {}
+
+    for name, spec in ASSET_REGISTRY.texture_table_specs.items():
+        preload = preload_entity_texture_alt_skin_table if spec.alt_skins else preload_entity_texture_table
+
+        def load_with(**options) -> Callable[[], Any]:
+            return lambda: preload(spec.path, spec.required_state_subgroups, **options)
+
+        def game_options(cache: TextureDiskCache) -> Dict[str, Any]:
+            # fresh deduplicator so earlier repeats can't help
+            return dict(
+                executor=ASSET_LOAD_EXECUTOR,
+                texture_loader=cache,
+                manifest=ASSET_MANIFEST,
+                deduplicator=TextureDeduplicator()
+            )
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = TextureDiskCache(cache_dir)
+
+            timings = {
+                "function": preload.__name__,
+                "uncached": _time_loads(
+                    load_with(),
+                    repeats,
+                    before=arcade.cleanup_texture_cache
+                ),
+                "cold_cache": _time_loads(
+                    lambda: load_with(**game_options(cache))(),
+                    repeats,
+                    before=cache.clear
+                ),
+                "warm_cache": _time_loads(
+                    lambda: load_with(**game_options(cache))(),
+                    repeats
+                )
+            }
+
+        results[name] = timings
+
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "arcade": arcade.__version__,
+        "numpy": np.__version__
+    }
+
+
+def run_benchmarks(
+        enemy_counts: Sequence[int] = DEFAULT_ENEMY_COUNTS,
+        ticks: int = DEFAULT_TICKS,
+        asset_repeats: int = DEFAULT_ASSET_REPEATS
+) -> Dict[str, Any]:
+    """
+    Run the whole suite.
+
+    :param enemy_counts: enemy counts to time ticks at
+    :param ticks: how many ticks to time at each count
+    :param asset_repeats: how many times to load each table per mode
+    :return: the JSON-serializable results
+    """
+    return {
+        "format_version": BENCHMARK_FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "tick_benchmarks": {
+            str(count): benchmark_ticks(count, ticks) for count in enemy_counts
+        },
+        "asset_loading": benchmark_asset_loading(asset_repeats)
+    }
+
+
+def compare_to_baseline(
+        results: Dict[str, Any],
+        baseline: Dict[str, Any],
+        tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """
+    Find stages whose median time regressed past the tolerance.
+
+    :param results: results from run_benchmarks
+    :param baseline: earlier results to compare against
+    :param tolerance: allowed slowdown as a fraction of the baseline
+    :return: one description per regression
+    """
+    regressions = []
+
+    def check(label: str, current: Dict[str, float], previous: Dict[str, float]) -> None:
+        now = current["median_us"]
+        before = previous["median_us"]
+        if now - before > NOISE_FLOOR_US and now > before * (1 + tolerance):
+            regressions.append(f"{label}: {before:.1f}us -> {now:.1f}us ({now / before - 1:+.0%})")
+
+    baseline_ticks = baseline.get("tick_benchmarks", {})
+    for count, current in results["tick_benchmarks"].items():
+        previous = baseline_ticks.get(count)
+        if previous is None:
+            continue
+        check(f"{count} enemies, whole tick", current["tick"], previous["tick"])
+        for stage, timings in current["stages"].items():
+            if stage in previous["stages"]:
+                check(f"{count} enemies, {stage}", timings, previous["stages"][stage])
+
+    baseline_assets = baseline.get("asset_loading", {})
+    for name, current in results["asset_loading"].items():
+        previous = baseline_assets.get(name, {})
+        for mode in ("uncached", "cold_cache", "warm_cache"):
+            if mode in previous:
+                check(f"{name} loading, {mode}", current[mode], previous[mode])
+
+    return regressions
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    for count, result in results["tick_benchmarks"].items():
+        tick = result["tick"]
+        print(
+            f"{count:>6} enemies: tick median {tick['median_us']:9.1f}us"
+            f"  p95 {tick['p95_us']:9.1f}us"
+            f"  ({result['mean_collision_candidates']:.1f} collision candidates)"
+        )
+        for stage, timings in result["stages"].items():
+            print(f"         {stage:<24} {timings['median_us']:9.1f}us")
+
+    for name, timings in results["asset_loading"].items():
+        print(
+            f"{name:>8} {timings['function']}:"
+            + "".join(
+                f"  {mode} {timings[mode]['median_us'] / 1000:.1f}ms"
+                for mode in ("uncached", "cold_cache", "warm_cache")
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the simulation tick and asset loading, optionally against a baseline."
+    )
+    parser.add_argument(
+        "-e", "--enemies",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_ENEMY_COUNTS),
+        help="enemy counts to time ticks at"
+    )
+    parser.add_argument("-t", "--ticks", type=int, default=DEFAULT_TICKS, help="ticks to time per count")
+    parser.add_argument(
+        "-r", "--asset-repeats",
+        type=int,
+        default=DEFAULT_ASSET_REPEATS,
+        help="loads per table and mode"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="write the results here as JSON")
+    parser.add_argument("-b", "--baseline", type=Path, help="compare against earlier results")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed slowdown against the baseline, as a fraction"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.enemies, args.ticks, args.asset_repeats)
+    print_results(results)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"Wrote results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,13 @@ from arcade import PhysicsEngineSimple, PhysicsEnginePlatformer
 
 from CatBurglar.entity import REQUIRED_FOR_ACTORS, Actor, WALK_LEFT, WALK_RIGHT, STILL_RIGHT, STILL_LEFT
 from CatBurglar.input.KeyHandler import KeyHandler
-from CatBurglar.util.asset_loading import ASSET_BASE_PATH, preload_entity_texture_table
+from CatBurglar.util.asset_loading import ASSET_BASE_PATH
+from CatBurglar.util.asset_registry import ASSET_REGISTRY
 
 GORILLA_SPRITE_PATH = ASSET_BASE_PATH / "gorilla"
 
-GORILLA_TEXTURES = preload_entity_texture_table(
+GORILLA_TEXTURES = ASSET_REGISTRY.register_texture_table(
+    "gorilla",
     GORILLA_SPRITE_PATH,
     REQUIRED_FOR_ACTORS
 )
@@ -26,7 +28,7 @@ class Player(Actor):
 
     def __init__(self, key_handler: KeyHandler, physics_engine: PhysicsEnginePlatformer = None):
         super().__init__(
-           animations=GORILLA_TEXTURES,
+           animations=GORILLA_TEXTURES.get(),
             default_animation="catwalk_right"
         )
 
@@ -40,16 +42,23 @@ class Player(Actor):
         self.jump_speed = 10
         self._move_state = MoveState.RUNNING
 
+        # resolved once so state changes don't need string lookups
+        self._running_animation_id = self.animations.state_id("catwalk_right")
+        self._airborne_animation_id = self.animations.state_id("catstill_right")
+
     @property
     def move_state(self) -> MoveState:
         return self._move_state
 
     @move_state.setter
     def move_state(self, new_state):
-        if new_state == MoveState.RUNNING:
-            self.current_animation_name = "catwalk_right"
+        if new_state is self._move_state:
+            return
+
+        if new_state is MoveState.RUNNING:
+            self.current_animation_id = self._running_animation_id
         else:
-            self.current_animation_name = "catstill_right"
+            self.current_animation_id = self._airborne_animation_id
 
         self._move_state = new_state
 
@@ -8,9 +8,10 @@ This includes the following:
     - Actor, the baseclass for mobile and other game entities
 
 """
+import random
 from collections import defaultdict
-from random import choice
-from typing import List, Tuple
+from random import Random
+from typing import List, Tuple, TYPE_CHECKING
 
 from arcade import Sprite
 from arcade import SpriteList
@@ -19,6 +20,10 @@ from CatBurglar.util import CountdownTimer
 # Typing annotation that describes a generic mapping
 # froms string to list of textures.
 from CatBurglar.util.asset_loading import AnimationStateDict
+from CatBurglar.util.animation_table import CompiledAnimationTable, compile_animation_table
+
+if TYPE_CHECKING:
+    from CatBurglar.entity.animation import BatchAnimator
 
 """
 
@@ -97,23 +102,61 @@ class NamedAnimationsSprite(Sprite):
         self.frame_timer.remaining = self.frame_length
         self.update_animation(0.0)
 
+        # keep the batch's copy of our state current
+        if self.animator is not None:
+            self.animator.sync(self)
+
+    def reset_animations(self):
+        """
+        Return to the default animation as if freshly created.
+
+        Sprites built from an alt table pick a new skin as well.
+
+        :return:
+        """
+        if self.alt_table:
+            self.animations = compile_animation_table(self.rng.choice(self.alt_table))
+
+        # force the setter to reload frames even if the name is unchanged
+        self._current_animation_id = -1
+        self.current_animation_name = self.default_animation
+
+    def remove_from_sprite_lists(self):
+        if self.animator is not None:
+            self.animator.remove(self)
+        super().remove_from_sprite_lists()
+
     @property
-    def current_animation_name(self):
-        return self._current_animation_name
+    def current_animation_id(self) -> int:
+        return self._current_animation_id
+
+    @current_animation_id.setter
+    def current_animation_id(self, new_animation_id: int) -> None:
+        if self._current_animation_id != new_animation_id:
+            self._current_animation_id = new_animation_id
+            self.current_animation_frames = self.animations.frames[new_animation_id]
+            self.reset_animation_to_start()
+
+    @property
+    def current_animation_name(self) -> str:
+        return self.animations.names[self._current_animation_id]
 
     @current_animation_name.setter
-    def current_animation_name(self, new_animation_name: str) -> str:
-        if self._current_animation_name != new_animation_name:
-            self._current_animation_name = new_animation_name
-            self.current_animation_frames = self.animations[new_animation_name]
-            self.reset_animation_to_start()
+    def current_animation_name(self, new_animation_name: str) -> None:
+        self.current_animation_id = self.animations.state_id(new_animation_name)
 
     @property
     def animation_expiring(self) -> bool:
         """
         Convenience property to tell when the animation is about to end
+
+        An animator ticking this sprite keeps the live timer, so it's asked
+        instead of our own frame_timer, which it doesn't update.
         :return:
         """
+        if self.animator is not None:
+            return self.animator.animation_expiring(self)
+
         return\
             self.frame_timer.remaining <= self.frame_length\
             and\
@@ -125,26 +168,39 @@ class NamedAnimationsSprite(Sprite):
             alt_table: List[AnimationStateDict] = None,
             default_animation: str = STILL_RIGHT,
             current_animation_name: str = None,
-            frame_length: float = 1 / 48
+            frame_length: float = 1 / 48,
+            rng: Random = None
     ):
         """
 
         Build a stateful animated sprite.
 
+        Plain dicts passed as animations are compiled into integer-indexed
+        tables here. Passing tables that are already compiled, such as the
+        ones from the asset registry, skips that work.
+
         :param animations: a dict mapping strings to lists of frames
         :param alt_table: a list of animation dicts to choose from
         :param default_animation: which animation will be displayed first
         :param current_animation_name: the name of the current animation
         :param frame_length: how long frames should be displayed for
+        :param rng: random source for picking skins, the random module by default
         """
         super().__init__()
 
-        self.animations: AnimationStateDict = {}
+        # a seeded Random here makes skin choice reproducible
+        self.rng: Random = rng if rng is not None else random
+
+        self.animations: CompiledAnimationTable = None
+
+        # kept so reset_animations can pick a fresh skin
+        self.alt_table: List[AnimationStateDict] = None
 
         if animations:
-            self.animations = animations
+            self.animations = compile_animation_table(animations)
         elif alt_table:
-            self.animations = choice(alt_table)
+            self.alt_table = alt_table
+            self.animations = compile_animation_table(self.rng.choice(alt_table))
         else:
             raise ValueError(
                 "One of the following must be passed:"\
@@ -153,11 +209,15 @@ class NamedAnimationsSprite(Sprite):
 
         self.frame_timer = CountdownTimer()
 
+        # set when a BatchAnimator takes over ticking this sprite's frames
+        self.animator: "BatchAnimator" = None
+        self.animator_slot: int = -1
+
         self.frame_length: float = frame_length
         self.current_animation_frame_index = 0
         self.default_animation: str = default_animation
 
-        self._current_animation_name = None
+        self._current_animation_id = -1
         self.current_animation_name: str =\
             current_animation_name or default_animation
 
@@ -215,7 +275,8 @@ class Actor(NamedAnimationsSprite):
             default_animation: str = STILL_RIGHT,
             current_animation_name: str = None,
             frame_length: float = 1 / 12,
-            stillness_threshold: float = 0.5
+            stillness_threshold: float = 0.5,
+            rng: Random = None
     ):
         """
 
@@ -224,6 +285,7 @@ class Actor(NamedAnimationsSprite):
         :param default_animation: which animation will be displayed first
         :param current_animation_name: the name of the current animation
         :param frame_length: how long frames should be displayed for
+        :param rng: random source for picking skins, the random module by default
          """
         # used for movement detection
         self._moving = True
@@ -238,7 +300,8 @@ class Actor(NamedAnimationsSprite):
             alt_table=alt_table,
             default_animation=default_animation,
             current_animation_name=current_animation_name,
-            frame_length=frame_length
+            frame_length=frame_length,
+            rng=rng
         )
 
     def update(self):
@@ -0,0 +1,159 @@
+"""
+Batched animation for large numbers of NamedAnimationsSprites.
+
+Instead of every sprite ticking its own CountdownTimer in Python, frame
+timers, frame indices and frame counts for every registered sprite are kept
+in NumPy arrays and advanced together in a single vectorized step. Only
+sprites whose frame actually changed are touched afterwards.
+"""
+from typing import List
+
+import numpy as np
+
+from CatBurglar.entity import NamedAnimationsSprite
+
+DEFAULT_CAPACITY = 64
+
+
+class BatchAnimator:
+    """
+    Advances the animations of every registered sprite at once.
+
+    Sprites keep their current animation frames and default behavior, so
+    changing animations by name still works as before. The animator only
+    takes over the per-frame ticking that update_animation used to do.
+
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        :param capacity: how many sprites to allocate room for up front
+        """
+        self._sprites: List[NamedAnimationsSprite] = []
+
+        self._remaining = np.zeros(capacity, dtype=np.float64)
+        self._frame_length = np.zeros(capacity, dtype=np.float64)
+        self._frame_index = np.zeros(capacity, dtype=np.int32)
+        self._frame_count = np.ones(capacity, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def __contains__(self, sprite: NamedAnimationsSprite) -> bool:
+        return sprite.animator is self
+
+    def _grow(self) -> None:
+        new_capacity = max(DEFAULT_CAPACITY, len(self._remaining) * 2)
+        for name in ("_remaining", "_frame_length", "_frame_index", "_frame_count"):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, sprite: NamedAnimationsSprite) -> None:
+        """
+        Start animating a sprite as part of this batch.
+
+        :param sprite: the sprite to animate
+        :return:
+        """
+        if sprite.animator is self:
+            return
+        if sprite.animator is not None:
+            sprite.animator.remove(sprite)
+
+        if len(self._sprites) == len(self._remaining):
+            self._grow()
+
+        sprite.animator = self
+        sprite.animator_slot = len(self._sprites)
+        self._sprites.append(sprite)
+        self.sync(sprite)
+
+    def remove(self, sprite: NamedAnimationsSprite) -> None:
+        """
+        Stop animating a sprite, moving the last sprite into its slot.
+
+        :param sprite: the sprite to stop animating
+        :return:
+        """
+        if sprite.animator is not self:
+            return
+
+        slot = sprite.animator_slot
+        last_slot = len(self._sprites) - 1
+
+        if slot != last_slot:
+            moved = self._sprites[last_slot]
+            self._sprites[slot] = moved
+            moved.animator_slot = slot
+            for array in (self._remaining, self._frame_length, self._frame_index, self._frame_count):
+                array[slot] = array[last_slot]
+
+        self._sprites.pop()
+        sprite.animator = None
+        sprite.animator_slot = -1
+
+    def sync(self, sprite: NamedAnimationsSprite) -> None:
+        """
+        Copy a sprite's animation state into the arrays.
+
+        Sprites call this themselves whenever they switch animations.
+
+        :param sprite: a sprite already in this batch
+        :return:
+        """
+        slot = sprite.animator_slot
+        self._remaining[slot] = sprite.frame_timer.remaining
+        self._frame_length[slot] = sprite.frame_length
+        self._frame_index[slot] = sprite.current_animation_frame_index
+        self._frame_count[slot] = len(sprite.current_animation_frames)
+
+    def animation_expiring(self, sprite: NamedAnimationsSprite) -> bool:
+        """
+        NamedAnimationsSprite.animation_expiring from the batch's timers.
+
+        :param sprite: a sprite already in this batch
+        :return:
+        """
+        slot = sprite.animator_slot
+        return bool(
+            self._remaining[slot] <= self._frame_length[slot]
+            and self._frame_index[slot] + 1 >= self._frame_count[slot]
+        )
+
+    def update(self, delta_time: float = 1 / 60) -> None:
+        """
+        Advance every animation by delta_time in one step.
+
+        :param delta_time: how much time has passed
+        :return:
+        """
+        count = len(self._sprites)
+        if not count or not delta_time:
+            return
+
+        remaining = self._remaining[:count]
+        remaining -= delta_time
+
+        expired = remaining <= 0.0
+        if not expired.any():
+            return
+
+        # timers that ran out restart whether or not there's a next frame
+        remaining[expired] = self._frame_length[:count][expired]
+
+        # only update frames if there's more than one frame
+        advancing = expired & (self._frame_count[:count] > 1)
+        slots = np.flatnonzero(advancing)
+        if not len(slots):
+            return
+
+        frame_index = self._frame_index
+        frame_index[slots] = (frame_index[slots] + 1) % self._frame_count[slots]
+
+        sprites = self._sprites
+        for slot, next_frame_index in zip(slots.tolist(), frame_index[slots].tolist()):
+            sprite = sprites[slot]
+            sprite.current_animation_frame_index = next_frame_index
+            sprite.texture = sprite.current_animation_frames[next_frame_index]
+
@@ -0,0 +1,642 @@
+"""
+Broad phase collision indexes for the player vs enemy check.
+
+Enemies only move left along a few lanes while the player stays at a fixed
+x, so most enemies are nowhere near the player on any given tick. An index
+that narrows the enemy set down to those overlapping the player's x range
+means only a handful of sprites ever reach arcade's polygon test.
+
+Two interchangeable indexes are provided. Both are told about spawns and
+despawns through insert() and remove_all(), usually hooked up to the
+EnemySpawner, advance once per tick in update(), and return candidates
+overlapping a box from query():
+    - SweepAndPruneIndex, a sorted list of left edges searched by bisection
+    - AABBArrayIndex, NumPy arrays of positions with a slot per sprite,
+      tested in a single vectorized comparison
+
+Bounds are taken from texture extents rather than hit boxes, and cover
+everywhere a sprite has been since the previous tick. They always contain
+the hit box, so the broad phase never drops a real collision, even one that
+only happened partway through a tick.
+
+For the narrow phase, pixel_masks_collide is a pixel-exact alternative to
+arcade's polygon test that uses masks kept with the animation tables. Either
+can be run over a whole tick's movement with swept_collide, so that fast
+sprites or long ticks can't carry an enemy through the player unnoticed.
+swept_collide_path does the same for a sprite that moved more than once
+during the tick, as the player does.
+"""
+from math import ceil
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from arcade import Sprite, check_for_collision
+
+from CatBurglar.util.animation_table import CompiledAnimationTable
+from CatBurglar.util.pixel_mask import PixelMask, mask_for_texture, pixel_origin
+
+# left, right, bottom, top
+Bounds = Tuple[float, float, float, float]
+
+# center x, center y
+Position = Tuple[float, float]
+
+# takes two sprites at their current positions, returns whether they touch
+NarrowPhaseTest = Callable[[Sprite, Sprite], bool]
+
+DEFAULT_INDEX_CAPACITY = 64
+
+
+def sprite_bounds(sprite: Sprite) -> Bounds:
+    half_width = sprite.width / 2
+    half_height = sprite.height / 2
+    center_x, center_y = sprite.position
+    return (
+        center_x - half_width,
+        center_x + half_width,
+        center_y - half_height,
+        center_y + half_height
+    )
+
+
+def sprite_swept_bounds(sprite: Sprite) -> Bounds:
+    """
+    Bounds covering a sprite both now and before its last update.
+
+    Sprites move by change_x and change_y once per update, so the previous
+    position is recovered by stepping back by one tick of velocity.
+
+    :param sprite: any sprite
+    :return:
+    """
+    left, right, bottom, top = sprite_bounds(sprite)
+    change_x = sprite.change_x
+    change_y = sprite.change_y
+    return (
+        left - max(change_x, 0.0),
+        right - min(change_x, 0.0),
+        bottom - max(change_y, 0.0),
+        top - min(change_y, 0.0)
+    )
+
+
+def union_bounds(a: Bounds, b: Bounds) -> Bounds:
+    return min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3])
+
+
+def swept_bounds_arrays(
+        centers: np.ndarray,
+        half_sizes: np.ndarray,
+        changes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    sprite_swept_bounds for many sprites at once.
+
+    :param centers: one row of center x, center y per sprite
+    :param half_sizes: one row of half width, half height per sprite
+    :param changes: one row of change_x, change_y per sprite
+    :return: arrays of left, right, bottom and top edges
+    """
+    change_x = changes[:, 0]
+    change_y = changes[:, 1]
+    return (
+        centers[:, 0] - half_sizes[:, 0] - np.maximum(change_x, 0.0),
+        centers[:, 0] + half_sizes[:, 0] - np.minimum(change_x, 0.0),
+        centers[:, 1] - half_sizes[:, 1] - np.maximum(change_y, 0.0),
+        centers[:, 1] + half_sizes[:, 1] - np.minimum(change_y, 0.0)
+    )
+
+
+def _grown(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class SweepAndPruneIndex:
+    """
+    Keeps sprites sorted by the left edge of their swept bounds.
+
+    Spawns are slotted into place by bisection and despawns are cut out,
+    so the order carries over from tick to tick. Positions are mirrored
+    into NumPy arrays and advanced by each sprite's velocity, and since
+    enemies barely move relative to each other, update() only has to
+    move the few that fell out of order. Queries bisect into the sorted
+    edges and only test the slice that can overlap.
+
+    Indexed sprites must only move by their change_x and change_y once per
+    tick, as enemies do, since positions aren't read back from them.
+
+    """
+    def __init__(self, sprite_list: Iterable[Sprite] = ()):
+        """
+        :param sprite_list: sprites to start with, such as the enemy list
+        """
+        self._sprites: List[Sprite] = []
+        self._members: Set[Sprite] = set()
+
+        # one row per sprite, in the same order as _sprites
+        self._centers = np.empty((0, 2), dtype=np.float64)
+        self._half_sizes = np.empty((0, 2), dtype=np.float64)
+        self._changes = np.empty((0, 2), dtype=np.float64)
+        self._left_edges = np.empty(0, dtype=np.float64)
+
+        # widest swept bounds seen, used to bound how far left a query must look
+        self._max_width = 0.0
+
+        for sprite in sprite_list:
+            self.insert(sprite)
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def insert(self, sprite: Sprite) -> None:
+        """
+        Start tracking a sprite, placing it in order from where it is now.
+
+        :param sprite: a sprite that has just spawned
+        :return:
+        """
+        if sprite in self._members:
+            return
+        left_edge, right_edge = sprite_swept_bounds(sprite)[:2]
+        index = int(np.searchsorted(self._left_edges, left_edge, side="right"))
+
+        self._members.add(sprite)
+        self._sprites.insert(index, sprite)
+        self._centers = np.insert(self._centers, index, sprite.position, axis=0)
+        self._half_sizes = np.insert(self._half_sizes, index, (sprite.width / 2, sprite.height / 2), axis=0)
+        self._changes = np.insert(self._changes, index, (sprite.change_x, sprite.change_y), axis=0)
+        self._left_edges = np.insert(self._left_edges, index, left_edge)
+        self._max_width = max(self._max_width, right_edge - left_edge)
+
+    def remove_all(self, sprites: Iterable[Sprite]) -> None:
+        """
+        Stop tracking sprites.
+
+        :param sprites: sprites that have despawned
+        :return:
+        """
+        members = self._members
+        own_sprites = self._sprites
+
+        # despawns leave past the left edge, so they're found near the front
+        indices = []
+        for sprite in sprites:
+            if sprite in members:
+                members.discard(sprite)
+                indices.append(own_sprites.index(sprite))
+        if not indices:
+            return
+
+        indices.sort(reverse=True)
+        for index in indices:
+            del own_sprites[index]
+
+        self._centers = np.delete(self._centers, indices, axis=0)
+        self._half_sizes = np.delete(self._half_sizes, indices, axis=0)
+        self._changes = np.delete(self._changes, indices, axis=0)
+        self._left_edges = np.delete(self._left_edges, indices)
+
+    def update(self) -> None:
+        """
+        Move every tracked sprite by one tick of its velocity, then repair
+        the order.
+
+        Call once per tick after the indexed sprites have moved.
+
+        :return:
+        """
+        if not self._sprites:
+            return
+
+        self._centers += self._changes
+        left_edges = swept_bounds_arrays(self._centers, self._half_sizes, self._changes)[0]
+        self._left_edges = left_edges
+
+        # out of place if anything before it starts further right
+        displaced = left_edges < np.maximum.accumulate(left_edges)
+        if displaced.any():
+            self._reinsert(displaced)
+
+    def _reinsert(self, displaced: np.ndarray) -> None:
+        """
+        Insertion sort pass, done as a merge of the displaced sprites back
+        into the ones still in order.
+
+        :param displaced: mask of sprites that are out of place
+        :return:
+        """
+        left_edges = self._left_edges
+        in_order = np.flatnonzero(~displaced)
+        moved = np.flatnonzero(displaced)
+        moved = moved[np.argsort(left_edges[moved], kind="stable")]
+
+        slots = np.searchsorted(left_edges[in_order], left_edges[moved], side="right")
+        order = np.insert(in_order, slots, moved)
+
+        sprites = self._sprites
+        self._sprites = [sprites[index] for index in order.tolist()]
+        self._centers = self._centers[order]
+        self._half_sizes = self._half_sizes[order]
+        self._changes = self._changes[order]
+        self._left_edges = left_edges[order]
+
+    def query(
+            self,
+            left: float,
+            right: float,
+            bottom: float = float("-inf"),
+            top: float = float("inf")
+    ) -> List[Sprite]:
+        """
+        Get every indexed sprite whose bounds overlap the passed box.
+
+        Only the x range narrows the search. The rest of the box is checked
+        on whatever the x range lets through.
+
+        :param left: left edge of the query box
+        :param right: right edge of the query box
+        :param bottom: bottom edge of the query box
+        :param top: top edge of the query box
+        :return:
+        """
+        left_edges = self._left_edges
+
+        # nothing starting further left than this can reach the range
+        start = int(np.searchsorted(left_edges, left - self._max_width, side="left"))
+        end = int(np.searchsorted(left_edges, right, side="right"))
+        if start >= end:
+            return []
+
+        rights, bottoms, tops = swept_bounds_arrays(
+            self._centers[start:end],
+            self._half_sizes[start:end],
+            self._changes[start:end]
+        )[1:]
+        overlapping = np.flatnonzero((rights >= left) & (bottoms <= top) & (tops >= bottom))
+
+        sprites = self._sprites
+        return [sprites[start + index] for index in overlapping.tolist()]
+
+
+class AABBArrayIndex:
+    """
+    Mirrors sprite positions into persistent NumPy arrays, one slot each.
+
+    Slots are handed out as sprites spawn and freed as they despawn, so no
+    per-sprite Python work happens on ticks where nothing comes or goes.
+    Each tick the stored centers are advanced by the stored velocities in
+    one step, and a query is a single vectorized overlap test with only
+    the hits read back as sprites.
+
+    Indexed sprites must only move by their change_x and change_y once per
+    tick, as enemies do, since positions aren't read back from them.
+
+    """
+    def __init__(self, sprite_list: Iterable[Sprite] = (), capacity: int = DEFAULT_INDEX_CAPACITY):
+        """
+        :param sprite_list: sprites to start with, such as the enemy list
+        :param capacity: how many sprites to allocate room for up front
+        """
+        self._sprites: List[Optional[Sprite]] = [None] * capacity
+        self._slots: Dict[Sprite, int] = {}
+        self._free_slots: List[int] = list(range(capacity - 1, -1, -1))
+
+        self._live = np.zeros(capacity, dtype=bool)
+        self._centers = np.zeros((capacity, 2), dtype=np.float64)
+        self._half_sizes = np.zeros((capacity, 2), dtype=np.float64)
+        self._changes = np.zeros((capacity, 2), dtype=np.float64)
+
+        for sprite in sprite_list:
+            self.insert(sprite)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _grow(self) -> None:
+        old_capacity = len(self._live)
+        new_capacity = max(DEFAULT_INDEX_CAPACITY, old_capacity * 2)
+        for name in ("_live", "_centers", "_half_sizes", "_changes"):
+            setattr(self, name, _grown(getattr(self, name), new_capacity))
+
+        self._sprites.extend([None] * (new_capacity - old_capacity))
+        self._free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+    def insert(self, sprite: Sprite) -> None:
+        """
+        Start tracking a sprite from where it is now.
+
+        :param sprite: a sprite that has just spawned
+        :return:
+        """
+        if sprite in self._slots:
+            return
+        if not self._free_slots:
+            self._grow()
+
+        slot = self._free_slots.pop()
+        self._slots[sprite] = slot
+        self._sprites[slot] = sprite
+
+        self._live[slot] = True
+        self._centers[slot] = sprite.position
+        self._half_sizes[slot] = sprite.width / 2, sprite.height / 2
+        self._changes[slot] = sprite.change_x, sprite.change_y
+
+    def remove_all(self, sprites: Iterable[Sprite]) -> None:
+        """
+        Stop tracking sprites, freeing their slots.
+
+        :param sprites: sprites that have despawned
+        :return:
+        """
+        for sprite in sprites:
+            slot = self._slots.pop(sprite, None)
+            if slot is None:
+                continue
+            self._sprites[slot] = None
+            self._live[slot] = False
+            self._free_slots.append(slot)
+
+    def update(self) -> None:
+        """
+        Move every tracked sprite by one tick of its velocity.
+
+        Call once per tick after the indexed sprites have moved.
+
+        :return:
+        """
+        if self._slots:
+            self._centers += self._changes
+
+    def query(
+            self,
+            left: float,
+            right: float,
+            bottom: float = float("-inf"),
+            top: float = float("inf")
+    ) -> List[Sprite]:
+        """
+        Get every indexed sprite whose bounds overlap the passed box.
+
+        :param left: left edge of the query box
+        :param right: right edge of the query box
+        :param bottom: bottom edge of the query box
+        :param top: top edge of the query box
+        :return:
+        """
+        if not self._slots:
+            return []
+
+        lefts, rights, bottoms, tops = swept_bounds_arrays(self._centers, self._half_sizes, self._changes)
+        overlapping = np.flatnonzero(
+            self._live
+            & (lefts <= right)
+            & (rights >= left)
+            & (bottoms <= top)
+            & (tops >= bottom)
+        )
+
+        sprites = self._sprites
+        return [sprites[slot] for slot in overlapping.tolist()]
+
+    def past_left_edge(self, left_edge: float) -> List[Sprite]:
+        """
+        Get every indexed sprite that is entirely left of an x coordinate.
+
+        Meant to be called after the indexed sprites have moved this tick
+        but before update(), so each stored center is advanced by its
+        velocity here to find where the sprite is now.
+
+        :param left_edge: x coordinate that sprites must be fully past
+        :return:
+        """
+        if not self._slots:
+            return []
+
+        rights = self._centers[:, 0] + self._changes[:, 0] + self._half_sizes[:, 0]
+        past = np.flatnonzero(self._live & (rights <= left_edge))
+
+        sprites = self._sprites
+        return [sprites[slot] for slot in past.tolist()]
+
+
+def sprite_pixel_mask(sprite: Sprite) -> PixelMask:
+    """
+    Get the mask for the frame a sprite is currently showing.
+
+    Uses the masks kept alongside the sprite's animation table when they
+    match what is on screen, building them for the whole table the first
+    time one is asked for. Otherwise builds one from the texture.
+
+    :param sprite: any sprite
+    :return:
+    """
+    animations = getattr(sprite, "animations", None)
+
+    if isinstance(animations, CompiledAnimationTable):
+        animations.build_masks()
+        state_id = sprite.current_animation_id
+        frame_index = sprite.current_animation_frame_index
+        if animations.frames[state_id][frame_index] is sprite.texture:
+            return animations.masks[state_id][frame_index]
+
+    return mask_for_texture(sprite.texture)
+
+
+def pixel_masks_collide(sprite_a: Sprite, sprite_b: Sprite) -> bool:
+    """
+    Pixel-exact collision between two sprites.
+
+    Masks don't account for scaling or rotation, so sprites using either
+    fall back to arcade's polygon test.
+
+    :param sprite_a: one sprite
+    :param sprite_b: the other sprite
+    :return:
+    """
+    if sprite_a.scale != 1 or sprite_b.scale != 1 or sprite_a.angle or sprite_b.angle:
+        return check_for_collision(sprite_a, sprite_b)
+
+    mask_a = sprite_pixel_mask(sprite_a)
+    mask_b = sprite_pixel_mask(sprite_b)
+
+    return mask_a.overlaps(
+        mask_b,
+        pixel_origin(sprite_b.center_x, mask_b.width) - pixel_origin(sprite_a.center_x, mask_a.width),
+        pixel_origin(sprite_b.center_y, mask_b.height) - pixel_origin(sprite_a.center_y, mask_a.height)
+    )
+
+
+def sweep_interval(
+        moving: Bounds,
+        displacement: Position,
+        target: Bounds
+) -> Optional[Tuple[float, float]]:
+    """
+    When during a move one box overlaps another that stays still.
+
+    This is the slab test for a ray against a box grown by the moving box,
+    done once per axis.
+
+    :param moving: bounds of the moving box at the start of the move
+    :param displacement: how far the moving box travels over the move
+    :param target: bounds of the box standing still
+    :return: first and last overlapping fraction of the move, or None
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+
+    for axis in (0, 1):
+        low = axis * 2
+        high = low + 1
+        delta = displacement[axis]
+
+        # signed distances to where the boxes start and stop touching
+        gap_low = target[low] - moving[high]
+        gap_high = target[high] - moving[low]
+
+        if delta == 0.0:
+            if gap_low > 0.0 or gap_high < 0.0:
+                return None
+            continue
+
+        axis_enter = gap_low / delta
+        axis_exit = gap_high / delta
+        if axis_enter > axis_exit:
+            axis_enter, axis_exit = axis_exit, axis_enter
+
+        t_enter = max(t_enter, axis_enter)
+        t_exit = min(t_exit, axis_exit)
+        if t_enter > t_exit:
+            return None
+
+    return t_enter, t_exit
+
+
+def swept_collide(
+        sprite_a: Sprite,
+        start_a: Position,
+        sprite_b: Sprite,
+        start_b: Position,
+        narrow_phase_test: NarrowPhaseTest = check_for_collision,
+        max_step_px: float = 4.0
+) -> bool:
+    """
+    Whether two sprites touched at any point while moving to where they are.
+
+    The final positions are tested first, which is all that's needed when
+    neither sprite moved far. Otherwise, the narrow phase is rerun at evenly
+    spaced points across the part of the move where the bounds overlap, with
+    the sprites temporarily placed there.
+
+    :param sprite_a: one sprite, at the end of its move
+    :param start_a: where sprite_a's center started the move
+    :param sprite_b: the other sprite, at the end of its move
+    :param start_b: where sprite_b's center started the move
+    :param narrow_phase_test: exact test to run at each sampled point
+    :param max_step_px: furthest the sprites may move apart between samples
+    :return:
+    """
+    if narrow_phase_test(sprite_a, sprite_b):
+        return True
+
+    end_a = sprite_a.position
+    end_b = sprite_b.position
+
+    move_a = end_a[0] - start_a[0], end_a[1] - start_a[1]
+    move_b = end_b[0] - start_b[0], end_b[1] - start_b[1]
+
+    # work in a frame where sprite_b stands still at its end position
+    relative = move_a[0] - move_b[0], move_a[1] - move_b[1]
+    distance = max(abs(relative[0]), abs(relative[1]))
+    if distance <= max_step_px:
+        return False
+
+    half_width_a = sprite_a.width / 2
+    half_height_a = sprite_a.height / 2
+    relative_start_a = (
+        start_a[0] + move_b[0] - half_width_a,
+        start_a[0] + move_b[0] + half_width_a,
+        start_a[1] + move_b[1] - half_height_a,
+        start_a[1] + move_b[1] + half_height_a
+    )
+    interval = sweep_interval(relative_start_a, relative, sprite_bounds(sprite_b))
+    if interval is None:
+        return False
+
+    t_enter, t_exit = interval
+    samples = max(1, ceil(distance * (t_exit - t_enter) / max_step_px))
+
+    try:
+        for sample in range(samples + 1):
+            t = t_enter + (t_exit - t_enter) * sample / samples
+            sprite_a.position = start_a[0] + move_a[0] * t, start_a[1] + move_a[1] * t
+            sprite_b.position = start_b[0] + move_b[0] * t, start_b[1] + move_b[1] * t
+            if narrow_phase_test(sprite_a, sprite_b):
+                return True
+    finally:
+        sprite_a.position = end_a
+        sprite_b.position = end_b
+
+    return False
+
+
+def swept_collide_path(
+        sprite_a: Sprite,
+        path_a: Sequence[Position],
+        sprite_b: Sprite,
+        start_b: Position,
+        narrow_phase_test: NarrowPhaseTest = check_for_collision,
+        max_step_px: float = 4.0
+) -> bool:
+    """
+    swept_collide for a sprite that made several straight moves in a tick.
+
+    The moves are taken to split the tick evenly, with sprite_b moving in
+    a straight line the whole time. Each move is swept separately, with
+    both sprites temporarily placed where that move ended.
+
+    :param sprite_a: one sprite, at the end of its path
+    :param path_a: sprite_a's center at the start and after each move
+    :param sprite_b: the other sprite, at the end of its move
+    :param start_b: where sprite_b's center started the move
+    :param narrow_phase_test: exact test to run at each sampled point
+    :param max_step_px: furthest the sprites may move apart between samples
+    :return:
+    """
+    moves = len(path_a) - 1
+    if moves < 2:
+        return swept_collide(sprite_a, path_a[0], sprite_b, start_b, narrow_phase_test, max_step_px)
+
+    end_a = sprite_a.position
+    end_b = sprite_b.position
+
+    def position_b(move: int) -> Position:
+        if move == moves:
+            return end_b
+        fraction = move / moves
+        return (
+            start_b[0] + (end_b[0] - start_b[0]) * fraction,
+            start_b[1] + (end_b[1] - start_b[1]) * fraction
+        )
+
+    try:
+        for move in range(moves):
+            sprite_a.position = path_a[move + 1]
+            sprite_b.position = position_b(move + 1)
+            if swept_collide(
+                    sprite_a,
+                    path_a[move],
+                    sprite_b,
+                    position_b(move),
+                    narrow_phase_test,
+                    max_step_px
+            ):
+                return True
+    finally:
+        sprite_a.position = end_a
+        sprite_b.position = end_b
+
+    return False
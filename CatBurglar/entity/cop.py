@@ -1,13 +1,19 @@
+from random import Random
+from typing import TYPE_CHECKING
+
 from CatBurglar.entity import WALK_RIGHT, WALK_LEFT, REQUIRED_FOR_ACTORS, Actor, DRONE_REQUIRED_STATES
 from CatBurglar.util import CountdownTimer
-from CatBurglar.util.asset_loading import ASSET_BASE_PATH, preload_entity_texture_table, \
-    preload_entity_texture_alt_skin_table
+from CatBurglar.util.asset_loading import ASSET_BASE_PATH
+from CatBurglar.util.asset_registry import ASSET_REGISTRY
+
+if TYPE_CHECKING:
+    from CatBurglar.entity.pool import EnemyPool
 
 COP_PATH = ASSET_BASE_PATH / "cop"
 DRONE_ASSET_PATH = ASSET_BASE_PATH / "drone"
 
-COP_ALT_TABLE = preload_entity_texture_alt_skin_table(
-    COP_PATH, REQUIRED_FOR_ACTORS
+COP_ALT_TABLE = ASSET_REGISTRY.register_alt_skin_table(
+    "cop", COP_PATH, REQUIRED_FOR_ACTORS
 )
 
 
@@ -23,12 +29,15 @@ class BaseEnemy(Actor):
             default_animation=WALK_LEFT,
             animations=None,
             # base move velocity in px / sec
-            base_move_velocity=-2.0
+            base_move_velocity=-2.0,
+            rng: Random = None
     ):
         super().__init__(
             animations=animations,
-            alt_table=COP_ALT_TABLE,
+            # only load the cop skins if we actually need them
+            alt_table=None if animations else COP_ALT_TABLE.get(),
             default_animation=default_animation,
+            rng=rng
         )
 
         # used to move left
@@ -37,18 +46,48 @@ class BaseEnemy(Actor):
         #todo: if there's time, alter this so that it scales with a time constant?
         self.change_x = base_move_velocity
 
+        # set by an EnemyPool when this enemy was acquired from one
+        self.pool: "EnemyPool" = None
+
+    def reset(self, x: float, y: float, rng: Random = None) -> None:
+        """
+        Reinitialize a recycled enemy in place at a new position.
+
+        :param x: new center x
+        :param y: new center y
+        :param rng: random source to use from now on, if changing it
+        :return:
+        """
+        if rng is not None:
+            self.rng = rng
+        self.set_position(x, y)
+        self.change_x = self.base_move_velocity
+        self.change_y = 0
+        self._moving = True
+        self.reset_animations()
+
+    def despawn(self) -> None:
+        """
+        Leave the game, returning to our pool if we came from one.
+
+        :return:
+        """
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self.remove_from_sprite_lists()
+
     def update(self, delta_time: float = 1/60):
         """
-        Remove self from the game if we're past drawing
+        Move the enemy.
+
+        Leaving the screen is handled for all enemies at once by
+        EnemySpawner.despawn_offscreen rather than checked here.
 
         :param delta_time: how big the delapsed delta is
         :return:
         """
         super().update()
-        # get adjusted right-most boundary of the sprite
-        rightmost_x = self.get_adjusted_hit_box()[1][0]
-        if rightmost_x <= 0:
-            self.remove_from_sprite_lists()
 
 
 class BasicRunnerCop(BaseEnemy):
@@ -60,16 +99,19 @@ class BasicRunnerCop(BaseEnemy):
 
     def __init__(
             self,
+            rng: Random = None
     ):
         super().__init__(
-            default_animation=WALK_LEFT
+            default_animation=WALK_LEFT,
+            rng=rng
         )
 
     def update(self, delta_time: float = 1 / 60):
         super().update()
 
 
-DRONE_STATE_TABLE = preload_entity_texture_table(
+DRONE_STATE_TABLE = ASSET_REGISTRY.register_texture_table(
+    "drone",
     DRONE_ASSET_PATH,
     DRONE_REQUIRED_STATES
 )
@@ -78,11 +120,13 @@ class Drone(BaseEnemy):
 
     def __init__(
             self,
-            default_animation="fly_left"
+            default_animation="fly_left",
+            rng: Random = None
     ):
         super().__init__(
-            animations=DRONE_STATE_TABLE,
-            default_animation=default_animation
+            animations=DRONE_STATE_TABLE.get(),
+            default_animation=default_animation,
+            rng=rng
         )
 
 
@@ -4,15 +4,27 @@ Simple runner physics modelled after the implementations included in
 physics_engines.py inside of arcade.
 
 """
-from typing import List
+from typing import List, Optional, Sequence, Type, Union
 from arcade import (
     Sprite,
     SpriteList,
-    check_for_collision_with_list
+    check_for_collision
 )
 from CatBurglar.entity.Player import MoveState, Player
+from CatBurglar.entity.collision import AABBArrayIndex, SweepAndPruneIndex, sprite_bounds, \
+    pixel_masks_collide, swept_collide_path, union_bounds, Position
 from CatBurglar.input.KeyHandler import KeyHandler
 
+BroadPhaseType = Union[Type[AABBArrayIndex], Type[SweepAndPruneIndex]]
+
+# narrow phase modes for the player vs enemy check
+NARROW_PHASE_POLYGON = "polygon"
+NARROW_PHASE_PIXEL = "pixel"
+NARROW_PHASE_MODES = (NARROW_PHASE_POLYGON, NARROW_PHASE_PIXEL)
+
+# furthest sprites may move relative to each other between swept samples
+DEFAULT_SWEEP_STEP_PX = 4.0
+
 
 class RunnerPhysicsEngine:
     """
@@ -32,6 +44,9 @@ class RunnerPhysicsEngine:
         ground_level: int = 16,
         gravity_constant: float = 0.3,
         initial_jump_velocity: float = 5,
+        broad_phase_type: BroadPhaseType = AABBArrayIndex,
+        narrow_phase: str = NARROW_PHASE_POLYGON,
+        sweep_step_px: float = DEFAULT_SWEEP_STEP_PX
     ):
         """
 
@@ -44,6 +59,9 @@ class RunnerPhysicsEngine:
         :param ground_level: how many pixels up from 0 the ground is
         :param gravity_constant: gravity in px / frame ^ 2
         :param initial_jump_velocity: initial jump velocity in px / frame
+        :param broad_phase_type: index class used to prefilter enemies
+        :param narrow_phase: NARROW_PHASE_POLYGON or NARROW_PHASE_PIXEL
+        :param sweep_step_px: spacing of narrow phase samples along fast moves
         """
         self.player: Player = player_sprite
         self.enemy_list: SpriteList = enemy_list
@@ -53,14 +71,42 @@ class RunnerPhysicsEngine:
         self.initial_jump_velocity = initial_jump_velocity
         self.key_handler: KeyHandler = key_handler
 
-    def update(self, delta_time: float = 1 / 60) -> List[Sprite]:
+        # only enemies overlapping the player's bounds get a polygon test
+        self.broad_phase = broad_phase_type(enemy_list)
+
+        if narrow_phase == NARROW_PHASE_POLYGON:
+            self.narrow_phase_test = check_for_collision
+        elif narrow_phase == NARROW_PHASE_PIXEL:
+            self.narrow_phase_test = pixel_masks_collide
+        else:
+            raise ValueError(f"Unknown narrow phase mode {narrow_phase!r}")
+
+        self.sweep_step_px = sweep_step_px
+
+        # profiling counters for the most recent collision check
+        self.last_enemy_count = 0
+        self.last_candidate_count = 0
+
+    def update(
+            self,
+            player_start: Optional[Position] = None
+    ) -> List[Sprite]:
         """
 
         Update the state based on key and current player state
 
-        :param delta_time:
+        Gravity and jump velocity are per-tick constants, so this expects to
+        be called once per fixed-length simulation tick.
+
+        :param player_start: where the player was when the tick started, if
+            it has already been moved this tick, such as by its sprite list
         :return:
         """
+        # collisions are checked along every move the player makes this
+        # tick, not just where it ends up
+        player_path = [self.player.position]
+        if player_start is not None:
+            player_path.insert(0, player_start)
 
         # start a jump if on the ground
         if self.player.running and self.key_handler.is_pressed("JUMP"):
@@ -92,7 +138,65 @@ class RunnerPhysicsEngine:
             self.player.change_y = 0
             self.player.move_state = MoveState.RUNNING
 
+        # landing can snap the player up onto the ground, which counts as a move
+        player_path.append(self.player.position)
+
         self.player.update()
-        return check_for_collision_with_list(self.player, self.enemy_list)
+        player_path.append(self.player.position)
+
+        return self.check_for_enemy_collisions(player_path)
+
+    def check_for_enemy_collisions(self, player_path: Optional[Sequence[Position]] = None) -> List[Sprite]:
+        """
+        Find enemies that touched the player at any point during the tick,
+        using the broad phase to skip any that can't possibly have.
+
+        Enemies are assumed to have moved by their change_x and change_y
+        since the previous tick.
+
+        :param player_path: the player's center at the start of the tick
+            and after each move since, ending where it is now
+        :return:
+        """
+        player = self.player
+
+        # standing still leaves nothing to sweep
+        path = [player.position]
+        if player_path:
+            path = [player_path[0]]
+            for point in player_path[1:]:
+                if point != path[-1]:
+                    path.append(point)
+
+        half_width = player.width / 2
+        half_height = player.height / 2
+        query_bounds = sprite_bounds(player)
+        for point in path:
+            query_bounds = union_bounds(query_bounds, (
+                point[0] - half_width,
+                point[0] + half_width,
+                point[1] - half_height,
+                point[1] + half_height
+            ))
+
+        self.broad_phase.update()
+        candidates = self.broad_phase.query(*query_bounds)
+
+        self.last_enemy_count = len(self.broad_phase)
+        self.last_candidate_count = len(candidates)
+
+        narrow_phase_test = self.narrow_phase_test
+        sweep_step_px = self.sweep_step_px
+        return [
+            enemy for enemy in candidates
+            if swept_collide_path(
+                player,
+                path,
+                enemy,
+                (enemy.center_x - enemy.change_x, enemy.center_y - enemy.change_y),
+                narrow_phase_test,
+                sweep_step_px
+            )
+        ]
 
 
@@ -0,0 +1,152 @@
+"""
+Recycling of enemies instead of allocating a new one for every spawn.
+
+Each enemy owns a sensor SpriteList, a frame timer and other state that is
+costly to rebuild, so despawned enemies are parked in per-type free lists
+and reset in place the next time one of their type is needed.
+
+Enemies usually leave several at a time, so they can be released together
+with remove_sprites doing the sprite list work in one pass per list.
+"""
+from collections import defaultdict
+from random import Random
+from typing import Dict, List, Sequence, Type, TypeVar
+
+from arcade import Sprite, SpriteList
+
+from CatBurglar.entity.cop import BaseEnemy
+
+DEFAULT_MAX_POOLED_ENEMIES = 128
+
+EnemyType = TypeVar("EnemyType", bound=BaseEnemy)
+
+
+def remove_sprites(sprites: Sequence[Sprite]) -> None:
+    """
+    Take sprites out of every SpriteList they're in, rebuilding each once.
+
+    SpriteList.remove rebuilds the list's whole index for every sprite it
+    removes, so removing k sprites one by one from a list of n costs k * n.
+    Here every affected list is filtered and reindexed a single time.
+
+    This writes to SpriteList's internals as of arcade 2.5, which is why
+    setup.py keeps arcade below 2.6.
+
+    :param sprites: the sprites to remove
+    :return:
+    """
+    removed_by_list: Dict[SpriteList, List[Sprite]] = {}
+    for sprite in sprites:
+        for sprite_list in sprite.sprite_lists:
+            removed_by_list.setdefault(sprite_list, []).append(sprite)
+        sprite.sprite_lists.clear()
+
+    for sprite_list, removed in removed_by_list.items():
+        removed_set = set(removed)
+        kept = [sprite for sprite in sprite_list.sprite_list if sprite not in removed_set]
+
+        sprite_list.sprite_list[:] = kept
+        sprite_list.sprite_idx = {sprite: index for index, sprite in enumerate(kept)}
+
+        # same as SpriteList.remove, so buffers are rebuilt on the next draw
+        sprite_list._vao1 = None
+        if sprite_list.use_spatial_hash:
+            for sprite in removed:
+                sprite_list.spatial_hash.remove_object(sprite)
+
+
+class EnemyPool:
+    """
+    Hands out enemies, reusing released ones when possible.
+
+    """
+    def __init__(self, max_pooled: int = DEFAULT_MAX_POOLED_ENEMIES):
+        """
+        :param max_pooled: most idle enemies to keep around per type
+        """
+        self.max_pooled = max_pooled
+        self._free: Dict[Type[BaseEnemy], List[BaseEnemy]] = defaultdict(list)
+
+        # statistics for tuning the cap
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def idle_count(self, enemy_type: Type[BaseEnemy] = None) -> int:
+        """
+        How many enemies are waiting to be reused.
+
+        :param enemy_type: only count this type if passed
+        :return:
+        """
+        if enemy_type:
+            return len(self._free[enemy_type])
+        return sum(len(free) for free in self._free.values())
+
+    def acquire(
+            self,
+            enemy_type: Type[EnemyType],
+            x: float,
+            y: float,
+            rng: Random = None
+    ) -> EnemyType:
+        """
+        Get an enemy of the passed type positioned at x, y.
+
+        The enemy isn't added to any sprite lists. New and reused enemies
+        draw from rng the same way, so pooling doesn't change the outcome
+        of a seeded game.
+
+        :param enemy_type: the class of enemy wanted
+        :param x: center x to place it at
+        :param y: center y to place it at
+        :param rng: random source for the enemy, such as for picking a skin
+        :return:
+        """
+        free = self._free[enemy_type]
+
+        if free:
+            enemy = free.pop()
+            enemy.reset(x, y, rng)
+            self.reused += 1
+        else:
+            enemy = enemy_type(rng=rng)
+            enemy.set_position(x, y)
+            self.created += 1
+
+        enemy.pool = self
+        return enemy
+
+    def release(self, enemy: BaseEnemy) -> None:
+        """
+        Take an enemy out of the game and keep it for reuse if there's room.
+
+        :param enemy: the enemy to release
+        :return:
+        """
+        enemy.remove_from_sprite_lists()
+        self._keep(enemy)
+
+    def release_all(self, enemies: Sequence[BaseEnemy]) -> None:
+        """
+        Release many enemies at once, such as every one that left the screen.
+
+        :param enemies: the enemies to release
+        :return:
+        """
+        for enemy in enemies:
+            if enemy.animator is not None:
+                enemy.animator.remove(enemy)
+        remove_sprites(enemies)
+
+        for enemy in enemies:
+            self._keep(enemy)
+
+    def _keep(self, enemy: BaseEnemy) -> None:
+        enemy.pool = None
+
+        free = self._free[type(enemy)]
+        if len(free) < self.max_pooled:
+            free.append(enemy)
+        else:
+            self.discarded += 1
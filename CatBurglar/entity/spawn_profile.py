@@ -0,0 +1,231 @@
+"""
+Data-driven descriptions of how enemies are spawned.
+
+A spawn profile says which enemies appear and how often, without touching
+spawner code. Profiles live as JSON files in assets/spawn_profiles and are
+looked up by file name, so new ones, including stress tests that push
+thousands of enemies on screen, can be added without code changes.
+
+A profile file holds an object with these keys, all optional:
+    - description: free text shown nowhere, for people reading the file
+    - grace_period_sec: time before the first regular spawn
+    - enemy_mix: relative weights of enemy type names, such as
+      {"drone": 1, "cop": 1}
+    - gap_curve: keyframes of [completion, min_gap_sec, max_gap_sec], where
+      completion runs from 0 to 1 over the game. The gap before the next
+      regular spawn is picked between the gaps interpolated at the current
+      completion.
+    - batch_size: enemies added per regular spawn
+    - batch_spacing_px: horizontal distance between enemies of a batch
+    - max_concurrent: regular and burst spawns are skipped at this many
+      enemies, null for no limit
+    - bursts: a list of objects with start_sec, every_sec (0 or null to
+      fire once), count, spacing_px and optionally enemy to force a type
+
+Unknown keys are rejected so typos don't silently fall back to defaults.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from arcade import lerp
+
+from CatBurglar.util.asset_loading import ASSET_BASE_PATH
+
+SPAWN_PROFILE_PATH = ASSET_BASE_PATH / "spawn_profiles"
+SPAWN_PROFILE_SUFFIX = ".json"
+
+DEFAULT_SPAWN_PROFILE_NAME = "default"
+
+# completion, min gap, max gap
+GapKeyframe = Tuple[float, float, float]
+
+
+class SpawnProfileError(ValueError):
+    pass
+
+
+class BurstSpec:
+    """
+    A group of enemies spawned together on a schedule.
+
+    """
+    __slots__ = ("start_sec", "every_sec", "count", "spacing_px", "enemy")
+
+    def __init__(
+            self,
+            start_sec: float,
+            count: int,
+            every_sec: Optional[float] = None,
+            spacing_px: float = 24.0,
+            enemy: Optional[str] = None
+    ):
+        """
+        :param start_sec: game time of the first burst
+        :param count: enemies per burst
+        :param every_sec: time between bursts, None to only burst once
+        :param spacing_px: horizontal distance between enemies in a burst
+        :param enemy: enemy type name to spawn, or None to use the mix
+        """
+        self.start_sec = start_sec
+        self.every_sec = every_sec or None
+        self.count = count
+        self.spacing_px = spacing_px
+        self.enemy = enemy
+
+
+class SpawnProfile:
+    """
+    The enemy mix, pacing and bursts an EnemySpawner follows.
+
+    """
+    def __init__(
+            self,
+            name: str = "custom",
+            grace_period_sec: float = 5.0,
+            enemy_mix: Mapping[str, float] = None,
+            gap_curve: Sequence[GapKeyframe] = ((0.0, 1.0, 2.0), (1.0, 1.0, 1.0)),
+            batch_size: int = 1,
+            batch_spacing_px: float = 24.0,
+            max_concurrent: Optional[int] = None,
+            bursts: Sequence[BurstSpec] = ()
+    ):
+        """
+        :param name: name to report the profile by
+        :param grace_period_sec: time before the first regular spawn
+        :param enemy_mix: relative weights of enemy type names
+        :param gap_curve: keyframes of completion, min gap and max gap
+        :param batch_size: enemies added per regular spawn
+        :param batch_spacing_px: horizontal distance between batched enemies
+        :param max_concurrent: most enemies alive at once, None for no limit
+        :param bursts: scheduled groups of enemies
+        """
+        self.name = name
+        self.grace_period_sec = grace_period_sec
+
+        mix = dict(enemy_mix or {"drone": 1.0, "cop": 1.0})
+        total_weight = sum(mix.values())
+        if total_weight <= 0:
+            raise SpawnProfileError(f"Spawn profile {name!r} has no enemies with positive weight")
+
+        # cumulative fractions, so a single random number picks a type
+        self.enemy_names: Tuple[str, ...] = tuple(mix.keys())
+        cumulative = []
+        running_total = 0.0
+        for weight in mix.values():
+            running_total += weight
+            cumulative.append(running_total / total_weight)
+        self.enemy_thresholds: Tuple[float, ...] = tuple(cumulative)
+
+        if not gap_curve:
+            raise SpawnProfileError(f"Spawn profile {name!r} needs at least one gap keyframe")
+        # sorted by completion alone, so keyframes sharing one keep their
+        # order and can make a step in the curve
+        self.gap_curve: Tuple[GapKeyframe, ...] = tuple(sorted(
+            ((float(c), float(low), float(high)) for c, low, high in gap_curve),
+            key=lambda keyframe: keyframe[0]
+        ))
+
+        if batch_size < 1:
+            raise SpawnProfileError(f"Spawn profile {name!r} must spawn at least one enemy per batch")
+        self.batch_size = batch_size
+        self.batch_spacing_px = batch_spacing_px
+        self.max_concurrent = max_concurrent
+        self.bursts: Tuple[BurstSpec, ...] = tuple(bursts)
+
+    def pick_enemy(self, roll: float) -> str:
+        """
+        Pick an enemy type name from the mix.
+
+        :param roll: a random number from 0 to 1
+        :return:
+        """
+        for name, threshold in zip(self.enemy_names, self.enemy_thresholds):
+            if roll <= threshold:
+                return name
+        return self.enemy_names[-1]
+
+    def gap_range(self, completion: float) -> Tuple[float, float]:
+        """
+        The range to pick the next spawn gap from at a point in the game.
+
+        :param completion: how far through the game we are, from 0 to 1
+        :return: the shortest and longest gap
+        """
+        curve = self.gap_curve
+        if completion <= curve[0][0]:
+            return curve[0][1], curve[0][2]
+
+        for previous, current in zip(curve, curve[1:]):
+            if completion <= current[0]:
+                span = current[0] - previous[0]
+                fraction = (completion - previous[0]) / span if span else 1.0
+                return (
+                    lerp(previous[1], current[1], fraction),
+                    lerp(previous[2], current[2], fraction)
+                )
+
+        return curve[-1][1], curve[-1][2]
+
+    @classmethod
+    def from_dict(cls, name: str, data: Mapping[str, Any]) -> "SpawnProfile":
+        """
+        Build a profile from the parsed contents of a profile file.
+
+        :param name: name to report the profile by
+        :param data: the profile's settings
+        :return:
+        """
+        allowed = {
+            "description", "grace_period_sec", "enemy_mix", "gap_curve",
+            "batch_size", "batch_spacing_px", "max_concurrent", "bursts"
+        }
+        unknown = set(data) - allowed
+        if unknown:
+            raise SpawnProfileError(f"Unknown keys in spawn profile {name!r}: {sorted(unknown)!r}")
+
+        options: Dict[str, Any] = {
+            key: value for key, value in data.items() if key not in ("description", "bursts")
+        }
+
+        bursts: List[BurstSpec] = []
+        for burst in data.get("bursts", ()):
+            try:
+                bursts.append(BurstSpec(**burst))
+            except TypeError as e:
+                raise SpawnProfileError(f"Bad burst in spawn profile {name!r}: {e}")
+
+        return cls(name=name, bursts=bursts, **options)
+
+
+def spawn_profile_path(name: str) -> Path:
+    return SPAWN_PROFILE_PATH / f"{name}{SPAWN_PROFILE_SUFFIX}"
+
+
+def available_spawn_profiles() -> List[str]:
+    return sorted(path.stem for path in SPAWN_PROFILE_PATH.glob(f"*{SPAWN_PROFILE_SUFFIX}"))
+
+
+def load_spawn_profile(name_or_path: Union[str, Path] = DEFAULT_SPAWN_PROFILE_NAME) -> SpawnProfile:
+    """
+    Load a spawn profile by name from the profile directory, or from a path.
+
+    :param name_or_path: a profile name such as "stress", or a JSON file path
+    :return:
+    """
+    path = Path(name_or_path)
+    if path.suffix != SPAWN_PROFILE_SUFFIX:
+        path = spawn_profile_path(str(name_or_path))
+
+    if not path.is_file():
+        raise FileNotFoundError(
+            f"No spawn profile at {str(path)!r}, available profiles: {available_spawn_profiles()!r}"
+        )
+
+    with open(path) as profile_file:
+        try:
+            data = json.load(profile_file)
+        except json.JSONDecodeError as e:
+            raise SpawnProfileError(f"Spawn profile {str(path)!r} isn't valid JSON: {e}")
+
+    return SpawnProfile.from_dict(str(name_or_path), data)
@@ -1,10 +1,26 @@
 import random
-from arcade import SpriteList, lerp
+from random import Random
+from typing import Callable, Dict, List, Optional, Type
 
-from CatBurglar.entity.cop import BasicRunnerCop, Drone
+from arcade import SpriteList
+
+from CatBurglar.entity.animation import BatchAnimator
+from CatBurglar.entity.collision import AABBArrayIndex
+from CatBurglar.entity.cop import BaseEnemy, BasicRunnerCop, Drone
+from CatBurglar.entity.pool import EnemyPool
+from CatBurglar.entity.spawn_profile import SpawnProfile, SpawnProfileError
 from CatBurglar.entity.terrain import TILE_SIZE_PX, WIDTH_IN_TILES, HEIGHT_IN_TILES
 from CatBurglar.util import StopwatchTimer, CountdownTimer
 
+# enemy type names used by spawn profiles
+SPAWNABLE_ENEMIES: Dict[str, Type[BaseEnemy]] = {
+    "cop": BasicRunnerCop,
+    "drone": Drone
+}
+
+# enemies appear just past the right edge of the screen
+SPAWN_X = (WIDTH_IN_TILES + 1) * TILE_SIZE_PX
+
 
 class EnemySpawner:
     def __init__(
@@ -14,9 +30,55 @@ class EnemySpawner:
             min_enemy_gap_sec=1.0,
             max_enemy_gap_sec=2.0,
             # 5 minutes till escape density reached
+            animator: BatchAnimator = None,
+            pool: EnemyPool = None,
+            rng: Random = None,
+            profile: SpawnProfile = None
     ):
+        """
+        :param enemy_list: where spawned enemies are added
+        :param global_time_elapsed: the game clock
+        :param min_enemy_gap_sec: shortest gap between spawns when no profile is passed
+        :param max_enemy_gap_sec: longest starting gap between spawns when no profile is passed
+        :param animator: animator to register spawned enemies with
+        :param pool: where enemies are recycled from
+        :param rng: random source, the random module by default
+        :param profile: mix, pacing and bursts of enemies to follow
+        """
         self.enemy_list = enemy_list
 
+        # the original pacing, narrowing the gaps as the game goes on
+        if profile is None:
+            profile = SpawnProfile(
+                name="classic",
+                gap_curve=(
+                    (0.0, min_enemy_gap_sec, max_enemy_gap_sec),
+                    (1.0, min_enemy_gap_sec, min_enemy_gap_sec)
+                )
+            )
+
+        named = set(profile.enemy_names) | {burst.enemy for burst in profile.bursts if burst.enemy}
+        unknown = named - SPAWNABLE_ENEMIES.keys()
+        if unknown:
+            raise SpawnProfileError(
+                f"Spawn profile {profile.name!r} names unknown enemies {sorted(unknown)!r},"
+                f" expected some of {sorted(SPAWNABLE_ENEMIES)!r}"
+            )
+        self.profile = profile
+
+        # every random decision goes through this so seeded games repeat
+        self.rng: Random = rng if rng is not None else random
+        self.animator = animator
+        self.pool = pool or EnemyPool()
+
+        # called with each enemy that joins and each batch that leaves, so
+        # anything indexing the enemies can follow without rescanning them
+        self.spawn_listeners: List[Callable[[BaseEnemy], None]] = []
+        self.despawn_listeners: List[Callable[[List[BaseEnemy]], None]] = []
+
+        # set to an index of the enemies to find offscreen ones without a loop
+        self.position_index: Optional[AABBArrayIndex] = None
+
         self.drone_list = SpriteList(use_spatial_hash=False)
         self.cop_list = SpriteList(use_spatial_hash=False)
 
@@ -26,40 +88,112 @@ class EnemySpawner:
         self.global_time_elapsed = global_time_elapsed
         self.time_since_last_enemy = StopwatchTimer()
 
-        self.min_enemy_gap_sec = min_enemy_gap_sec
-        self.max_enemy_gap_sec = max_enemy_gap_sec
-
         # give some breathing room before the enemies start coming
-        self.time_till_next = CountdownTimer(remaining=5.0)
+        self.time_till_next = CountdownTimer(remaining=profile.grace_period_sec)
+
+        # game time each burst fires next, None once it's done
+        self.next_burst_times: List[Optional[float]] = [
+            burst.start_sec for burst in profile.bursts
+        ]
+
+    def spawn(self, enemy_name: str, x_offset: float = 0.0) -> Optional[BaseEnemy]:
+        """
+        Add one enemy just off the right edge of the screen.
+
+        :param enemy_name: a key of SPAWNABLE_ENEMIES
+        :param x_offset: how much further right than usual to place it
+        :return: the enemy, or None if the profile's enemy cap was reached
+        """
+        max_concurrent = self.profile.max_concurrent
+        if max_concurrent is not None and len(self.enemy_list) >= max_concurrent:
+            return None
+
+        rng = self.rng
+        enemy_type = SPAWNABLE_ENEMIES[enemy_name]
+        if enemy_type is Drone:
+            y_position = rng.uniform(TILE_SIZE_PX * 1.5, TILE_SIZE_PX * HEIGHT_IN_TILES)
+        else:
+            y_position = TILE_SIZE_PX * 2
+
+        new_enemy = self.pool.acquire(enemy_type, SPAWN_X + x_offset, y_position, rng)
+        self.add(new_enemy)
+        return new_enemy
+
+    def add(self, enemy: BaseEnemy) -> None:
+        """
+        Put an enemy into play, letting the animator and listeners know.
+
+        :param enemy: an enemy acquired from the pool
+        :return:
+        """
+        self.enemy_list.append(enemy)
+        if self.animator is not None:
+            self.animator.add(enemy)
+        for listener in self.spawn_listeners:
+            listener(enemy)
 
     def update(self, delta_time: float = 1 / 60):
+        profile = self.profile
+        rng = self.rng
 
         self.time_till_next.update(delta_time)
 
         if self.time_till_next.remaining <= 0:
-            enemy_list = self.enemy_list
-
-            new_enemy = None
-            y_position = None
-            x_position = (WIDTH_IN_TILES + 1) * TILE_SIZE_PX
+            for index in range(profile.batch_size):
+                self.spawn(profile.pick_enemy(rng.random()), index * profile.batch_spacing_px)
 
-            if random.random() > 0.5:
-                new_enemy = BasicRunnerCop()
-                y_position = TILE_SIZE_PX * 2
-
-            else:
-                new_enemy = Drone()
-                y_position = random.uniform(TILE_SIZE_PX * 1.5, TILE_SIZE_PX * HEIGHT_IN_TILES)
-
-            new_enemy.set_position(x_position, y_position)
-
-            enemy_list.append(new_enemy)
-            self.time_till_next.remaining = random.uniform(
-                self.min_enemy_gap_sec,
-                lerp(
-                    self.max_enemy_gap_sec,
-                    self.min_enemy_gap_sec,
-                    self.global_time_elapsed.completion
-                )
+            self.time_till_next.remaining = rng.uniform(
+                *profile.gap_range(self.global_time_elapsed.completion)
             )
 
+        if profile.bursts:
+            self.update_bursts()
+
+    def update_bursts(self) -> None:
+        """
+        Fire every burst whose time has come.
+
+        :return:
+        """
+        now = self.global_time_elapsed.time
+        next_burst_times = self.next_burst_times
+
+        for index, burst in enumerate(self.profile.bursts):
+            fire_at = next_burst_times[index]
+            if fire_at is None or now < fire_at:
+                continue
+
+            for position in range(burst.count):
+                enemy_name = burst.enemy or self.profile.pick_enemy(self.rng.random())
+                self.spawn(enemy_name, position * burst.spacing_px)
+
+            next_burst_times[index] = fire_at + burst.every_sec if burst.every_sec else None
+
+    def despawn_offscreen(self, left_edge: float = 0.0) -> int:
+        """
+        Release every enemy that has moved past the left edge in one sweep.
+
+        Meant to be called once per frame after the enemies have moved.
+        Uses the texture width rather than the hit box so that no polygon
+        has to be built just to read one coordinate. With a position_index
+        set, its stored positions are tested in one vectorized comparison
+        instead of visiting every enemy. The enemies found are released
+        together, so each list they leave is only rebuilt once.
+
+        :param left_edge: x coordinate that enemies must be fully past
+        :return: how many enemies were despawned
+        """
+        if self.position_index is not None:
+            offscreen = self.position_index.past_left_edge(left_edge)
+        else:
+            offscreen = [
+                enemy for enemy in self.enemy_list
+                if enemy.center_x + enemy.width / 2 <= left_edge
+            ]
+
+        if offscreen:
+            for listener in self.despawn_listeners:
+                listener(offscreen)
+            self.pool.release_all(offscreen)
+
+        return len(offscreen)
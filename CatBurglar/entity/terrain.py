@@ -1,8 +1,5 @@
-from CatBurglar.entity import NamedAnimationsSprite
-from CatBurglar.util.asset_loading import (
-    ASSET_BASE_PATH,
-    preload_entity_texture_table
-)
+from CatBurglar.util.asset_loading import ASSET_BASE_PATH
+from CatBurglar.util.asset_registry import ASSET_REGISTRY
 
 WIDTH_IN_TILES = 12
 HEIGHT_IN_TILES = 8
@@ -11,21 +8,12 @@ TILE_SIZE_PX = 16
 TILE_PATH = ASSET_BASE_PATH / "tiles"
 GROUND_BASE_PATH = TILE_PATH / "ground"
 
-GROUND_ANIMATION_TABLE = preload_entity_texture_table(
+GROUND_ANIMATION_TABLE = ASSET_REGISTRY.register_texture_table(
+    "ground",
     GROUND_BASE_PATH,
     ["ground_left"]
 )
 
-
-class AnimatedFloorTile(NamedAnimationsSprite):
-    """
-    Floor tile that interacts physically and provides illusion of movement.
-
-    """
-    def __init__(self):
-        super(AnimatedFloorTile, self).__init__(
-            animations=GROUND_ANIMATION_TABLE,
-            default_animation="ground_left"
-        )
-
+# the ground_left frames step 2px left every 1/48 seconds
+GROUND_SCROLL_SPEED_PX_PER_SEC = 96.0
 
@@ -0,0 +1,72 @@
+"""
+Render-time interpolation of sprite positions.
+
+With a fixed simulation timestep, frames are usually drawn part of the way
+between two ticks. Drawing sprites at a blend of their previous and current
+positions hides the resulting judder on displays that don't run at the
+simulation rate.
+"""
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from arcade import Sprite, SpriteList
+
+
+class PositionInterpolator:
+    """
+    Remembers where sprites were before the latest tick.
+
+    """
+    def __init__(self, *sprite_lists: SpriteList):
+        """
+        :param sprite_lists: the lists whose sprites should be interpolated
+        """
+        self.sprite_lists = sprite_lists
+        self._previous: Dict[Sprite, Tuple[float, float]] = {}
+
+    def snapshot(self) -> None:
+        """
+        Record current positions. Call right before running each tick.
+
+        Sprites created during the tick have no previous position and are
+        drawn where they are.
+
+        :return:
+        """
+        self._previous = {
+            sprite: sprite.position
+            for sprite_list in self.sprite_lists
+            for sprite in sprite_list
+        }
+
+    @contextmanager
+    def interpolated(self, alpha: float):
+        """
+        Temporarily move sprites to their blended positions for drawing.
+
+        :param alpha: how far from the previous to the current position
+        :return:
+        """
+        moved = []
+        previous_positions = self._previous
+
+        for sprite_list in self.sprite_lists:
+            for sprite in sprite_list:
+                previous = previous_positions.get(sprite)
+                if previous is None:
+                    continue
+
+                current = sprite.position
+                if previous == current:
+                    continue
+
+                moved.append((sprite, current))
+                sprite.position = (
+                    previous[0] + (current[0] - previous[0]) * alpha,
+                    previous[1] + (current[1] - previous[1]) * alpha
+                )
+        try:
+            yield
+        finally:
+            for sprite, current in moved:
+                sprite.position = current
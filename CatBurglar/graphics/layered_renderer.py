@@ -0,0 +1,152 @@
+"""
+Drawing every sprite in one batch, in explicit layers.
+
+Gameplay keeps sprites in whichever lists suit it, such as the simulation's
+player and enemy lists. Drawing each of those lists separately costs a draw
+call, a buffer and a texture bind apiece, and leaves depth order up to
+the order of the draw calls.
+
+A LayeredRenderer instead mirrors those lists into a single SpriteList kept
+sorted by layer, so all sprites go out in one draw call whatever the number
+of lists. It's told about new sprites as they're added rather than
+rescanning the lists every frame, such as by listening to the
+EnemySpawner. Preloading it with every entity frame means the sheet arcade
+builds its GL texture from is complete from the start and is never rebuilt
+mid-game.
+
+Things that aren't sprites, such as a ScrollingStrip, can be layered too.
+They're drawn as a whole either under or over the sprite batch, since
+slotting them between sprite layers would split the batch.
+"""
+from enum import IntEnum
+from typing import Iterable, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from arcade import Sprite, SpriteList, Texture
+
+
+class RenderLayer(IntEnum):
+    """
+    Draw order, lowest first. Sprites in the same layer draw in the order
+    they were added.
+
+    """
+    TERRAIN = 0
+    PLAYER = 10
+    ENEMIES = 20
+
+
+class LayeredRenderer:
+    """
+    Draws sprites from several lists as one batch, ordered by layer.
+
+    Sprites join the batch through add_sprite or add_sprite_list. They
+    leave it when removed from their sprite lists, as pooled and killed
+    sprites are.
+
+    """
+    def __init__(self, preload: Iterable[Texture] = ()):
+        """
+        :param preload: textures sprites will use, to load up front
+        """
+        self.batch = SpriteList(use_spatial_hash=False)
+        preload = list(preload)
+        if preload:
+            self.batch.preload_textures(preload)
+
+        self._drawables: List[Tuple[int, object]] = []
+
+        # drawables below this go under the batch
+        self._lowest_sprite_layer: Optional[int] = None
+
+        # weak so sprites that are gone for good don't linger here
+        self._layers: "WeakKeyDictionary[Sprite, int]" = WeakKeyDictionary()
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    @property
+    def draw_calls(self) -> int:
+        return 1 + len(self._drawables)
+
+    def add_sprite(self, sprite: Sprite, layer: int) -> None:
+        """
+        Add a sprite on top of everything else in its layer.
+
+        :param sprite: the sprite to draw
+        :param layer: a RenderLayer or any int, lower layers draw first
+        :return:
+        """
+        batch = self.batch
+        layers = self._layers
+        layers[sprite] = layer
+
+        if self._lowest_sprite_layer is None or layer < self._lowest_sprite_layer:
+            self._lowest_sprite_layer = layer
+
+        # first position whose layer is above ours
+        low, high = 0, len(batch)
+        while low < high:
+            middle = (low + high) // 2
+            if layers[batch[middle]] <= layer:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(batch):
+            batch.append(sprite)
+        else:
+            batch.insert(low, sprite)
+
+    def add_sprite_list(self, sprite_list: SpriteList, layer: int) -> None:
+        """
+        Draw the sprites currently in a list, in a layer.
+
+        Sprites added to the list later must be passed to add_sprite, such
+        as from a spawn listener.
+
+        :param sprite_list: the list to draw
+        :param layer: a RenderLayer or any int, lower layers draw first
+        :return:
+        """
+        if self._lowest_sprite_layer is None or layer < self._lowest_sprite_layer:
+            self._lowest_sprite_layer = layer
+
+        for sprite in sprite_list:
+            self.add_sprite(sprite, layer)
+
+    def add_drawable(self, drawable, layer: int) -> None:
+        """
+        Draw something that isn't a sprite, in a layer.
+
+        It goes under the sprite batch if its layer is below every sprite
+        layer used so far, otherwise over it.
+
+        :param drawable: anything with a draw() method
+        :param layer: a RenderLayer or any int, lower layers draw first
+        :return:
+        """
+        self._drawables.append((layer, drawable))
+        # stable, so drawables in the same layer keep the order they came in
+        self._drawables.sort(key=lambda entry: entry[0])
+
+    def draw(self, **kwargs) -> None:
+        """
+        Draw everything in layer order.
+
+        :param kwargs: passed to SpriteList.draw, such as filter
+        :return:
+        """
+        lowest_sprite_layer = self._lowest_sprite_layer
+        if lowest_sprite_layer is None:
+            lowest_sprite_layer = 0
+
+        for layer, drawable in self._drawables:
+            if layer < lowest_sprite_layer:
+                drawable.draw()
+
+        self.batch.draw(**kwargs)
+
+        for layer, drawable in self._drawables:
+            if layer >= lowest_sprite_layer:
+                drawable.draw()
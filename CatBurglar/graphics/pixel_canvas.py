@@ -0,0 +1,182 @@
+"""
+Native resolution rendering for pixel art.
+
+The scene is drawn once into a small offscreen framebuffer the size of the
+game's base resolution, then stretched onto the window with a single
+textured quad. Sprites only touch base resolution pixels, so fill and
+blending cost doesn't grow with the zoom level, and nearest filtering on the
+final blit keeps every art pixel a crisp square at any integer zoom.
+"""
+from contextlib import contextmanager
+from typing import Tuple
+
+from arcade import get_window
+from arcade.gl import NEAREST
+from arcade.gl.geometry import quad_2d_fs
+
+# draws a texture over the whole viewport, untouched by the 2D projection
+BLIT_VERTEX_SHADER = """
+#version 330
+
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 v_uv;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+
+BLIT_FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D canvas;
+
+in vec2 v_uv;
+out vec4 f_color;
+
+void main() {
+    f_color = texture(canvas, v_uv);
+}
+"""
+
+# (x, y, width, height) in window pixels
+Viewport = Tuple[int, int, int, int]
+
+
+def integer_zoom(
+        base_size: Tuple[int, int],
+        window_size: Tuple[int, int]
+) -> int:
+    """
+    The largest whole number scale of the base size that fits in a window.
+
+    :param base_size: width and height of the canvas
+    :param window_size: width and height of the window in pixels
+    :return: at least 1, even if the window is smaller than the canvas
+    """
+    return max(1, min(window_size[0] // base_size[0], window_size[1] // base_size[1]))
+
+
+def centered_viewport(
+        base_size: Tuple[int, int],
+        window_size: Tuple[int, int],
+        zoom: int
+) -> Viewport:
+    """
+    Where a canvas scaled by zoom sits when centered in a window.
+
+    :param base_size: width and height of the canvas
+    :param window_size: width and height of the window in pixels
+    :param zoom: whole number scale of the canvas
+    :return:
+    """
+    width = base_size[0] * zoom
+    height = base_size[1] * zoom
+    return (window_size[0] - width) // 2, (window_size[1] - height) // 2, width, height
+
+
+class PixelCanvas:
+    """
+    An offscreen render target at the game's base resolution.
+
+    """
+    def __init__(
+            self,
+            width: int,
+            height: int,
+            clear_color: Tuple[int, int, int, int] = (0, 0, 0, 255),
+            ctx=None
+    ):
+        """
+        :param width: canvas width in art pixels
+        :param height: canvas height in art pixels
+        :param clear_color: RGBA the canvas is cleared to before each frame
+        :param ctx: GL context to create resources in, the window's if None
+        """
+        self.width = width
+        self.height = height
+        self.clear_color = clear_color
+
+        self.ctx = ctx or get_window().ctx
+
+        self.texture = self.ctx.texture(
+            (width, height),
+            components=4,
+            filter=(NEAREST, NEAREST)
+        )
+        self.framebuffer = self.ctx.framebuffer(color_attachments=[self.texture])
+
+        self._program = self.ctx.program(
+            vertex_shader=BLIT_VERTEX_SHADER,
+            fragment_shader=BLIT_FRAGMENT_SHADER
+        )
+        self._program["canvas"] = 0
+        self._quad = quad_2d_fs()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    @contextmanager
+    def render(self, clear: bool = True):
+        """
+        Draw into the canvas in art pixel coordinates.
+
+        The previous framebuffer and projection are restored afterwards.
+
+        :param clear: whether to clear the canvas first
+        :return:
+        """
+        ctx = self.ctx
+        previous_projection = ctx.projection_2d
+
+        # clear binds the framebuffer itself, and doing that while it's
+        # already bound makes it forget which framebuffer to restore
+        if clear:
+            self.framebuffer.clear(self.clear_color)
+
+        with self.framebuffer:
+            ctx.projection_2d = (0, self.width, 0, self.height)
+            try:
+                yield self
+            finally:
+                ctx.projection_2d = previous_projection
+
+    def draw(self, viewport: Viewport) -> None:
+        """
+        Stretch the canvas over part of the active framebuffer.
+
+        Leaves that framebuffer's viewport set to the area drawn, with the 2D
+        projection in art pixels, so anything drawn after, such as the UI,
+        lines up with the scene.
+
+        :param viewport: x, y, width and height to cover, in window pixels
+        :return:
+        """
+        ctx = self.ctx
+        target = ctx.active_framebuffer
+        target.viewport = viewport
+
+        # the canvas is already composited, blending it again would darken edges
+        blending = ctx.is_enabled(ctx.BLEND)
+        ctx.disable(ctx.BLEND)
+
+        self.texture.use(0)
+        self._quad.render(self._program)
+
+        if blending:
+            ctx.enable(ctx.BLEND)
+        ctx.projection_2d = (0, self.width, 0, self.height)
+
+    def draw_scaled(self, window_size: Tuple[int, int]) -> int:
+        """
+        Draw the canvas at the largest integer zoom that fits, centered.
+
+        :param window_size: width and height of the window in pixels
+        :return: the zoom used
+        """
+        zoom = integer_zoom(self.size, window_size)
+        self.draw(centered_viewport(self.size, window_size, zoom))
+        return zoom
@@ -0,0 +1,162 @@
+"""
+Endlessly scrolling texture strips, such as the ground.
+
+A strip is one quad with a repeating texture. Scrolling only moves its
+texture coordinates, so it costs the same to update and draw however wide
+it is, and strips at different speeds can be layered for parallax.
+"""
+from array import array
+from math import floor
+
+from arcade import Texture, get_window
+from arcade.gl import BufferDescription, NEAREST, REPEAT
+from PIL import Image
+
+STRIP_VERTEX_SHADER = """
+#version 330
+
+uniform Projection {
+    uniform mat4 matrix;
+} proj;
+
+uniform float scroll;
+
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 v_uv;
+
+void main() {
+    gl_Position = proj.matrix * vec4(in_vert, 0.0, 1.0);
+    v_uv = vec2(in_uv.x + scroll, in_uv.y);
+}
+"""
+
+STRIP_FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D tile;
+
+in vec2 v_uv;
+out vec4 f_color;
+
+void main() {
+    f_color = texture(tile, v_uv);
+}
+"""
+
+
+class ScrollingStrip:
+    """
+    A rectangle tiled with one texture that scrolls left over time.
+
+    GL resources are created on the first draw, so strips can be built and
+    updated without a window.
+
+    """
+    def __init__(
+            self,
+            texture: Texture,
+            left: float,
+            bottom: float,
+            width: float,
+            height: float = None,
+            speed_px_per_sec: float = 0.0,
+            pixel_snap: bool = True
+    ):
+        """
+        :param texture: the tile repeated along the strip
+        :param left: x of the strip's left edge
+        :param bottom: y of the strip's bottom edge
+        :param width: strip width, need not be a multiple of the tile width
+        :param height: strip height, the tile height if None
+        :param speed_px_per_sec: how fast the tiles move left, scale down for parallax
+        :param pixel_snap: only scroll by whole texture pixels, keeping pixel art crisp
+        """
+        self.texture = texture
+        self.left = left
+        self.bottom = bottom
+        self.width = width
+        self.height = height if height is not None else texture.height
+        self.speed_px_per_sec = speed_px_per_sec
+        self.pixel_snap = pixel_snap
+
+        # kept within one tile width so precision doesn't drift over long games
+        self.scroll_px = 0.0
+
+        self._ctx = None
+        self._program = None
+        self._geometry = None
+        self._tile = None
+
+    @property
+    def offset_px(self) -> float:
+        """
+        How far the tiles have moved left, as drawn.
+
+        :return:
+        """
+        if self.pixel_snap:
+            return floor(self.scroll_px)
+        return self.scroll_px
+
+    def update(self, delta_time: float = 1 / 60) -> None:
+        """
+        Scroll by however far the strip moves in the elapsed time.
+
+        :param delta_time: seconds since the last update
+        :return:
+        """
+        self.scroll_px = (self.scroll_px + self.speed_px_per_sec * delta_time) % self.texture.width
+
+    def _create_gl_resources(self) -> None:
+        ctx = self._ctx = get_window().ctx
+
+        # GL textures start at the bottom row
+        image = self.texture.image.convert("RGBA").transpose(Image.FLIP_TOP_BOTTOM)
+        self._tile = ctx.texture(
+            image.size,
+            components=4,
+            data=image.tobytes(),
+            wrap_x=REPEAT,
+            wrap_y=REPEAT,
+            filter=(NEAREST, NEAREST)
+        )
+
+        self._program = ctx.program(
+            vertex_shader=STRIP_VERTEX_SHADER,
+            fragment_shader=STRIP_FRAGMENT_SHADER
+        )
+        self._program["tile"] = 0
+
+        # texture coordinates count tiles, so the tile repeats across the strip
+        right = self.left + self.width
+        top = self.bottom + self.height
+        u_max = self.width / self.texture.width
+        v_max = self.height / self.texture.height
+        vertices = array("f", [
+            self.left, top, 0.0, v_max,
+            self.left, self.bottom, 0.0, 0.0,
+            right, top, u_max, v_max,
+            right, self.bottom, u_max, 0.0,
+        ])
+        self._geometry = ctx.geometry(
+            [BufferDescription(ctx.buffer(data=vertices), "2f 2f", ["in_vert", "in_uv"])],
+            mode=ctx.TRIANGLE_STRIP
+        )
+
+    def draw(self) -> None:
+        """
+        Draw the strip with the current 2D projection.
+
+        :return:
+        """
+        if self._geometry is None:
+            self._create_gl_resources()
+
+        ctx = self._ctx
+        ctx.enable(ctx.BLEND)
+        ctx.blend_func = ctx.BLEND_DEFAULT
+
+        self._program["scroll"] = self.offset_px / self.texture.width
+        self._tile.use(0)
+        self._geometry.render(self._program)
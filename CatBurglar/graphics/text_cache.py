@@ -0,0 +1,153 @@
+"""
+Pre-rendered text, so changing a label's message doesn't hitch.
+
+arcade's UILabel rasterizes its text three times, once per hover state, each
+time the text changes, and wraps every image in a freshly named texture.
+The new names then force the UI sprite list to rebuild its GL texture.
+
+A TextTextureCache rasterizes each distinct string and style once and keeps
+the texture under a stable name. A CachedLabel draws its text from one, so
+switching between messages it has shown before, or was prewarmed with, is
+only a texture swap.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from arcade import Texture
+from arcade.arcade_types import Color
+from arcade.color import GRAY
+from arcade.gui import UILabel
+from arcade.gui.utils import get_text_image
+
+FontName = Union[str, Sequence[str]]
+
+# text, color, size, font names, alignment, width
+TextKey = Tuple[str, Tuple[int, ...], float, Tuple[str, ...], str, int]
+
+
+class TextTextureCache:
+    """
+    Textures of rendered text, keyed by the string and its style.
+
+    """
+    def __init__(self, name: str = "text"):
+        """
+        :param name: prefix for the names of cached textures
+        """
+        self.name = name
+        self._textures: Dict[TextKey, Texture] = {}
+
+    def __len__(self) -> int:
+        return len(self._textures)
+
+    @property
+    def textures(self) -> List[Texture]:
+        return list(self._textures.values())
+
+    def get(
+            self,
+            text: str,
+            font_color: Color,
+            font_size: float = 12,
+            font_name: FontName = ("calibri", "arial"),
+            align: str = "left",
+            width: int = 0
+    ) -> Texture:
+        """
+        Texture of some text, rendering it only if this style wasn't seen.
+
+        :param text: the text, may span several lines
+        :param font_color: RGB or RGBA color of the text
+        :param font_size: size of the font in points
+        :param font_name: a font name, or names to try in order
+        :param align: left, center or right
+        :param width: width to align within, 0 to fit the text
+        :return:
+        """
+        if isinstance(font_name, str):
+            font_name = (font_name,)
+        key = (text, tuple(font_color), font_size, tuple(font_name), align, width)
+
+        texture = self._textures.get(key)
+        if texture is None:
+            image = get_text_image(
+                text=text,
+                font_color=font_color,
+                font_size=font_size,
+                font_name=font_name,
+                align=align,
+                width=width
+            )
+            texture = Texture(
+                f"{self.name}/{len(self._textures)}",
+                image=image,
+                hit_box_algorithm="None"
+            )
+            self._textures[key] = texture
+        return texture
+
+
+# Shared by every label in the game
+TEXT_TEXTURE_CACHE = TextTextureCache()
+
+
+class CachedLabel(UILabel):
+    """
+    A UILabel that takes its text textures from a TextTextureCache.
+
+    """
+    def __init__(self, text: str, cache: TextTextureCache = TEXT_TEXTURE_CACHE, **kwargs):
+        """
+        :param text: text to show
+        :param cache: where rendered text is kept
+        :param kwargs: passed to UILabel
+        """
+        self.cache = cache
+        super().__init__(text, **kwargs)
+
+    def _text_textures(self, text: str) -> Tuple[Texture, Texture, Texture]:
+        font_name = self.style_attr('font_name', ['Calibri', 'Arial'])
+        font_size = self.style_attr('font_size', 12)
+
+        font_color = self.style_attr('font_color', GRAY)
+        font_color_hover = self.style_attr('font_color_hover', None)
+        font_color_press = self.style_attr('font_color_press', None)
+
+        if font_color_hover is None:
+            font_color_hover = font_color
+        if font_color_press is None:
+            font_color_press = font_color_hover
+
+        # unstyled hover and press states come back as the same texture
+        return tuple(
+            self.cache.get(
+                text,
+                color,
+                font_size=font_size,
+                font_name=font_name,
+                align=self.align,
+                width=int(self._target_width)
+            )
+            for color in (font_color, font_color_hover, font_color_press)
+        )
+
+    def render(self):
+        self.normal_texture, self.hover_texture, self.press_texture = self._text_textures(self.text)
+
+    def prewarm(self, texts: Iterable[str]) -> None:
+        """
+        Render texts in the label's current style ahead of showing them.
+
+        Call once the label is in a UIManager, so the sprite lists drawing
+        it can load the textures now as well.
+
+        :param texts: every text the label is expected to show
+        :return:
+        """
+        textures = []
+        for text in texts:
+            for texture in self._text_textures(text):
+                if texture not in textures:
+                    textures.append(texture)
+
+        for sprite_list in self.sprite_lists:
+            sprite_list.preload_textures(textures)
@@ -0,0 +1,317 @@
+"""
+Run many games without a window to tune enemy spawning.
+
+Every game is a GameSimulation played by a bot as fast as the CPU allows.
+Games are spread over a process pool, each seeded from its index so that a
+batch can be rerun, and the results are summarized as win and loss rates
+plus the distribution of how long the bot survived.
+
+Games can also be recorded as replays and played back, which checks that
+the playback ended in exactly the recorded state.
+
+Run it with the catburglar-simulate command.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import pyglet
+
+# no display is needed, so don't let pyglet open its hidden GL window
+pyglet.options["shadow_window"] = False
+
+from CatBurglar.entity.physics import NARROW_PHASE_MODES, NARROW_PHASE_POLYGON
+from CatBurglar.entity.spawn_profile import load_spawn_profile, DEFAULT_SPAWN_PROFILE_NAME
+from CatBurglar.input.bots import BOTS
+from CatBurglar.replay import Replay, ReplayPlayer, REPLAY_EXTENSION, REPLAY_MAX_SEED, seed_argument
+from CatBurglar.simulation import GameSimulation, GameState, check_step
+
+# percentiles reported for survival time
+SURVIVAL_PERCENTILES = (10, 25, 50, 75, 90)
+
+# width of the buckets in the survival time histogram
+HISTOGRAM_BUCKET_SEC = 10.0
+
+
+class GameResult(NamedTuple):
+    seed: int
+    won: bool
+    lost: bool
+    survival_time: float
+    ticks: int
+    enemies_spawned: int
+
+
+def _result(simulation: GameSimulation) -> GameResult:
+    pool = simulation.enemy_spawner.pool
+    return GameResult(
+        seed=simulation.seed,
+        won=simulation.game_state == GameState.WON,
+        lost=simulation.game_state == GameState.LOST,
+        survival_time=simulation.survival_time,
+        ticks=simulation.ticks,
+        enemies_spawned=pool.created + pool.reused
+    )
+
+
+def run_game(
+        seed: int,
+        bot_name: str = "jump",
+        record_dir: Optional[Path] = None,
+        spawn_profile: str = DEFAULT_SPAWN_PROFILE_NAME,
+        invulnerable: bool = False,
+        max_ticks: Optional[int] = None,
+        narrow_phase: str = NARROW_PHASE_POLYGON
+) -> GameResult:
+    """
+    Play one whole game headlessly.
+
+    :param seed: seed for the game's randomness
+    :param bot_name: key into BOTS for the bot playing the game
+    :param record_dir: if passed, save a replay of the game here named after the seed
+    :param spawn_profile: name or path of the spawn profile to play
+    :param invulnerable: keep playing through collisions
+    :param max_ticks: stop the game early after this many ticks if passed
+    :param narrow_phase: NARROW_PHASE_POLYGON or NARROW_PHASE_PIXEL
+    :return:
+    """
+    bot = BOTS[bot_name]()
+    simulation = GameSimulation(
+        bot.input,
+        controller=bot,
+        seed=seed,
+        spawn_profile=load_spawn_profile(spawn_profile),
+        invulnerable=invulnerable,
+        narrow_phase=narrow_phase
+    )
+    simulation.setup()
+
+    if record_dir is not None:
+        simulation.start_recording()
+    simulation.run(max_ticks=max_ticks)
+    if record_dir is not None:
+        simulation.finish_recording().save(Path(record_dir) / f"{seed}{REPLAY_EXTENSION}")
+
+    return _result(simulation)
+
+
+def play_replay(replay: Replay) -> Tuple[GameResult, bool]:
+    """
+    Play a recorded game back headlessly.
+
+    :param replay: the replay to play, recorded at SIMULATION_STEP_SEC
+    :return: the result and whether it ended in exactly the recorded state
+    """
+    check_step(replay.step)
+
+    player = ReplayPlayer(replay)
+    simulation = GameSimulation(
+        player.input,
+        controller=player,
+        seed=replay.seed,
+        spawn_profile=load_spawn_profile(replay.spawn_profile),
+        invulnerable=replay.invulnerable,
+        narrow_phase=replay.narrow_phase
+    )
+    simulation.setup()
+    simulation.run(max_ticks=replay.tick_count)
+
+    matched = (
+        simulation.game_state.value == replay.final_state
+        and simulation.state_digest() == replay.digest
+    )
+    return _result(simulation), matched
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """
+    Linearly interpolated percentile of already sorted values.
+
+    :param sorted_values: a non-empty sorted sequence
+    :param percent: from 0 to 100
+    :return:
+    """
+    position = (len(sorted_values) - 1) * percent / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def summarize(results: Sequence[GameResult]) -> Dict[str, Any]:
+    """
+    Aggregate a batch of results into rates and a survival distribution.
+
+    :param results: the results of every game in the batch
+    :return: a JSON-serializable summary
+    """
+    games = len(results)
+    wins = sum(1 for result in results if result.won)
+    losses = sum(1 for result in results if result.lost)
+    survival_times = sorted(result.survival_time for result in results)
+
+    percentiles = {}
+    if games:
+        percentiles = {f"p{p}": percentile(survival_times, p) for p in SURVIVAL_PERCENTILES}
+
+    histogram: Dict[str, int] = {}
+    for survival_time in survival_times:
+        bucket_start = int(survival_time // HISTOGRAM_BUCKET_SEC * HISTOGRAM_BUCKET_SEC)
+        label = f"{bucket_start}-{bucket_start + int(HISTOGRAM_BUCKET_SEC)}s"
+        histogram[label] = histogram.get(label, 0) + 1
+
+    return {
+        "games": games,
+        "wins": wins,
+        "losses": losses,
+        "unfinished": games - wins - losses,
+        "win_rate": wins / games if games else 0.0,
+        "loss_rate": losses / games if games else 0.0,
+        "survival_time": {
+            "mean": statistics.mean(survival_times) if games else 0.0,
+            "min": survival_times[0] if games else 0.0,
+            "max": survival_times[-1] if games else 0.0,
+            **percentiles,
+            "histogram": histogram
+        },
+        "mean_enemies_spawned": statistics.mean(
+            result.enemies_spawned for result in results
+        ) if games else 0.0
+    }
+
+
+def run_batch(
+        games: int,
+        base_seed: int = 0,
+        bot_name: str = "jump",
+        workers: int = None,
+        record_dir: Optional[Path] = None,
+        spawn_profile: str = DEFAULT_SPAWN_PROFILE_NAME,
+        invulnerable: bool = False,
+        max_ticks: Optional[int] = None,
+        narrow_phase: str = NARROW_PHASE_POLYGON
+) -> List[GameResult]:
+    """
+    Play games seeded base_seed, base_seed + 1, ... across a process pool.
+
+    :param games: how many games to play
+    :param base_seed: seed of the first game
+    :param bot_name: key into BOTS for the bot playing every game
+    :param workers: process count, or None for one per CPU
+    :param record_dir: if passed, save a replay of every game here
+    :param spawn_profile: name or path of the spawn profile to play
+    :param invulnerable: keep playing through collisions
+    :param max_ticks: stop each game early after this many ticks if passed
+    :param narrow_phase: NARROW_PHASE_POLYGON or NARROW_PHASE_PIXEL
+    :return: results in seed order
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = range(base_seed, base_seed + games)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            run_game,
+            seeds,
+            [bot_name] * games,
+            [record_dir] * games,
+            [spawn_profile] * games,
+            [invulnerable] * games,
+            [max_ticks] * games,
+            [narrow_phase] * games,
+            chunksize=max(1, games // (4 * workers))
+        ))
+
+
+def print_summary(summary: Dict[str, Any], elapsed: float) -> None:
+    survival = summary["survival_time"]
+    print(
+        f"{summary['games']} games in {elapsed:.1f}s:"
+        f" {summary['wins']} won ({summary['win_rate']:.1%}),"
+        f" {summary['losses']} lost ({summary['loss_rate']:.1%})"
+        + (f", {summary['unfinished']} stopped early" if summary["unfinished"] else "")
+    )
+    print(
+        "Survival time: "
+        + ", ".join(
+            f"{name} {survival[name]:.1f}s"
+            for name in ("mean", "min", *(f"p{p}" for p in SURVIVAL_PERCENTILES), "max")
+            if name in survival
+        )
+    )
+    for label, count in survival["histogram"].items():
+        print(f"  {label:>10} {count:6d} {'#' * round(40 * count / summary['games'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play many seeded games headlessly and summarize the outcomes."
+    )
+    parser.add_argument("-n", "--games", type=int, default=100, help="how many games to play")
+    parser.add_argument("-s", "--seed", type=seed_argument, default=0, help="seed of the first game")
+    parser.add_argument("-b", "--bot", choices=sorted(BOTS), default="jump", help="which bot plays")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="processes to use, one per CPU by default")
+    parser.add_argument(
+        "-p", "--profile",
+        default=DEFAULT_SPAWN_PROFILE_NAME,
+        help="spawn profile name from assets/spawn_profiles, or a path to one"
+    )
+    parser.add_argument(
+        "--invulnerable",
+        action="store_true",
+        help="ignore collisions so games run their full length, for stress tests"
+    )
+    parser.add_argument("--max-ticks", type=int, help="end each game after this many ticks")
+    parser.add_argument(
+        "--narrow-phase",
+        choices=NARROW_PHASE_MODES,
+        default=NARROW_PHASE_POLYGON,
+        help="exact player vs enemy collision test, polygon hit boxes or pixel masks"
+    )
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--record-dir", type=Path, help="save a replay of every game in this directory")
+    parser.add_argument("--replay", type=Path, help="play back a single replay instead of a batch")
+    args = parser.parse_args()
+
+    if args.seed + args.games - 1 > REPLAY_MAX_SEED:
+        parser.error(f"the last game's seed can be at most {REPLAY_MAX_SEED}")
+
+    if args.replay:
+        result, matched = play_replay(Replay.load(args.replay))
+        outcome = "won" if result.won else "lost" if result.lost else "stopped"
+        print(f"Seed {result.seed}: {outcome} after {result.survival_time:.2f}s ({result.ticks} ticks)")
+        if not matched:
+            print("Playback diverged from the recording", file=sys.stderr)
+            sys.exit(1)
+        print("Playback matched the recording")
+        return
+
+    if args.record_dir:
+        args.record_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    results = run_batch(
+        args.games,
+        args.seed,
+        args.bot,
+        args.workers,
+        args.record_dir,
+        args.profile,
+        args.invulnerable,
+        args.max_ticks,
+        args.narrow_phase
+    )
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary, elapsed)
+
+
+if __name__ == "__main__":
+    main()
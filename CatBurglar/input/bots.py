@@ -0,0 +1,69 @@
+"""
+Simple computer players for headless games.
+
+A bot is a controller for a GameSimulation: its update method is called at
+the start of every tick and sets the held actions on its ScriptedInput,
+which the simulation reads in place of a keyboard.
+"""
+from typing import Dict, Type, TYPE_CHECKING
+
+from CatBurglar.input.scripted import ScriptedInput
+
+if TYPE_CHECKING:
+    from CatBurglar.simulation import GameSimulation
+
+
+class IdleBot:
+    """
+    Never presses anything, giving a floor for survival times.
+
+    """
+    def __init__(self):
+        self.input = ScriptedInput()
+
+    def update(self, simulation: "GameSimulation") -> None:
+        pass
+
+
+class JumpBot:
+    """
+    Holds jump whenever a low enough enemy is about to reach the player.
+
+    """
+    def __init__(
+            self,
+            lookahead_px: float = 16.0,
+            clearance_px: float = 8.0
+    ):
+        """
+        :param lookahead_px: how far ahead of the player enemies are noticed
+        :param clearance_px: how far above the player's head enemies are ignored
+        """
+        self.input = ScriptedInput()
+        self.lookahead_px = lookahead_px
+        self.clearance_px = clearance_px
+
+    def update(self, simulation: "GameSimulation") -> None:
+        player = simulation.player
+        player_left = player.center_x - player.width / 2
+        player_right = player.center_x + player.width / 2
+        reach = player_right + self.lookahead_px
+        ceiling = player.center_y + player.height / 2 + self.clearance_px
+
+        threatened = False
+        for enemy in simulation.enemy_list:
+            half_width = enemy.width / 2
+            if enemy.center_x + half_width < player_left or enemy.center_x - half_width > reach:
+                continue
+            if enemy.center_y - enemy.height / 2 <= ceiling:
+                threatened = True
+                break
+
+        self.input.set_pressed("JUMP", threatened)
+
+
+# bots that can be picked by name from the command line
+BOTS: Dict[str, Type] = {
+    "idle": IdleBot,
+    "jump": JumpBot
+}
@@ -0,0 +1,36 @@
+"""
+Input that comes from code rather than a keyboard.
+
+ScriptedInput answers is_pressed the same way KeyHandler does, so it can be
+handed to the player and physics engine in its place for headless games,
+bots and replays.
+"""
+from typing import Iterable, Set
+
+
+class ScriptedInput:
+    """
+    A set of currently held actions, such as "JUMP".
+
+    """
+    def __init__(self, pressed: Iterable[str] = ()):
+        """
+        :param pressed: actions held from the start
+        """
+        self.pressed: Set[str] = set(pressed)
+
+    def is_pressed(self, key: str) -> bool:
+        return key in self.pressed
+
+    def set_pressed(self, key: str, pressed: bool) -> None:
+        """
+        Hold or let go of an action.
+
+        :param key: the action's name
+        :param pressed: whether it should be held
+        :return:
+        """
+        if pressed:
+            self.pressed.add(key)
+        else:
+            self.pressed.discard(key)
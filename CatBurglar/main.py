@@ -1,13 +1,42 @@
 
+import argparse
+from pathlib import Path
+
 import arcade
 
 from CatBurglar import Window
 from CatBurglar.Window import SCALED_WIDTH_PX, SCALED_HEIGHT_PX, TITLE, GameView
+from CatBurglar.entity.physics import NARROW_PHASE_MODES, NARROW_PHASE_POLYGON
+from CatBurglar.entity.spawn_profile import load_spawn_profile, DEFAULT_SPAWN_PROFILE_NAME
+from CatBurglar.replay import Replay, seed_argument
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Play Cat Burglar.")
+    parser.add_argument("--seed", type=seed_argument, help="seed for the game, random by default")
+    parser.add_argument("--record", type=Path, help="save a replay of the game to this file")
+    parser.add_argument("--replay", type=Path, help="watch a recorded replay")
+    parser.add_argument(
+        "--profile",
+        default=DEFAULT_SPAWN_PROFILE_NAME,
+        help="spawn profile name from assets/spawn_profiles, or a path to one"
+    )
+    parser.add_argument(
+        "--narrow-phase",
+        choices=NARROW_PHASE_MODES,
+        default=NARROW_PHASE_POLYGON,
+        help="exact player vs enemy collision test, polygon hit boxes or pixel masks"
+    )
+    args = parser.parse_args()
+
     window = arcade.Window(SCALED_WIDTH_PX, SCALED_HEIGHT_PX, TITLE)
-    view = GameView()
+    view = GameView(
+        seed=args.seed,
+        replay=Replay.load(args.replay) if args.replay else None,
+        record_path=args.record,
+        spawn_profile=load_spawn_profile(args.profile),
+        narrow_phase=args.narrow_phase
+    )
     window.show_view(view)
     view.setup()
     arcade.run()
@@ -0,0 +1,304 @@
+"""
+Compact binary recordings of a game's input.
+
+A game is fully determined by its seed, its tick length and which actions
+were held on every tick, so that is all a replay stores. Held actions are
+packed into one byte of flags per tick and run-length encoded, since input
+rarely changes from one tick to the next. A two minute game is usually a
+few hundred bytes.
+
+Games can also differ in their spawn profile, whether the player is
+invulnerable and which narrow phase collision test was used, so those are
+stored alongside.
+
+The file layout, all little-endian:
+    - a header: magic b"CBRP", format version, seed, tick length in seconds,
+      tick count, the final game state, a digest of the final simulation
+      state from GameSimulation.state_digest, option flags and the length
+      of the spawn profile name
+    - the spawn profile name as UTF-8
+    - runs until the tick count is reached, each a LEB128 varint tick count
+      followed by one byte of action flags
+
+The digest lets playback confirm it reproduced the recorded game exactly.
+"""
+import argparse
+import struct
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+from CatBurglar.entity.physics import NARROW_PHASE_PIXEL, NARROW_PHASE_POLYGON
+from CatBurglar.input.scripted import ScriptedInput
+
+REPLAY_MAGIC = b"CBRP"
+REPLAY_FORMAT_VERSION = 2
+
+# magic, version, seed, tick length, tick count, final state, digest,
+# option flags, spawn profile name length
+REPLAY_HEADER = struct.Struct("<4sHQdIB8sBH")
+
+# seeds are stored unsigned, as setup picks them with random.getrandbits(64)
+REPLAY_MAX_SEED = 2 ** 64 - 1
+
+# option flag bits
+REPLAY_INVULNERABLE = 1
+REPLAY_PIXEL_NARROW_PHASE = 2
+
+# bit positions of the actions that affect gameplay
+REPLAY_ACTIONS: Tuple[str, ...] = ("JUMP", "UP", "DOWN", "LEFT", "RIGHT")
+
+REPLAY_EXTENSION = ".cbrp"
+
+
+class ReplayFormatError(ValueError):
+    pass
+
+
+def seed_argument(text: str) -> int:
+    """
+    argparse type for seeds, rejecting any a replay couldn't store.
+
+    :param text: the command line value
+    :return:
+    """
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seed {text!r}, expected a whole number")
+    if not 0 <= seed <= REPLAY_MAX_SEED:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and {REPLAY_MAX_SEED}, got {seed}")
+    return seed
+
+
+def _write_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ReplayFormatError("Replay ends partway through a run length")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """
+    The seed, tick length and per-tick input of one recorded game.
+
+    """
+    def __init__(
+            self,
+            seed: int,
+            step: float,
+            runs: List[Tuple[int, int]] = None,
+            final_state: int = 0,
+            digest: bytes = bytes(8),
+            spawn_profile: str = "default",
+            invulnerable: bool = False,
+            narrow_phase: str = NARROW_PHASE_POLYGON
+    ):
+        """
+        :param seed: the seed the game was set up with
+        :param step: length of each tick in seconds
+        :param runs: (tick count, action flags) pairs in tick order
+        :param final_state: value of the GameState the game ended in
+        :param digest: the simulation's state digest when recording ended
+        :param spawn_profile: name or path of the spawn profile played
+        :param invulnerable: whether collisions were ignored
+        :param narrow_phase: NARROW_PHASE_POLYGON or NARROW_PHASE_PIXEL
+        """
+        # fail now rather than when the finished game is saved
+        if not 0 <= seed <= REPLAY_MAX_SEED:
+            raise ValueError(f"Replays can only store seeds between 0 and {REPLAY_MAX_SEED}, got {seed}")
+
+        self.seed = seed
+        self.step = step
+        self.spawn_profile = spawn_profile
+        self.invulnerable = invulnerable
+        self.narrow_phase = narrow_phase
+        self.runs: List[Tuple[int, int]] = runs if runs is not None else []
+        self.final_state = final_state
+        self.digest = digest
+
+    @property
+    def tick_count(self) -> int:
+        return sum(count for count, flags in self.runs)
+
+    def append(self, flags: int) -> None:
+        """
+        Add one tick of input, extending the last run if it matches.
+
+        :param flags: bits of REPLAY_ACTIONS held during the tick
+        :return:
+        """
+        runs = self.runs
+        if runs and runs[-1][1] == flags:
+            runs[-1] = (runs[-1][0] + 1, flags)
+        else:
+            runs.append((1, flags))
+
+    def ticks(self) -> Iterator[int]:
+        """
+        Action flags for every tick in order.
+
+        :return:
+        """
+        for count, flags in self.runs:
+            for _ in range(count):
+                yield flags
+
+    @property
+    def option_flags(self) -> int:
+        flags = 0
+        if self.invulnerable:
+            flags |= REPLAY_INVULNERABLE
+        if self.narrow_phase == NARROW_PHASE_PIXEL:
+            flags |= REPLAY_PIXEL_NARROW_PHASE
+        return flags
+
+    def to_bytes(self) -> bytes:
+        profile_name = self.spawn_profile.encode("utf-8")
+        out = bytearray(REPLAY_HEADER.pack(
+            REPLAY_MAGIC,
+            REPLAY_FORMAT_VERSION,
+            self.seed,
+            self.step,
+            self.tick_count,
+            self.final_state,
+            self.digest,
+            self.option_flags,
+            len(profile_name)
+        ))
+        out += profile_name
+        for count, flags in self.runs:
+            _write_varint(count, out)
+            out.append(flags)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if len(data) < REPLAY_HEADER.size:
+            raise ReplayFormatError("Replay is too short to hold a header")
+
+        magic, version = struct.unpack_from("<4sH", data)
+        if magic != REPLAY_MAGIC:
+            raise ReplayFormatError(f"Not a replay, expected magic {REPLAY_MAGIC!r} but got {magic!r}")
+        if version != REPLAY_FORMAT_VERSION:
+            raise ReplayFormatError(
+                f"Unsupported replay version {version}, expected {REPLAY_FORMAT_VERSION}"
+            )
+
+        magic, version, seed, step, tick_count, final_state, digest, options, name_length =\
+            REPLAY_HEADER.unpack_from(data)
+
+        offset = REPLAY_HEADER.size
+        if offset + name_length > len(data):
+            raise ReplayFormatError("Replay ends partway through the spawn profile name")
+        spawn_profile = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+
+        runs = []
+        ticks_read = 0
+        while ticks_read < tick_count:
+            count, offset = _read_varint(data, offset)
+            if offset >= len(data):
+                raise ReplayFormatError("Replay ends partway through a run")
+            runs.append((count, data[offset]))
+            offset += 1
+            ticks_read += count
+
+        if ticks_read != tick_count:
+            raise ReplayFormatError(f"Replay holds {ticks_read} ticks, header says {tick_count}")
+
+        return cls(
+            seed, step, runs, final_state, digest,
+            spawn_profile=spawn_profile,
+            invulnerable=bool(options & REPLAY_INVULNERABLE),
+            narrow_phase=NARROW_PHASE_PIXEL if options & REPLAY_PIXEL_NARROW_PHASE else NARROW_PHASE_POLYGON
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, "wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Replay":
+        with open(path, "rb") as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+
+class ReplayRecorder:
+    """
+    Samples an input source once per tick into a Replay.
+
+    """
+    def __init__(
+            self,
+            seed: int,
+            step: float,
+            actions: Tuple[str, ...] = REPLAY_ACTIONS,
+            spawn_profile: str = "default",
+            invulnerable: bool = False,
+            narrow_phase: str = NARROW_PHASE_POLYGON
+    ):
+        """
+        :param seed: the seed of the game being recorded
+        :param step: length of each tick in seconds
+        :param actions: actions to record, in bit order
+        :param spawn_profile: name or path of the spawn profile being played
+        :param invulnerable: whether collisions are being ignored
+        :param narrow_phase: NARROW_PHASE_POLYGON or NARROW_PHASE_PIXEL
+        """
+        self.actions = actions
+        self.replay = Replay(
+            seed, step,
+            spawn_profile=spawn_profile,
+            invulnerable=invulnerable,
+            narrow_phase=narrow_phase
+        )
+
+    def record(self, input_source) -> None:
+        """
+        Record which actions are held for the tick about to run.
+
+        :param input_source: anything with an is_pressed(action) method
+        :return:
+        """
+        flags = 0
+        for bit, action in enumerate(self.actions):
+            if input_source.is_pressed(action):
+                flags |= 1 << bit
+        self.replay.append(flags)
+
+
+class ReplayPlayer:
+    """
+    A controller that holds the recorded actions on every tick.
+
+    Once the recording runs out, nothing is held.
+
+    """
+    def __init__(self, replay: Replay, actions: Tuple[str, ...] = REPLAY_ACTIONS):
+        """
+        :param replay: the replay to play back
+        :param actions: actions recorded, in bit order
+        """
+        self.replay = replay
+        self.actions = actions
+        self.input = ScriptedInput()
+        self._ticks = replay.ticks()
+
+    def update(self, simulation) -> None:
+        flags = next(self._ticks, 0)
+        for bit, action in enumerate(self.actions):
+            self.input.set_pressed(action, bool(flags & (1 << bit)))
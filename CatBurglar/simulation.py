@@ -0,0 +1,299 @@
+"""
+
+Gameplay state and rules, independent of any window or GL context.
+
+GameSimulation owns everything that decides how a game plays out: the
+player, the enemies and their spawner, physics, animation timers and the
+game state. GameView wraps one for play in a window, while headless runs
+drive one directly as fast as the CPU allows.
+
+Input is read through anything with an is_pressed(action) method, such as a
+KeyHandler or a ScriptedInput. A controller, such as one of the bots in
+CatBurglar.input.bots, may also be attached to decide input every tick.
+
+Every random decision in a game is drawn from one Random seeded at setup, so
+a game is reproduced exactly by its seed, tick length and per-tick input.
+A ReplayRecorder can be attached to capture that input as it's read.
+
+"""
+import hashlib
+import random
+import struct
+from enum import Enum, auto
+from random import Random
+from typing import Optional
+
+from arcade import SpriteList
+
+from CatBurglar.entity.animation import BatchAnimator
+from CatBurglar.entity.collision import AABBArrayIndex
+from CatBurglar.entity.physics import RunnerPhysicsEngine, NARROW_PHASE_POLYGON
+from CatBurglar.entity.pool import EnemyPool, DEFAULT_MAX_POOLED_ENEMIES
+from CatBurglar.entity.spawn_profile import SpawnProfile, load_spawn_profile, DEFAULT_SPAWN_PROFILE_NAME
+from CatBurglar.entity.spawner import EnemySpawner
+from CatBurglar.entity.terrain import TILE_SIZE_PX
+from CatBurglar.entity.Player import Player
+from CatBurglar.replay import Replay, ReplayRecorder
+from CatBurglar.util import StopwatchTimer
+
+# gameplay constants such as gravity and enemy speed are tuned per tick
+SIMULATION_STEP_SEC = 1 / 60
+
+# survive this long to win
+GAME_LENGTH_SEC = 2 * 60.0
+
+
+def check_step(step: float) -> None:
+    """
+    Make sure a recorded tick length, such as a replay's, is ours.
+
+    Velocities, gravity and jump speed are per tick rather than per second,
+    so the simulation always ticks SIMULATION_STEP_SEC at a time and games
+    recorded at any other length can't be played back.
+
+    :param step: length of a tick in seconds
+    :return:
+    """
+    if step != SIMULATION_STEP_SEC:
+        raise ValueError(
+            f"Ticks must be {SIMULATION_STEP_SEC} seconds long since gameplay is tuned per tick,"
+            f" got {step}"
+        )
+
+
+class GameState(Enum):
+    INTRO = auto()
+    PLAYING = auto()
+    LOST = auto()
+    WON = auto()
+
+
+class GameSimulation:
+    """
+
+    A single game, advanced one fixed-length tick at a time.
+
+    """
+    def __init__(
+            self,
+            key_handler,
+            controller=None,
+            max_pooled_enemies: int = DEFAULT_MAX_POOLED_ENEMIES,
+            game_length_sec: float = GAME_LENGTH_SEC,
+            seed: Optional[int] = None,
+            spawn_profile: Optional[SpawnProfile] = None,
+            invulnerable: bool = False,
+            narrow_phase: str = NARROW_PHASE_POLYGON
+    ):
+        """
+        :param key_handler: input source with an is_pressed(action) method
+        :param controller: optional object whose update(simulation) sets input each tick
+        :param max_pooled_enemies: most idle enemies of each type to keep for reuse
+        :param game_length_sec: how long the player must survive to win
+        :param seed: seed for the game's randomness, picked at setup if None
+        :param spawn_profile: how enemies spawn, the default profile file if None
+        :param invulnerable: keep playing through collisions, for stress tests
+        :param narrow_phase: NARROW_PHASE_POLYGON or NARROW_PHASE_PIXEL
+        """
+        self.key_handler = key_handler
+        self.controller = controller
+        self.max_pooled_enemies = max_pooled_enemies
+        self.game_length_sec = game_length_sec
+
+        self.seed = seed
+        self.rng: Random = None
+
+        self.spawn_profile = spawn_profile or load_spawn_profile(DEFAULT_SPAWN_PROFILE_NAME)
+        self.invulnerable = invulnerable
+        self.narrow_phase = narrow_phase
+
+        # set to capture input as the game is played
+        self.recorder: Optional[ReplayRecorder] = None
+
+        self.player: Player = None
+        self.sprite_list: SpriteList = None
+        self.enemy_list: SpriteList = None
+        self.animator: BatchAnimator = None
+        self.enemy_spawner: EnemySpawner = None
+        self.physics_engine: RunnerPhysicsEngine = None
+        self.global_time_elapsed: StopwatchTimer = None
+
+        self.game_state: GameState = GameState.INTRO
+        self.ticks = 0
+
+    def setup(self) -> None:
+        """
+        Create the player, enemy lists and systems for a fresh game.
+
+        :return:
+        """
+        # remember the seed even if it was picked for us, so it can be replayed
+        if self.seed is None:
+            self.seed = random.getrandbits(64)
+        self.rng = Random(self.seed)
+
+        ground_level_y = TILE_SIZE_PX
+        self.sprite_list = SpriteList()
+
+        # every animated sprite is ticked together instead of one by one
+        self.animator = BatchAnimator()
+
+        self.player = Player(self.key_handler)
+        self.player.set_position(2 * TILE_SIZE_PX, ground_level_y * 2)
+        self.sprite_list.append(self.player)
+        self.animator.add(self.player)
+
+        # Enemies will be moving instead of the player and the ground
+        self.enemy_list = SpriteList(use_spatial_hash=False)
+
+        self.global_time_elapsed = StopwatchTimer(running=True, maximum=self.game_length_sec)
+
+        self.enemy_spawner = EnemySpawner(
+            self.enemy_list,
+            self.global_time_elapsed,
+            animator=self.animator,
+            pool=EnemyPool(max_pooled=self.max_pooled_enemies),
+            rng=self.rng,
+            profile=self.spawn_profile
+        )
+
+        self.physics_engine = RunnerPhysicsEngine(
+            self.player,
+            self.key_handler,
+            self.enemy_list,
+            narrow_phase=self.narrow_phase
+        )
+
+        # the broad phase follows spawns and despawns instead of rescanning
+        broad_phase = self.physics_engine.broad_phase
+        self.enemy_spawner.spawn_listeners.append(broad_phase.insert)
+        self.enemy_spawner.despawn_listeners.append(broad_phase.remove_all)
+        if isinstance(broad_phase, AABBArrayIndex):
+            self.enemy_spawner.position_index = broad_phase
+
+        self.game_state = GameState.INTRO
+        self.ticks = 0
+
+    @property
+    def survival_time(self) -> float:
+        return self.global_time_elapsed.time
+
+    def start_recording(self) -> ReplayRecorder:
+        """
+        Record input from the next tick onwards.
+
+        :return: the recorder, whose replay fills in as ticks run
+        """
+        self.recorder = ReplayRecorder(
+            self.seed,
+            SIMULATION_STEP_SEC,
+            spawn_profile=self.spawn_profile.name,
+            invulnerable=self.invulnerable,
+            narrow_phase=self.narrow_phase
+        )
+        return self.recorder
+
+    def finish_recording(self) -> Optional[Replay]:
+        """
+        Stop recording and stamp the replay with how the game ended.
+
+        :return: the finished replay, or None if nothing was recording
+        """
+        recorder = self.recorder
+        if recorder is None:
+            return None
+        self.recorder = None
+
+        replay = recorder.replay
+        replay.final_state = self.game_state.value
+        replay.digest = self.state_digest()
+        return replay
+
+    def state_digest(self) -> bytes:
+        """
+        Short fingerprint of the game's current state.
+
+        Two runs of the same replay must produce the same digest, so any
+        drift in physics, spawning or timing shows up as a mismatch.
+
+        :return: 8 bytes
+        """
+        player = self.player
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(struct.pack(
+            "<IBddd",
+            self.ticks,
+            self.game_state.value,
+            self.global_time_elapsed.time,
+            *player.position
+        ))
+        for enemy in self.enemy_list:
+            digest.update(type(enemy).__name__.encode("ascii"))
+            digest.update(struct.pack("<dd", *enemy.position))
+        return digest.digest()
+
+    def start(self) -> None:
+        """
+        Leave the intro and begin playing.
+
+        :return:
+        """
+        if self.game_state == GameState.INTRO:
+            self.game_state = GameState.PLAYING
+
+    def tick(self) -> GameState:
+        """
+        Advance gameplay by exactly one tick of SIMULATION_STEP_SEC.
+
+        Does nothing unless the game is being played.
+
+        :return: the game state after the tick
+        """
+        delta_time = SIMULATION_STEP_SEC
+
+        if self.game_state != GameState.PLAYING:
+            return self.game_state
+
+        if self.controller is not None:
+            self.controller.update(self)
+        if self.recorder is not None:
+            self.recorder.record(self.key_handler)
+
+        self.ticks += 1
+        self.global_time_elapsed.update(delta_time=delta_time)
+
+        self.enemy_spawner.update(delta_time=delta_time)
+
+        # the player moves here and again in physics, which sweeps both moves
+        player_start = self.player.position
+        self.sprite_list.update()
+        self.enemy_list.update()
+        self.enemy_spawner.despawn_offscreen()
+
+        collisions = self.physics_engine.update(player_start=player_start)
+        if collisions and not self.invulnerable:
+            self.game_state = GameState.LOST
+
+        self.animator.update(delta_time=delta_time)
+
+        if self.game_state == GameState.PLAYING and self.global_time_elapsed.completion == 1.0:
+            self.game_state = GameState.WON
+
+        return self.game_state
+
+    def run(
+            self,
+            max_ticks: Optional[int] = None
+    ) -> GameState:
+        """
+        Play a whole game without pausing between ticks.
+
+        :param max_ticks: stop early after this many ticks if passed
+        :return: the game state once the game ended or was stopped
+        """
+        self.start()
+        while self.game_state == GameState.PLAYING:
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+            self.tick()
+        return self.game_state
@@ -100,3 +100,57 @@ class StopwatchTimer:
         return self._completion
 
 
+
+class FixedTimestep:
+    """
+
+    Accumulates real elapsed time and hands it back as whole fixed steps.
+
+    Simulation code can then run the same number of identically sized ticks
+    no matter the display's refresh rate. If the machine falls far enough
+    behind, the steps beyond max_steps are dropped so one slow frame can't
+    snowball into ever longer catch-up frames.
+
+    """
+    def __init__(
+            self,
+            step: float = 1 / 60,
+            max_steps: int = 5
+    ):
+        """
+        :param step: length of a single simulation tick in seconds
+        :param max_steps: most ticks to run for a single frame
+        """
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_steps = 0
+
+    def advance(self, delta_time: float) -> int:
+        """
+        Add elapsed time and return how many ticks should be run now.
+
+        :param delta_time: real time since the last call
+        :return: number of ticks to run
+        """
+        self.accumulator += delta_time
+        steps = int(self.accumulator // self.step)
+
+        if steps > self.max_steps:
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+            # keep the partial step so interpolation stays smooth
+            self.accumulator %= self.step
+        else:
+            self.accumulator -= steps * self.step
+
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """
+        How far between the last tick and the next one we are, from 0 to 1.
+
+        :return:
+        """
+        return self.accumulator / self.step
@@ -0,0 +1,107 @@
+"""
+Integer-indexed animation tables.
+
+Loaders produce dicts mapping state names to lists of frames. Compiling one
+gives every state a small integer id and stores the frames in tuples indexed
+by that id, so per-frame code can switch animations without hashing strings.
+The table still behaves as a read-only mapping of names to frames.
+
+Tables can also carry a pixel mask for every frame, laid out the same way
+as the frames, for pixel-exact collision.
+"""
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from arcade import Texture
+
+from CatBurglar.util.asset_loading import AnimationStateDict
+from CatBurglar.util.pixel_mask import PixelMask
+
+# Frames for a single animation state
+FrameSequence = Tuple[Texture, ...]
+
+
+class CompiledAnimationTable(Mapping):
+    """
+    Read-only animation table with integer state ids.
+
+    Required states aren't checked here. The loaders already did that once,
+    either when the manifest was built or when they scanned the directory,
+    so compiling trusts the table it's given.
+
+    """
+    __slots__ = ("names", "frames", "state_ids", "masks")
+
+    def __init__(
+            self,
+            table: AnimationStateDict,
+            build_masks: bool = False
+    ):
+        """
+        :param table: a dict mapping strings to lists of frames
+        :param build_masks: whether to precompute pixel masks for frames
+        """
+        self.names: Tuple[str, ...] = tuple(table.keys())
+        self.frames: Tuple[FrameSequence, ...] = tuple(
+            tuple(table[name]) for name in self.names
+        )
+        self.state_ids: Dict[str, int] = {
+            name: state_id for state_id, name in enumerate(self.names)
+        }
+
+        self.masks: Optional[Tuple[Tuple[PixelMask, ...], ...]] = None
+        if build_masks:
+            self.build_masks()
+
+    def build_masks(self) -> None:
+        """
+        Precompute a pixel mask for every frame if not done already.
+
+        :return:
+        """
+        if self.masks is None:
+            self.masks = tuple(
+                tuple(PixelMask.from_texture(frame) for frame in frames)
+                for frames in self.frames
+            )
+
+    def state_id(self, name: str) -> int:
+        """
+        Get the integer id of a state.
+
+        :param name: the state's name
+        :return:
+        """
+        try:
+            return self.state_ids[name]
+        except KeyError:
+            raise KeyError(f"No animation state named {name!r}, expected one of {self.names!r}")
+
+    def __getitem__(self, name: str) -> FrameSequence:
+        return self.frames[self.state_ids[name]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return name in self.state_ids
+
+
+def compile_animation_table(
+        table: Mapping,
+        build_masks: bool = False
+) -> CompiledAnimationTable:
+    """
+    Compile a table, passing already compiled tables through untouched.
+
+    :param table: a dict mapping strings to lists of frames
+    :param build_masks: whether to precompute pixel masks for frames
+    :return:
+    """
+    if isinstance(table, CompiledAnimationTable):
+        if build_masks:
+            table.build_masks()
+        return table
+    return CompiledAnimationTable(table, build_masks)
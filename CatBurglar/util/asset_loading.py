@@ -6,9 +6,14 @@ import os
 import re
 import logging
 from collections import defaultdict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 from arcade import Texture, load_texture
-from typing import Union, List, Callable, Dict, Any, Iterable, Mapping
+from typing import Union, List, Callable, Dict, Any, Iterable, Mapping, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from CatBurglar.util.asset_manifest import AssetManifest
+    from CatBurglar.util.texture_dedupe import TextureDeduplicator
 
 LOG = logging.getLogger('arcade')
 
@@ -20,6 +25,10 @@ AnimationStateDict = Mapping[str, List[Texture]]
 # are at the root of the project, this will be helpful to have cached.
 ASSET_BASE_PATH = Path.cwd() / "assets"
 
+# Shared pool for decoding images. PIL releases the GIL while decoding,
+# so threads are enough to spread the work across cores.
+ASSET_LOAD_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="asset_loading")
+
 # matches files of formats like walk_left_0.png. Not currently used
 # but can be passed to one of the functions below that takes regexes.
 SPRITE_FORMAT_REGEX_STRING = r"([A-Za-z0-9\-]+_([A-Za-z0-9\-]+))\_[0-9]+\.png"
@@ -36,7 +45,8 @@ def validate_path_and_fetch_children(
     """
 
     Validate a path as an existing file or folder, then return a list
-    of either the file itself as-is or its immediate child files.
+    of either the file itself as-is or its immediate child files, sorted
+    by name.
 
     Currently silently ignores sub-directories.
 
@@ -57,9 +67,10 @@ def validate_path_and_fetch_children(
     if convenient_path.is_file():
         processing_list.append(convenient_path)
 
-    # fetch all file children
+    # fetch all file children, sorted since iterdir's order depends on the
+    # filesystem and asset order feeds into seeded runs
     elif convenient_path.is_dir():
-        for child in convenient_path.iterdir():
+        for child in sorted(convenient_path.iterdir()):
             if child.is_file() and not ignore_files:
                 processing_list.append(child)
             elif child.is_dir() and not ignore_dirs:
@@ -106,34 +117,20 @@ class MissingSubgroup(AssetGroupError):
         super().__init__(message, subgroup)
 
 
-def load_asset_group(
+def collect_asset_group_paths(
         raw_source: Union[Path, str],
-        asset_loader: Callable,
         ignore_other_than: re.Pattern = None,
         exception_on_unexpected_filename: bool = True
-) -> Dict[str, List[Any]]:
+) -> Dict[str, List[Path]]:
     """
 
-    Load files to a dict of subgroup names -> lists of asset sequences.
-
-    These dicts can then be composed through dict merging or overridden.
-
-    The function assumes that the path passed is either a single file
-    or a folder containing files matching the following name format:
-        somestring_0.ext
-        otherstring_0.wav
-        otherstring_1.wav
-
-    The first part before the underscore is the subgroup name. The
-    number after the underscore is the sequence index.
+    Scan and validate files into a dict of subgroup names -> ordered paths.
 
-    By default, this function will raise an exception if the sequence
-    index (underscrore, number, and extension) isn't properly formed.
-    You can change that to a simple logging statement by setting
-    exception_on_unexpected_filename to False.
+    This is the filesystem half of load_asset_group. It performs all of the
+    naming and sequence validation without loading anything, so callers can
+    decide how and where the actual loading happens.
 
-    :param raw_source: file or directory that should be loaded
-    :param asset_loader: function that loads an asset from a path
+    :param raw_source: file or directory that should be scanned
     :param ignore_other_than: skip files that don't match this
     :param exception_on_unexpected_filename: whether to log or except
     :return:
@@ -177,11 +174,11 @@ def load_asset_group(
         # the keys of the second generated dict will be sorted below
         temp_subgroup_dict[asset_subgroup_name][asset_sequence_index] = file
 
-    # Sort the entries in the dictionary and load them.
+    # Sort the entries in the dictionary.
     # Written for easier understanding and debugging rather than conciseness.
     for subgroup_name, unsorted_entries in temp_subgroup_dict.items():
 
-        # iterate through keys in now-sorted order and attempt to load asset
+        # iterate through keys in now-sorted order and check for gaps
         previous = -1
 
         for index in sorted(unsorted_entries.keys()):
@@ -201,62 +198,227 @@ def load_asset_group(
                     LOG.warning(message)
 
             previous = index
-
-            # attempt loading the asset
-            asset = asset_loader(unsorted_entries[index])
-            final_ordering[subgroup_name].append(asset)
+            final_ordering[subgroup_name].append(unsorted_entries[index])
 
     # "freeze" output so it stops generating subgroup sequences
     return dict(final_ordering)
 
+
+def load_asset_paths(
+        subgroup_paths: Mapping[str, List[Path]],
+        asset_loader: Callable,
+        executor: Executor = None
+) -> Dict[str, List[Any]]:
+    """
+
+    Load a dict of subgroup names -> ordered paths into loaded assets.
+
+    If an executor is passed, every file is submitted to it up front and
+    the results are gathered back in their original order. Otherwise the
+    files are loaded one at a time on the calling thread.
+
+    Loaders that keep state, such as a TextureDiskCache, can offer a
+    worker_loader attribute for executors and a collect method that turns
+    each worker result into the asset back on the calling thread. That
+    keeps them usable with process pools, which would otherwise update
+    copies of the loader.
+
+    :param subgroup_paths: ordered paths, as from collect_asset_group_paths
+    :param asset_loader: function that loads an asset from a path
+    :param executor: optional thread or process pool to load on
+    :return:
+    """
+    if executor is None:
+        return {
+            subgroup_name: [asset_loader(path) for path in paths]
+            for subgroup_name, paths in subgroup_paths.items()
+        }
+
+    worker_loader = getattr(asset_loader, "worker_loader", None)
+    if worker_loader is None:
+        worker_loader = asset_loader
+        collect = None
+    else:
+        collect = asset_loader.collect
+
+    # submit everything before waiting on anything so the pool stays busy
+    pending = {
+        subgroup_name: [executor.submit(worker_loader, path) for path in paths]
+        for subgroup_name, paths in subgroup_paths.items()
+    }
+
+    if collect is None:
+        return {
+            subgroup_name: [future.result() for future in futures]
+            for subgroup_name, futures in pending.items()
+        }
+
+    return {
+        subgroup_name: [collect(future.result()) for future in futures]
+        for subgroup_name, futures in pending.items()
+    }
+
+
+def load_asset_group(
+        raw_source: Union[Path, str],
+        asset_loader: Callable,
+        ignore_other_than: re.Pattern = None,
+        exception_on_unexpected_filename: bool = True,
+        executor: Executor = None
+) -> Dict[str, List[Any]]:
+    """
+
+    Load files to a dict of subgroup names -> lists of asset sequences.
+
+    These dicts can then be composed through dict merging or overridden.
+
+    The function assumes that the path passed is either a single file
+    or a folder containing files matching the following name format:
+        somestring_0.ext
+        otherstring_0.wav
+        otherstring_1.wav
+
+    The first part before the underscore is the subgroup name. The
+    number after the underscore is the sequence index.
+
+    By default, this function will raise an exception if the sequence
+    index (underscrore, number, and extension) isn't properly formed.
+    You can change that to a simple logging statement by setting
+    exception_on_unexpected_filename to False.
+
+    Validation always happens before any loading, so passing an executor
+    doesn't change which errors get raised or the order of the output.
+
+    :param raw_source: file or directory that should be loaded
+    :param asset_loader: function that loads an asset from a path
+    :param ignore_other_than: skip files that don't match this
+    :param exception_on_unexpected_filename: whether to log or except
+    :param executor: optional thread or process pool to load on
+    :return:
+    """
+    subgroup_paths = collect_asset_group_paths(
+        raw_source,
+        ignore_other_than=ignore_other_than,
+        exception_on_unexpected_filename=exception_on_unexpected_filename
+    )
+    return load_asset_paths(subgroup_paths, asset_loader, executor=executor)
+
+
+def ensure_required_subgroups(
+        table: Mapping[str, Any],
+        required_state_subgroups: Iterable[str],
+        path: Union[Path, str]
+) -> None:
+    """
+    Raise a MissingSubgroup error if any required subgroup is absent.
+
+    :param table: a dict of subgroup names to anything
+    :param required_state_subgroups: list of subgroups to ensure
+    :param path: where the table came from, for the error message
+    :return:
+    """
+    for state in required_state_subgroups:
+        if state not in table:
+            raise MissingSubgroup(f"Missing subgroup member: {state!r} in {path!r}", state)
+
+
 def preload_entity_texture_table(
         path: Union[Path, str],
-        required_state_subgroups: Iterable[str]
+        required_state_subgroups: Iterable[str],
+        executor: Executor = None,
+        texture_loader: Callable[[Path], Texture] = load_texture,
+        manifest: "AssetManifest" = None,
+        deduplicator: "TextureDeduplicator" = None
 ) -> AnimationStateDict:
     """
     Convenience method around load_asset_group for loading textures.
 
     Will Raise an AssetError if a state passed as required is missing.
 
+    If a manifest is passed and lists this path, its frame listing is
+    trusted as-is and the directory isn't scanned or validated again.
+
+    If a deduplicator is passed, frames with identical pixels to ones it
+    has already seen are replaced by the earlier texture before packing.
+
     :param path: a path to load textures from
     :param required_state_subgroups: list of subgroups to ensure
+    :param executor: optional thread or process pool to decode on
+    :param texture_loader: loads a texture from a path, such as a disk cache
+    :param manifest: optional prebuilt listing of the asset directory
+    :param deduplicator: optional store of textures to share frames with
     :return:
     """
+    subgroup_paths = manifest.subgroup_paths(path) if manifest else None
 
-    output = load_asset_group(
-        path,
-        load_texture
-    )
-    for state in required_state_subgroups:
-        if state not in output:
-            raise MissingSubgroup(f"Missing subgroup member: {state!r} in {path!r}", state)
+    # the manifest was validated when it was built
+    if subgroup_paths is None:
+        subgroup_paths = collect_asset_group_paths(path)
+        ensure_required_subgroups(subgroup_paths, required_state_subgroups, path)
+
+    output = load_asset_paths(subgroup_paths, texture_loader, executor=executor)
+
+    if deduplicator:
+        output = deduplicator.add_table(output)
 
     return output
 
 
 def preload_entity_texture_alt_skin_table(
     alt_skins_root: Union[Path, str],
-    required_state_subgroups: Iterable[str]
+    required_state_subgroups: Iterable[str],
+    executor: Executor = None,
+    texture_loader: Callable[[Path], Texture] = load_texture,
+    manifest: "AssetManifest" = None,
+    deduplicator: "TextureDeduplicator" = None
 ) -> List[AnimationStateDict]:
     """
     Load multiple versiobns of an alt skin table that are stored in subdirs
 
+    Every skin is scanned and validated before any decoding starts. When an
+    executor is passed, the frames of all skins are decoded on it at once
+    rather than one skin directory after another.
+
     :param alt_skins_root:
     :param required_state_subgroups:
+    :param executor: optional thread or process pool to decode on
+    :param texture_loader: loads a texture from a path, such as a disk cache
+    :param manifest: optional prebuilt listing of the asset directory
+    :param deduplicator: optional store of textures to share frames with
     :return:
     """
-    skin_dirs = validate_path_and_fetch_children(
-        alt_skins_root,
-        ignore_files=True,
-        ignore_dirs=False
-    )
+    skin_dirs = manifest.skin_dirs(alt_skins_root) if manifest else None
+
+    if skin_dirs is None:
+        skin_dirs = validate_path_and_fetch_children(
+            alt_skins_root,
+            ignore_files=True,
+            ignore_dirs=False
+        )
 
-    alt_skin_table = []
+    skin_paths = []
     for skin_dir in skin_dirs:
-        alt_skin_table.append(preload_entity_texture_table(
-            skin_dir,
-            required_state_subgroups
-        ))
+        subgroup_paths = manifest.subgroup_paths(skin_dir) if manifest else None
 
-    return alt_skin_table
+        if subgroup_paths is None:
+            subgroup_paths = collect_asset_group_paths(skin_dir)
+            ensure_required_subgroups(subgroup_paths, required_state_subgroups, skin_dir)
+
+        skin_paths.append(subgroup_paths)
+
+    # merge every skin into one batch so the pool sees all files at once
+    merged_paths = {
+        (skin_index, subgroup_name): paths
+        for skin_index, subgroup_paths in enumerate(skin_paths)
+        for subgroup_name, paths in subgroup_paths.items()
+    }
+    merged_textures = load_asset_paths(merged_paths, texture_loader, executor=executor)
 
+    alt_skin_table = [{} for _ in skin_paths]
+    for (skin_index, subgroup_name), textures in merged_textures.items():
+        alt_skin_table[skin_index][subgroup_name] = textures
+
+    if deduplicator:
+        alt_skin_table = [deduplicator.add_table(table) for table in alt_skin_table]
+
+    return alt_skin_table
@@ -0,0 +1,193 @@
+"""
+Prebuilt manifest of the asset directory.
+
+The manifest lists every registered asset group with its subgroups and
+frames already ordered, plus the skin directories of every alt skin table.
+It is compiled ahead of time by the catburglar-build-manifest command, which
+also runs all of the naming, sequence and required state validation. At
+startup the loaders trust the manifest instead of walking directories.
+
+Rebuild the manifest whenever files under assets/ are added or renamed.
+"""
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from CatBurglar.util.asset_loading import (
+    ASSET_BASE_PATH,
+    collect_asset_group_paths,
+    ensure_required_subgroups,
+    validate_path_and_fetch_children
+)
+
+LOG = logging.getLogger('arcade')
+
+ASSET_MANIFEST_PATH = ASSET_BASE_PATH / "manifest.json"
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+class AssetManifest:
+    """
+    Read-only view of a compiled manifest file.
+
+    The file is read the first time it is queried rather than on creation,
+    so an unused manifest costs nothing. A missing file just means every
+    lookup misses and callers fall back to scanning the filesystem.
+
+    """
+    def __init__(self, path: Union[Path, str] = ASSET_MANIFEST_PATH):
+        """
+        :param path: the manifest file, normally inside the assets directory
+        """
+        self.path = Path(path)
+        self.asset_root = self.path.parent
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    @property
+    def available(self) -> bool:
+        return bool(self.data)
+
+    def _read(self) -> Dict[str, Any]:
+        if not self.path.is_file():
+            return {}
+
+        with open(self.path, "r") as manifest_file:
+            data = json.load(manifest_file)
+
+        if data.get("format_version") != MANIFEST_FORMAT_VERSION:
+            LOG.warning(f"Ignoring asset manifest with unknown format at {self.path}")
+            return {}
+
+        return data
+
+    def _key_for(self, path: Union[Path, str]) -> Optional[str]:
+        try:
+            return Path(path).relative_to(self.asset_root).as_posix()
+        except ValueError:
+            return None
+
+    def subgroup_paths(self, path: Union[Path, str]) -> Optional[Dict[str, List[Path]]]:
+        """
+        Get the ordered frame paths of a group, or None if it isn't listed.
+
+        :param path: the group's directory
+        :return: the same shape collect_asset_group_paths returns
+        """
+        group = self.data.get("groups", {}).get(self._key_for(path))
+        if group is None:
+            return None
+
+        return {
+            subgroup_name: [self.asset_root / file for file in files]
+            for subgroup_name, files in group.items()
+        }
+
+    def skin_dirs(self, alt_skins_root: Union[Path, str]) -> Optional[List[Path]]:
+        """
+        Get the skin directories under a root, or None if it isn't listed.
+
+        :param alt_skins_root: directory holding one subdir per skin
+        :return:
+        """
+        skins = self.data.get("skins", {}).get(self._key_for(alt_skins_root))
+        if skins is None:
+            return None
+
+        return [self.asset_root / skin for skin in skins]
+
+
+def compile_manifest(
+        texture_table_specs: Mapping[str, Any],
+        asset_root: Union[Path, str] = ASSET_BASE_PATH
+) -> Dict[str, Any]:
+    """
+    Scan and validate every table, then return manifest data for them.
+
+    Raises the same errors the loaders would, just ahead of time.
+
+    :param texture_table_specs: registered table names -> TextureTableSpec
+    :param asset_root: directory that manifest paths are relative to
+    :return: data ready to be dumped as json
+    """
+    asset_root = Path(asset_root)
+    groups = {}
+    skins = {}
+
+    def relative(path: Path) -> str:
+        return Path(path).relative_to(asset_root).as_posix()
+
+    for name, spec in texture_table_specs.items():
+        if spec.alt_skins:
+            group_dirs = validate_path_and_fetch_children(
+                spec.path,
+                ignore_files=True,
+                ignore_dirs=False
+            )
+            group_dirs.sort()
+            skins[relative(spec.path)] = [relative(skin_dir) for skin_dir in group_dirs]
+        else:
+            group_dirs = [spec.path]
+
+        for group_dir in group_dirs:
+            subgroup_paths = collect_asset_group_paths(group_dir)
+            ensure_required_subgroups(
+                subgroup_paths,
+                spec.required_state_subgroups,
+                group_dir
+            )
+            groups[relative(group_dir)] = {
+                subgroup_name: [relative(path) for path in paths]
+                for subgroup_name, paths in sorted(subgroup_paths.items())
+            }
+
+    return {
+        "format_version": MANIFEST_FORMAT_VERSION,
+        "groups": groups,
+        "skins": skins
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile the assets directory into a manifest for fast startup."
+    )
+    parser.add_argument(
+        "-o", "--output",
+        type=Path,
+        default=ASSET_MANIFEST_PATH,
+        help="where to write the manifest"
+    )
+    args = parser.parse_args()
+
+    # importing the entities registers every texture table they use
+    import CatBurglar.entity.cop
+    import CatBurglar.entity.Player
+    import CatBurglar.entity.terrain
+    from CatBurglar.util.asset_registry import ASSET_REGISTRY
+
+    manifest = compile_manifest(
+        ASSET_REGISTRY.texture_table_specs,
+        asset_root=args.output.parent
+    )
+
+    with open(args.output, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+    print(f"Wrote {len(manifest['groups'])} asset groups to {args.output}")
+
+
+# Shared by the asset registry
+ASSET_MANIFEST = AssetManifest()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Lazy registry for texture tables.
+
+Entity modules register what they need at import time, but nothing is read
+from disk until an entity first asks for a table or the game explicitly
+prefetches them. Importing the package is therefore free of asset I/O.
+"""
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from CatBurglar.util.asset_loading import (
+    ASSET_LOAD_EXECUTOR,
+    preload_entity_texture_table,
+    preload_entity_texture_alt_skin_table
+)
+from CatBurglar.util.animation_table import compile_animation_table
+from CatBurglar.util.asset_manifest import ASSET_MANIFEST
+from CatBurglar.util.texture_cache import ASSET_DISK_CACHE
+from CatBurglar.util.texture_dedupe import ENTITY_TEXTURE_DEDUPLICATOR
+
+
+class TextureTableSpec:
+    """
+    Describes where a registered texture table lives and what it needs.
+
+    Kept so tools can inspect registered tables without loading them.
+
+    """
+    def __init__(
+            self,
+            path: Union[Path, str],
+            required_state_subgroups: Iterable[str],
+            alt_skins: bool = False
+    ):
+        """
+        :param path: the table's directory, or root of skin dirs
+        :param required_state_subgroups: list of subgroups to ensure
+        :param alt_skins: whether path holds one subdir per skin
+        """
+        self.path = Path(path)
+        self.required_state_subgroups = list(required_state_subgroups)
+        self.alt_skins = alt_skins
+
+
+class LazyAsset:
+    """
+    Handle for a registered asset that loads itself on first access.
+
+    """
+    def __init__(
+            self,
+            registry: "AssetRegistry",
+            name: str,
+            loader: Callable[..., Any],
+            spec: Optional[TextureTableSpec] = None
+    ):
+        """
+        :param registry: the registry that owns this asset
+        :param name: the name the asset is registered under
+        :param loader: called with the registry's load options to load it
+        :param spec: description of the texture table, if it is one
+        """
+        self.registry = registry
+        self.name = name
+        self.loader = loader
+        self.spec = spec
+        self._value = None
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        """
+        Return the asset, loading it first if this is the first request.
+
+        :return:
+        """
+        # fast path once loaded, no locking needed
+        if self._loaded:
+            return self._value
+
+        with self.registry.lock:
+            if not self._loaded:
+                self._value = self.loader(**self.registry.load_options)
+                self._loaded = True
+
+        return self._value
+
+    def unload(self) -> None:
+        """
+        Drop the loaded value so the next request loads it again.
+
+        :return:
+        """
+        with self.registry.lock:
+            self._value = None
+            self._loaded = False
+
+
+class AssetRegistry:
+    """
+    Maps names to lazily loaded assets.
+
+    Load options such as the executor and disk cache are held here rather than
+    at each registration site, so they can be changed in one place before
+    anything gets loaded.
+
+    """
+    def __init__(self, **load_options):
+        """
+        :param load_options: keyword arguments passed to every loader
+        """
+        self.load_options: Dict[str, Any] = load_options
+        self.lock = RLock()
+        self._assets: Dict[str, LazyAsset] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._assets
+
+    def __getitem__(self, name: str) -> Any:
+        return self._assets[name].get()
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._assets.keys())
+
+    @property
+    def texture_table_specs(self) -> Dict[str, TextureTableSpec]:
+        return {
+            name: asset.spec
+            for name, asset in self._assets.items()
+            if asset.spec is not None
+        }
+
+    def register(
+            self,
+            name: str,
+            loader: Callable[..., Any],
+            spec: Optional[TextureTableSpec] = None
+    ) -> LazyAsset:
+        """
+        Register a loader under a name without calling it.
+
+        :param name: unique name for the asset
+        :param loader: called with the load options when first needed
+        :param spec: description of the texture table, if it is one
+        :return: a handle that can be used to fetch the asset later
+        """
+        if name in self._assets:
+            raise ValueError(f"An asset is already registered as {name!r}")
+
+        asset = LazyAsset(self, name, loader, spec=spec)
+        self._assets[name] = asset
+        return asset
+
+    def register_texture_table(
+            self,
+            name: str,
+            path: Union[Path, str],
+            required_state_subgroups: Iterable[str]
+    ) -> LazyAsset:
+        """
+        Register a texture table to load with preload_entity_texture_table.
+
+        The loaded table is compiled into a CompiledAnimationTable. Its
+        pixel masks are left for the pixel narrow phase to build on use.
+
+        :param name: unique name for the table
+        :param path: a path to load textures from
+        :param required_state_subgroups: list of subgroups to ensure
+        :return:
+        """
+        spec = TextureTableSpec(path, required_state_subgroups)
+        return self.register(
+            name,
+            lambda **options: compile_animation_table(
+                preload_entity_texture_table(
+                    spec.path, spec.required_state_subgroups, **options
+                )
+            ),
+            spec=spec
+        )
+
+    def register_alt_skin_table(
+            self,
+            name: str,
+            alt_skins_root: Union[Path, str],
+            required_state_subgroups: Iterable[str]
+    ) -> LazyAsset:
+        """
+        Register a skin table to load with preload_entity_texture_alt_skin_table.
+
+        Each loaded skin is compiled into a CompiledAnimationTable. Their
+        pixel masks are left for the pixel narrow phase to build on use.
+
+        :param name: unique name for the table
+        :param alt_skins_root: directory holding one subdir per skin
+        :param required_state_subgroups: list of subgroups to ensure
+        :return:
+        """
+        spec = TextureTableSpec(alt_skins_root, required_state_subgroups, alt_skins=True)
+        return self.register(
+            name,
+            lambda **options: [
+                compile_animation_table(skin)
+                for skin in preload_entity_texture_alt_skin_table(
+                    spec.path, spec.required_state_subgroups, **options
+                )
+            ],
+            spec=spec
+        )
+
+    def prefetch(self, *names: str) -> None:
+        """
+        Load the named assets now, or every registered asset if none given.
+
+        :param names: names of the assets to load
+        :return:
+        """
+        for name in names or self.names:
+            self._assets[name].get()
+
+
+# Shared registry used by every entity in the game
+ASSET_REGISTRY = AssetRegistry(
+    executor=ASSET_LOAD_EXECUTOR,
+    texture_loader=ASSET_DISK_CACHE,
+    manifest=ASSET_MANIFEST,
+    deduplicator=ENTITY_TEXTURE_DEDUPLICATOR
+)
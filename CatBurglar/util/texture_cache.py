@@ -0,0 +1,329 @@
+"""
+Persistent on-disk cache of decoded textures and their hit boxes.
+
+Each cache entry is a small binary file that holds a header, the hit box
+points, and the raw RGBA pixels. Entries are memory-mapped when read, so a
+warm start skips both PNG decoding and hit box computation.
+
+Entry layout, little-endian:
+    header: magic, format version, width, height, hit box point count,
+            source mtime in ns, source size, SHA-1 of the source
+    points: point count pairs of float32
+    pixels: width * height * 4 bytes of RGBA, top row first
+"""
+import hashlib
+import io
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from functools import partial
+from threading import Lock
+from typing import Callable, Dict, NamedTuple, Set, Tuple, Union
+
+import PIL.Image
+from arcade import Texture
+
+LOG = logging.getLogger('arcade')
+
+# Kept next to the assets directory for the same reason ASSET_BASE_PATH is
+ASSET_CACHE_PATH = Path.cwd() / ".asset_cache"
+
+CACHE_MAGIC = b"CBTX"
+
+# bump this whenever the layout or the hit box algorithm changes
+CACHE_FORMAT_VERSION = 2
+
+CACHE_ENTRY_SUFFIX = ".cbtx"
+
+# magic, version, width, height, point count, source mtime, size and digest
+HEADER_STRUCT = struct.Struct("<4sHHHHqQ20s")
+
+
+class SourceStamp(NamedTuple):
+    """
+    What an entry was built from, to tell whether it's still current.
+
+    """
+    mtime_ns: int
+    size: int
+    digest: bytes
+
+
+class CachedLoad(NamedTuple):
+    """
+    A texture loaded through a cache, and how it went.
+
+    """
+    texture: Texture
+    entry: Path
+    hit: bool
+
+
+class TextureDiskCache:
+    """
+    Loads textures through a directory of memory-mappable cache entries.
+
+    There is one entry per resolved file path, stamped with the mtime, size
+    and hash of the file it was built from. A warm load only stats the
+    file. It's read and hashed only when the mtime or size differ, so an
+    edited asset rebuilds its entry while a merely touched one keeps it.
+
+    Loads may run on several threads at once. Process pools can't share
+    the counters and the record of touched entries, so executors are
+    handed worker_loader instead, and each result is passed back through
+    collect on this side.
+
+    """
+    def __init__(self, cache_dir: Union[Path, str] = ASSET_CACHE_PATH):
+        """
+        :param cache_dir: where to keep cache entries, created if missing
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+        # entries loaded or written since this cache was created
+        self._touched: Set[Path] = set()
+        self._lock = Lock()
+
+        # resolving paths costs more than reading a small entry, so only do it once
+        self._entry_paths: Dict[Path, Path] = {}
+
+    def __call__(self, raw_path: Union[Path, str]) -> Texture:
+        return self.load(raw_path)
+
+    @property
+    def worker_loader(self) -> Callable[[Union[Path, str]], CachedLoad]:
+        """
+        A picklable loader for executors, such as a process pool.
+
+        :return: a function of a path whose results go to collect
+        """
+        return partial(load_through_cache, self.cache_dir)
+
+    def entry_path(self, path: Path) -> Path:
+        """
+        Get the cache entry location for a source file.
+
+        :param path: the source file
+        :return:
+        """
+        entry = self._entry_paths.get(path)
+        if entry is None:
+            entry = self._entry_paths[path] = cache_entry_path(self.cache_dir, path)
+        return entry
+
+    def collect(self, result: CachedLoad) -> Texture:
+        """
+        Count a load done by worker_loader, possibly in another process.
+
+        :param result: what worker_loader returned
+        :return: the loaded texture
+        """
+        with self._lock:
+            self._touched.add(result.entry)
+            if result.hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return result.texture
+
+    def load(self, raw_path: Union[Path, str]) -> Texture:
+        """
+        Load a texture, using a cache entry if one exists and creating
+        one if it doesn't.
+
+        Calling the cache does the same, so pass the cache itself as the
+        asset_loader for load_asset_group to let executors use
+        worker_loader.
+
+        :param raw_path: an image file to load
+        :return:
+        """
+        path = Path(raw_path)
+        return self.collect(load_through_cache(self.cache_dir, path, self.entry_path(path)))
+
+    def prune(self) -> int:
+        """
+        Delete every entry not loaded through this cache, such as ones left
+        behind by assets that were renamed or removed.
+
+        Call once everything the game uses has been loaded.
+
+        :return: how many entries were deleted
+        """
+        if not self.cache_dir.is_dir():
+            return 0
+
+        with self._lock:
+            touched = set(self._touched)
+
+        pruned = 0
+        for entry in self.cache_dir.glob(f"*{CACHE_ENTRY_SUFFIX}"):
+            if entry not in touched:
+                entry.unlink()
+                pruned += 1
+        return pruned
+
+    def clear(self) -> None:
+        """
+        Delete every cache entry in the cache directory.
+
+        :return:
+        """
+        if not self.cache_dir.is_dir():
+            return
+        for entry in self.cache_dir.glob(f"*{CACHE_ENTRY_SUFFIX}"):
+            entry.unlink()
+
+
+def cache_entry_path(cache_dir: Path, path: Path) -> Path:
+    """
+    Where the cache entry for a source file goes.
+
+    :param cache_dir: the cache directory
+    :param path: the source file
+    :return:
+    """
+    key = hashlib.sha1(str(path.resolve()).encode("utf-8"))
+    return cache_dir / f"{key.hexdigest()}{CACHE_ENTRY_SUFFIX}"
+
+
+def load_through_cache(
+        cache_dir: Path,
+        raw_path: Union[Path, str],
+        entry: Path = None
+) -> CachedLoad:
+    """
+    Load a texture through the entry for it in a cache directory.
+
+    Doesn't touch any TextureDiskCache, so it can run in another process.
+
+    :param cache_dir: the cache directory
+    :param raw_path: an image file to load
+    :param entry: the file's cache entry, looked up if None
+    :return:
+    """
+    path = Path(raw_path)
+    if entry is None:
+        entry = cache_entry_path(cache_dir, path)
+    stat = path.stat()
+
+    cached = None
+    try:
+        cached = read_cache_entry(entry)
+    except FileNotFoundError:
+        pass
+
+    # a corrupt entry shouldn't stop the game, just rebuild it
+    except (ValueError, struct.error, OSError) as e:
+        LOG.warning(f"Discarding unreadable texture cache entry {entry}: {e}")
+
+    data = None
+    if cached is not None:
+        image, points, stamp = cached
+        if stamp.mtime_ns == stat.st_mtime_ns and stamp.size == stat.st_size:
+            return CachedLoad(_texture_with_hit_box(str(path), image, points), entry, True)
+
+        # the file was touched, only now is it worth reading to compare
+        data = path.read_bytes()
+        digest = hashlib.sha1(data).digest()
+        if digest == stamp.digest:
+            _write(entry, image, points, SourceStamp(stat.st_mtime_ns, stat.st_size, digest))
+            return CachedLoad(_texture_with_hit_box(str(path), image, points), entry, True)
+
+    if data is None:
+        data = path.read_bytes()
+
+    image = PIL.Image.open(io.BytesIO(data)).convert("RGBA")
+    texture = Texture(str(path), image=image)
+
+    stamp = SourceStamp(stat.st_mtime_ns, stat.st_size, hashlib.sha1(data).digest())
+    _write(entry, image, texture.hit_box_points, stamp)
+
+    return CachedLoad(texture, entry, False)
+
+
+def _write(entry: Path, image: PIL.Image.Image, points, stamp: SourceStamp) -> None:
+    try:
+        write_cache_entry(entry, image, points, stamp)
+    except OSError as e:
+        LOG.warning(f"Couldn't write texture cache entry {entry}: {e}")
+
+
+def _texture_with_hit_box(name: str, image: PIL.Image.Image, points) -> Texture:
+    texture = Texture(name, image=image)
+    # arcade computes hit boxes lazily and stores them here, so seeding it
+    # skips the computation entirely.
+    texture._hit_box_points = points
+    return texture
+
+
+def write_cache_entry(entry: Path, image: PIL.Image.Image, points, stamp: SourceStamp) -> None:
+    """
+    Atomically write an image and its hit box to a cache entry.
+
+    :param entry: where to write the entry
+    :param image: an RGBA image
+    :param points: the hit box points for the image
+    :param stamp: the source file the entry was built from
+    :return:
+    """
+    width, height = image.size
+    flat_points = [coordinate for point in points for coordinate in point]
+
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = entry.with_suffix(f".{os.getpid()}.tmp")
+
+    with open(temp_path, "wb") as out:
+        out.write(HEADER_STRUCT.pack(
+            CACHE_MAGIC, CACHE_FORMAT_VERSION, width, height, len(points), *stamp
+        ))
+        out.write(struct.pack(f"<{len(flat_points)}f", *flat_points))
+        out.write(image.tobytes("raw", "RGBA"))
+
+    # readers never see a half-written entry
+    os.replace(temp_path, entry)
+
+
+def read_cache_entry(entry: Path) -> Tuple[PIL.Image.Image, Tuple[Tuple[float, float], ...], SourceStamp]:
+    """
+    Memory-map a cache entry and return its image, hit box and stamp.
+
+    The returned image reads its pixels straight out of the mapping.
+
+    :param entry: the entry to read
+    :return: the image, its hit box points and what it was built from
+    """
+    with open(entry, "rb") as source:
+        mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapping) < HEADER_STRUCT.size:
+        raise ValueError("truncated header")
+
+    magic, version, width, height, point_count, mtime_ns, size, digest = HEADER_STRUCT.unpack_from(mapping, 0)
+    if magic != CACHE_MAGIC or version != CACHE_FORMAT_VERSION:
+        raise ValueError("unrecognized header")
+
+    offset = HEADER_STRUCT.size
+    flat_points = struct.unpack_from(f"<{point_count * 2}f", mapping, offset)
+    offset += point_count * 2 * 4
+
+    pixel_count = width * height * 4
+    if len(mapping) - offset != pixel_count:
+        raise ValueError("truncated pixel data")
+
+    image = PIL.Image.frombuffer(
+        "RGBA",
+        (width, height),
+        memoryview(mapping)[offset:offset + pixel_count],
+        "raw", "RGBA", 0, 1
+    )
+    points = tuple(zip(flat_points[0::2], flat_points[1::2]))
+    return image, points, SourceStamp(mtime_ns, size, digest)
+
+
+# Shared by the asset registry
+ASSET_DISK_CACHE = TextureDiskCache()
@@ -0,0 +1,93 @@
+"""
+Sharing of pixel-identical textures between tables.
+
+Skins and entities often reuse frames, such as a cop skin's still frame
+copied to another skin. Hashing decoded pixels lets every copy share a
+single texture object so memory grows with unique frames rather than files.
+"""
+import hashlib
+import logging
+from typing import Dict, List
+
+from arcade import Texture
+
+from CatBurglar.util.asset_loading import AnimationStateDict
+
+LOG = logging.getLogger('arcade')
+
+
+class TextureDeduplicator:
+    """
+    Hands back the first texture seen with the same size and pixels.
+
+    """
+    def __init__(self):
+        self._by_digest: Dict[bytes, Texture] = {}
+
+        # statistics for reporting how much sharing saved
+        self.textures_seen = 0
+        self.duplicates_found = 0
+        self.bytes_saved = 0
+
+    @property
+    def unique_textures(self) -> int:
+        return len(self._by_digest)
+
+    @property
+    def textures(self) -> List[Texture]:
+        """
+        Every distinct texture seen so far, in the order first seen.
+
+        :return:
+        """
+        return list(self._by_digest.values())
+
+    def add(self, texture: Texture) -> Texture:
+        """
+        Return a shared texture with the same pixels as the passed one.
+
+        :param texture: a texture with a loaded image
+        :return: the passed texture, or an earlier identical one
+        """
+        self.textures_seen += 1
+
+        image = texture.image
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+
+        width, height = image.size
+        digest = hashlib.sha1(
+            f"{width}x{height}:".encode("ascii") + image.tobytes()
+        ).digest()
+
+        existing = self._by_digest.get(digest)
+        if existing is not None:
+            self.duplicates_found += 1
+            self.bytes_saved += width * height * 4
+            return existing
+
+        self._by_digest[digest] = texture
+        return texture
+
+    def add_table(self, table: AnimationStateDict) -> AnimationStateDict:
+        """
+        Replace every frame of a table with its shared texture.
+
+        :param table: a dict mapping strings to lists of frames
+        :return: a dict of the same shape holding shared textures
+        """
+        return {
+            state: [self.add(frame) for frame in frames]
+            for state, frames in table.items()
+        }
+
+    def log_summary(self) -> None:
+        LOG.info(
+            f"Texture sharing: {self.textures_seen} frames loaded,"
+            f" {self.unique_textures} unique, {self.duplicates_found} shared,"
+            f" {self.bytes_saved / 1024:.1f} KiB of pixel data saved"
+        )
+
+
+# Shared by the asset registry
+ENTITY_TEXTURE_DEDUPLICATOR = TextureDeduplicator()
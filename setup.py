@@ -1,6 +1,7 @@
 from setuptools import setup, find_packages
 
-install_requires = ['arcade>=2.5.6']
+# CatBurglar.entity.pool.remove_sprites edits SpriteList internals that 2.6 reworked
+install_requires = ['arcade>=2.5.6,<2.6', 'numpy']
 
 with open("README.md", "r") as longfile:
     long_description = longfile.read()
@@ -14,7 +15,10 @@ setup(
     long_description_content_type="text/markdown",
     entry_points={
         "console_scripts": [
-           'catburglar=CatBurglar.main:main'
+           'catburglar=CatBurglar.main:main',
+           'catburglar-build-manifest=CatBurglar.util.asset_manifest:main',
+           'catburglar-simulate=CatBurglar.headless:main',
+           'catburglar-benchmark=CatBurglar.benchmark:main'
         ]
     },
     python_requires='>=3.7'
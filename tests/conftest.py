@@ -0,0 +1,9 @@
+"""
+Lets the tests import arcade on machines without a display.
+
+pyglet opens a hidden window as soon as arcade is imported unless told not
+to, and these tests never draw.
+"""
+import pyglet
+
+pyglet.options["shadow_window"] = False
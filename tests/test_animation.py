@@ -0,0 +1,102 @@
+import PIL.Image
+from arcade import Texture
+
+from CatBurglar.entity import NamedAnimationsSprite, STILL_RIGHT
+from CatBurglar.entity.animation import BatchAnimator
+
+TICK = 1 / 60
+
+
+def frames(name: str, count: int):
+    return [
+        Texture(f"{name}_{index}", image=PIL.Image.new("RGBA", (2, 2), (index, 0, 0, 255)))
+        for index in range(count)
+    ]
+
+
+def make_sprite(frame_count: int = 3, frame_length: float = 1 / 12) -> NamedAnimationsSprite:
+    return NamedAnimationsSprite(
+        animations={STILL_RIGHT: frames("still", frame_count), "other": frames("other", 2)},
+        frame_length=frame_length
+    )
+
+
+def animation_state(sprite):
+    return sprite.current_animation_frame_index, sprite.texture, sprite.animation_expiring
+
+
+def test_batch_matches_sprites_ticking_themselves():
+    animator = BatchAnimator(capacity=1)
+    solo = [make_sprite(count, length) for count, length in ((1, 1 / 12), (3, 1 / 12), (4, 1 / 20))]
+    batched = [make_sprite(count, length) for count, length in ((1, 1 / 12), (3, 1 / 12), (4, 1 / 20))]
+    for sprite in batched:
+        animator.add(sprite)
+
+    for _ in range(40):
+        for sprite in solo:
+            sprite.update_animation(TICK)
+        animator.update(TICK)
+
+        for solo_sprite, batched_sprite in zip(solo, batched):
+            solo_index, solo_texture, solo_expiring = animation_state(solo_sprite)
+            batched_index, batched_texture, batched_expiring = animation_state(batched_sprite)
+            assert batched_index == solo_index
+            assert batched_texture.name == solo_texture.name
+            assert batched_expiring == solo_expiring
+
+
+def test_animation_expiring_follows_the_batch():
+    animator = BatchAnimator()
+    sprite = make_sprite(frame_count=2, frame_length=1 / 12)
+    animator.add(sprite)
+    assert not sprite.animation_expiring
+
+    # a frame lasts five ticks, though rounding pushes the flip to the sixth
+    for _ in range(6):
+        animator.update(TICK)
+    assert sprite.current_animation_frame_index == 1
+    assert sprite.animation_expiring
+
+
+def test_switching_animations_resyncs_the_batch():
+    animator = BatchAnimator()
+    sprite = make_sprite(frame_count=3)
+    animator.add(sprite)
+    for _ in range(6):
+        animator.update(TICK)
+
+    sprite.current_animation_name = "other"
+    assert sprite.current_animation_frame_index == 0
+    for _ in range(6):
+        animator.update(TICK)
+    assert sprite.texture.name == "other_1"
+
+
+def test_remove_moves_the_last_sprite_into_the_gap():
+    animator = BatchAnimator()
+    first, middle, last = make_sprite(), make_sprite(), make_sprite()
+    for sprite in (first, middle, last):
+        animator.add(sprite)
+
+    animator.remove(first)
+
+    assert first not in animator
+    assert (first.animator, first.animator_slot) == (None, -1)
+    assert last.animator_slot == 0
+    assert len(animator) == 2
+
+    # the removed sprite stays where it was
+    for _ in range(6):
+        animator.update(TICK)
+    assert first.current_animation_frame_index == 0
+    assert last.current_animation_frame_index == 1
+
+
+def test_removing_from_sprite_lists_leaves_the_animator():
+    animator = BatchAnimator()
+    sprite = make_sprite()
+    animator.add(sprite)
+
+    sprite.remove_from_sprite_lists()
+    assert len(animator) == 0
+
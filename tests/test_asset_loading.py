@@ -0,0 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import PIL.Image
+import pytest
+from arcade import load_texture
+
+from CatBurglar.util.asset_loading import MissingSequenceMember, load_asset_group
+
+
+@pytest.fixture
+def frames(tmp_path):
+    # more frames than workers, in every subgroup, so results can finish out of order
+    for subgroup, count in (("walk", 7), ("jump", 3), ("fall", 5)):
+        for index in range(count):
+            color = (len(subgroup) * 30, index * 35, 200, 255)
+            PIL.Image.new("RGBA", (4 + index, 6), color).save(tmp_path / f"{subgroup}_{index}.png")
+    return tmp_path
+
+
+def describe(table):
+    return {
+        subgroup: [(texture.name, texture.image.size, texture.image.tobytes()) for texture in textures]
+        for subgroup, textures in table.items()
+    }
+
+
+@pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_pooled_loading_matches_serial_loading(frames, executor_type):
+    serial = load_asset_group(frames, load_texture)
+
+    with executor_type(max_workers=3) as executor:
+        pooled = load_asset_group(frames, load_texture, executor=executor)
+
+    assert list(pooled) == list(serial)
+    assert describe(pooled) == describe(serial)
+    assert sorted(len(textures) for textures in pooled.values()) == [3, 5, 7]
+
+
+def test_validation_happens_before_anything_is_submitted(frames):
+    (frames / "walk_9.png").write_bytes(b"")
+
+    class RefusingExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            raise AssertionError("nothing should be loaded from a malformed group")
+
+    with RefusingExecutor() as executor, pytest.raises(MissingSequenceMember):
+        load_asset_group(frames, load_texture, executor=executor)
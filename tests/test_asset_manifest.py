@@ -0,0 +1,109 @@
+import json
+
+import PIL.Image
+import pytest
+
+from CatBurglar.util.asset_loading import (
+    MissingSubgroup,
+    collect_asset_group_paths,
+    ensure_required_subgroups,
+    preload_entity_texture_alt_skin_table,
+    preload_entity_texture_table
+)
+from CatBurglar.util.asset_manifest import MANIFEST_FORMAT_VERSION, AssetManifest, compile_manifest
+from CatBurglar.util.asset_registry import TextureTableSpec
+
+
+def save_frames(directory, subgroups, color=(255, 0, 0, 255)):
+    directory.mkdir(parents=True)
+    for subgroup, count in subgroups.items():
+        for index in range(count):
+            PIL.Image.new("RGBA", (4, 4 + index), color).save(directory / f"{subgroup}_{index}.png")
+
+
+@pytest.fixture
+def assets(tmp_path):
+    root = tmp_path / "assets"
+    save_frames(root / "gorilla", {"walk": 12, "jump": 2})
+    save_frames(root / "cop" / "red", {"walk": 3}, color=(255, 0, 0, 255))
+    save_frames(root / "cop" / "blue", {"walk": 3}, color=(0, 0, 255, 255))
+    return root
+
+
+@pytest.fixture
+def specs(assets):
+    return {
+        "gorilla": TextureTableSpec(assets / "gorilla", ["walk", "jump"]),
+        "cop": TextureTableSpec(assets / "cop", ["walk"], alt_skins=True)
+    }
+
+
+def write_manifest(data, root):
+    path = root / "manifest.json"
+    with open(path, "w") as manifest_file:
+        json.dump(data, manifest_file)
+    return AssetManifest(path)
+
+
+def test_round_trip_matches_scanning(assets, specs):
+    manifest = write_manifest(compile_manifest(specs, assets), assets)
+
+    assert manifest.available
+    for group_dir in (assets / "gorilla", assets / "cop" / "red", assets / "cop" / "blue"):
+        assert manifest.subgroup_paths(group_dir) == collect_asset_group_paths(group_dir)
+
+    # listed in sorted order, and walk_10 after walk_9
+    assert manifest.skin_dirs(assets / "cop") == [assets / "cop" / "blue", assets / "cop" / "red"]
+    assert manifest.subgroup_paths(assets / "gorilla")["walk"][-1].name == "walk_11.png"
+
+
+def test_loading_through_the_manifest_matches_scanning(assets, specs):
+    manifest = write_manifest(compile_manifest(specs, assets), assets)
+
+    def sizes(table):
+        return {name: [texture.image.size for texture in textures] for name, textures in table.items()}
+
+    scanned = preload_entity_texture_table(assets / "gorilla", ["walk", "jump"])
+    listed = preload_entity_texture_table(assets / "gorilla", ["walk", "jump"], manifest=manifest)
+    assert sizes(listed) == sizes(scanned)
+
+    scanned_skins = preload_entity_texture_alt_skin_table(assets / "cop", ["walk"])
+    listed_skins = preload_entity_texture_alt_skin_table(assets / "cop", ["walk"], manifest=manifest)
+    assert [sizes(skin) for skin in listed_skins] == [sizes(skin) for skin in scanned_skins]
+
+
+def test_listed_groups_are_not_scanned_again(assets, specs):
+    manifest = write_manifest(compile_manifest(specs, assets), assets)
+
+    # a stray file would fail validation, but the manifest is trusted
+    (assets / "gorilla" / "notes.txt").write_text("not a frame")
+    with pytest.raises(ValueError, match="Malformed filename"):
+        preload_entity_texture_table(assets / "gorilla", ["walk", "jump"])
+    assert len(preload_entity_texture_table(assets / "gorilla", ["walk", "jump"], manifest=manifest)["walk"]) == 12
+
+
+def test_missing_required_subgroup_is_rejected(assets, specs):
+    with pytest.raises(MissingSubgroup, match="'fall'") as raised:
+        ensure_required_subgroups(collect_asset_group_paths(assets / "gorilla"), ["walk", "fall"], assets / "gorilla")
+    assert raised.value.subgroup == "fall"
+
+    specs["gorilla"] = TextureTableSpec(assets / "gorilla", ["walk", "fall"])
+    with pytest.raises(MissingSubgroup):
+        compile_manifest(specs, assets)
+
+    # every skin has to have them, not just the first
+    (assets / "cop" / "red" / "jump_0.png").write_bytes((assets / "cop" / "red" / "walk_0.png").read_bytes())
+    specs["gorilla"] = TextureTableSpec(assets / "gorilla", ["walk", "jump"])
+    specs["cop"] = TextureTableSpec(assets / "cop", ["walk", "jump"], alt_skins=True)
+    with pytest.raises(MissingSubgroup, match="blue"):
+        compile_manifest(specs, assets)
+
+
+def test_missing_or_unknown_manifests_fall_back_to_scanning(assets):
+    missing = AssetManifest(assets / "manifest.json")
+    assert not missing.available
+    assert missing.subgroup_paths(assets / "gorilla") is None
+
+    outdated = write_manifest({"format_version": MANIFEST_FORMAT_VERSION + 1, "groups": {"gorilla": {}}}, assets)
+    assert not outdated.available
+    assert outdated.subgroup_paths(assets / "gorilla") is None
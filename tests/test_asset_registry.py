@@ -0,0 +1,114 @@
+import threading
+import time
+
+import PIL.Image
+import pytest
+
+from CatBurglar.util.animation_table import CompiledAnimationTable
+from CatBurglar.util.asset_loading import AssetGroupError
+from CatBurglar.util.asset_registry import AssetRegistry
+
+
+class CountingLoader:
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+
+    def __call__(self, **options):
+        self.calls.append(options)
+        time.sleep(self.delay)
+        return object()
+
+
+def test_nothing_loads_until_first_access_and_only_once():
+    registry = AssetRegistry(flavor="test")
+    loader = CountingLoader()
+    asset = registry.register("thing", loader)
+
+    assert not asset.loaded
+    assert loader.calls == []
+
+    value = asset.get()
+    assert asset.loaded
+    assert loader.calls == [{"flavor": "test"}]
+
+    assert asset.get() is value
+    assert registry["thing"] is value
+    assert len(loader.calls) == 1
+
+
+def test_racing_threads_share_one_load():
+    registry = AssetRegistry()
+    loader = CountingLoader(delay=0.05)
+    asset = registry.register("slow", loader)
+
+    values = []
+    threads = [threading.Thread(target=lambda: values.append(asset.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loader.calls) == 1
+    assert all(value is values[0] for value in values)
+
+
+def test_unload_makes_the_next_access_load_again():
+    registry = AssetRegistry()
+    loader = CountingLoader()
+    asset = registry.register("thing", loader)
+
+    first = asset.get()
+    asset.unload()
+    assert not asset.loaded
+    assert asset.get() is not first
+    assert len(loader.calls) == 2
+
+
+def test_prefetch_loads_only_what_is_named():
+    registry = AssetRegistry()
+    wanted, unwanted = CountingLoader(), CountingLoader()
+    registry.register("wanted", wanted)
+    registry.register("unwanted", unwanted)
+
+    registry.prefetch("wanted")
+    assert (len(wanted.calls), len(unwanted.calls)) == (1, 0)
+
+    registry.prefetch()
+    assert (len(wanted.calls), len(unwanted.calls)) == (1, 1)
+
+
+def test_names_can_only_be_registered_once():
+    registry = AssetRegistry()
+    registry.register("thing", CountingLoader())
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register("thing", CountingLoader())
+
+
+def test_texture_tables_are_read_on_first_access(tmp_path):
+    registry = AssetRegistry()
+    table = registry.register_texture_table("walker", tmp_path / "walker", ["walk"])
+
+    # the directory doesn't exist yet, which only matters once it's read
+    assert registry.texture_table_specs["walker"].path == tmp_path / "walker"
+    (tmp_path / "walker").mkdir()
+    for index in range(2):
+        PIL.Image.new("RGBA", (4, 4), (index * 100, 0, 0, 255)).save(tmp_path / "walker" / f"walk_{index}.png")
+
+    loaded = table.get()
+    assert isinstance(loaded, CompiledAnimationTable)
+    assert len(loaded["walk"]) == 2
+
+
+def test_load_errors_surface_on_access_and_can_be_retried(tmp_path):
+    registry = AssetRegistry()
+    (tmp_path / "walker").mkdir()
+    PIL.Image.new("RGBA", (4, 4)).save(tmp_path / "walker" / "walk_0.png")
+    table = registry.register_texture_table("walker", tmp_path / "walker", ["walk", "jump"])
+
+    with pytest.raises(AssetGroupError):
+        table.get()
+    assert not table.loaded
+
+    PIL.Image.new("RGBA", (4, 4)).save(tmp_path / "walker" / "jump_0.png")
+    assert sorted(table.get()) == ["jump", "walk"]
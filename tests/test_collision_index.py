@@ -0,0 +1,146 @@
+from random import Random
+
+import PIL.Image
+import pytest
+from arcade import Sprite, Texture
+
+from CatBurglar.entity.collision import AABBArrayIndex, SweepAndPruneIndex, sprite_swept_bounds
+
+INDEXES = [SweepAndPruneIndex, AABBArrayIndex]
+
+
+def make_sprite(rng: Random, width: int = 16, height: int = 24) -> Sprite:
+    sprite = Sprite()
+    sprite.texture = Texture(f"{width}x{height}", image=PIL.Image.new("RGBA", (width, height)))
+    sprite.position = rng.uniform(0, 400), rng.uniform(0, 200)
+    sprite.change_x = rng.uniform(-6, 1)
+    sprite.change_y = rng.choice((0.0, rng.uniform(-1, 1)))
+    return sprite
+
+
+def overlapping(sprites, left, right, bottom, top):
+    found = set()
+    for sprite in sprites:
+        sprite_left, sprite_right, sprite_bottom, sprite_top = sprite_swept_bounds(sprite)
+        if sprite_left <= right and sprite_right >= left and sprite_bottom <= top and sprite_top >= bottom:
+            found.add(sprite)
+    return found
+
+
+def random_box(rng: Random):
+    left = rng.uniform(-50, 400)
+    bottom = rng.uniform(-50, 200)
+    return left, left + rng.uniform(0, 80), bottom, bottom + rng.uniform(0, 80)
+
+
+@pytest.mark.parametrize("index_type", INDEXES)
+def test_queries_match_brute_force_while_sprites_move(index_type):
+    rng = Random(3)
+    sprites = [make_sprite(rng, rng.randint(4, 40), rng.randint(4, 40)) for _ in range(60)]
+    index = index_type(sprites)
+
+    for tick in range(120):
+        for sprite in sprites:
+            sprite.update()
+        index.update()
+
+        # spawns and despawns between ticks, as the spawner does
+        if tick % 7 == 0:
+            leaving = rng.sample(sprites, 5)
+            index.remove_all(leaving)
+            sprites = [sprite for sprite in sprites if sprite not in leaving]
+        if tick % 5 == 0:
+            for _ in range(4):
+                sprite = make_sprite(rng)
+                sprites.append(sprite)
+                index.insert(sprite)
+
+        assert len(index) == len(sprites)
+        for _ in range(10):
+            box = random_box(rng)
+            assert set(index.query(*box)) == overlapping(sprites, *box)
+
+
+@pytest.mark.parametrize("index_type", INDEXES)
+def test_query_covers_the_whole_tick(index_type):
+    sprite = make_sprite(Random(0), width=10, height=10)
+    sprite.position = 100, 50
+    sprite.change_x = -30
+    sprite.change_y = 0
+    index = index_type([sprite])
+
+    sprite.update()
+    index.update()
+
+    # now at 70, but passed through 85 during the tick
+    assert index.query(84, 86, 45, 55) == [sprite]
+    assert index.query(110, 120, 45, 55) == []
+
+
+@pytest.mark.parametrize("index_type", INDEXES)
+def test_insert_and_remove_are_idempotent(index_type):
+    rng = Random(1)
+    sprite, other = make_sprite(rng), make_sprite(rng)
+    index = index_type()
+    assert index.query(float("-inf"), float("inf")) == []
+
+    index.insert(sprite)
+    index.insert(sprite)
+    assert len(index) == 1
+
+    index.remove_all([sprite, other])
+    index.remove_all([sprite])
+    assert len(index) == 0
+    assert index.query(float("-inf"), float("inf")) == []
+
+
+def test_sweep_and_prune_stays_sorted():
+    rng = Random(5)
+    sprites = [make_sprite(rng, rng.randint(4, 40)) for _ in range(50)]
+    index = SweepAndPruneIndex(sprites)
+
+    for _ in range(60):
+        for sprite in sprites:
+            sprite.update()
+        index.update()
+
+        left_edges = [sprite_swept_bounds(sprite)[0] for sprite in index._sprites]
+        assert left_edges == sorted(left_edges)
+
+
+def test_aabb_index_reuses_freed_slots_and_grows():
+    rng = Random(2)
+    index = AABBArrayIndex(capacity=2)
+    first, second, third = make_sprite(rng), make_sprite(rng), make_sprite(rng)
+
+    index.insert(first)
+    index.insert(second)
+    index.remove_all([first])
+    index.insert(third)
+    assert len(index._live) == 2
+
+    more = [make_sprite(rng) for _ in range(5)]
+    for sprite in more:
+        index.insert(sprite)
+    assert len(index._live) > 2
+    assert set(index.query(float("-inf"), float("inf"))) == {second, third, *more}
+
+
+def test_aabb_index_finds_sprites_past_the_left_edge_before_updating():
+    rng = Random(4)
+    sprites = [make_sprite(rng, rng.randint(4, 40)) for _ in range(80)]
+    index = AABBArrayIndex(sprites)
+
+    for _ in range(100):
+        for sprite in sprites:
+            sprite.update()
+
+        # sprites have moved this tick but the index hasn't yet, as when despawning
+        past = [sprite for sprite in sprites if sprite.center_x + sprite.width / 2 <= 50]
+        assert set(index.past_left_edge(50)) == set(past)
+
+        index.remove_all(past)
+        sprites = [sprite for sprite in sprites if sprite not in past]
+        index.update()
+
+    assert index.past_left_edge(50) == []
@@ -0,0 +1,85 @@
+import pytest
+from arcade import Sprite, SpriteList
+
+from CatBurglar.entity.cop import BasicRunnerCop
+from CatBurglar.entity.pool import EnemyPool
+from CatBurglar.graphics.interpolation import PositionInterpolator
+
+
+def make_sprite(x: float, y: float) -> Sprite:
+    sprite = Sprite()
+    sprite.position = x, y
+    return sprite
+
+
+def test_sprites_are_drawn_between_ticks_and_put_back():
+    sprite_list = SpriteList(use_spatial_hash=False)
+    mover, still = make_sprite(100, 50), make_sprite(10, 10)
+    sprite_list.extend([mover, still])
+    interpolator = PositionInterpolator(sprite_list)
+
+    interpolator.snapshot()
+    mover.position = 80, 60
+
+    with interpolator.interpolated(0.25):
+        assert mover.position == (95, 52.5)
+        assert still.position == (10, 10)
+
+    assert mover.position == (80, 60)
+
+
+def test_positions_are_restored_if_drawing_fails():
+    sprite_list = SpriteList(use_spatial_hash=False)
+    sprite = make_sprite(0, 0)
+    sprite_list.append(sprite)
+    interpolator = PositionInterpolator(sprite_list)
+
+    interpolator.snapshot()
+    sprite.position = 10, 0
+
+    with pytest.raises(RuntimeError):
+        with interpolator.interpolated(0.5):
+            raise RuntimeError("draw failed")
+
+    assert sprite.position == (10, 0)
+
+
+def test_sprites_added_during_a_tick_are_drawn_where_they_are():
+    sprite_list = SpriteList(use_spatial_hash=False)
+    interpolator = PositionInterpolator(sprite_list)
+
+    interpolator.snapshot()
+    spawned = make_sprite(300, 20)
+    sprite_list.append(spawned)
+
+    with interpolator.interpolated(0.5):
+        assert spawned.position == (300, 20)
+
+
+def test_reused_enemies_dont_blend_from_where_they_despawned():
+    enemy_list = SpriteList(use_spatial_hash=False)
+    pool = EnemyPool()
+    interpolator = PositionInterpolator(enemy_list)
+
+    enemy = pool.acquire(BasicRunnerCop, 4, 32)
+    enemy_list.append(enemy)
+
+    # the enemy walks off the left edge and is released at the end of a tick
+    interpolator.snapshot()
+    enemy.center_x = -20
+    pool.release_all([enemy])
+
+    # the next tick respawns it off the right edge
+    interpolator.snapshot()
+    reused = pool.acquire(BasicRunnerCop, 500, 32)
+    enemy_list.append(reused)
+    assert reused is enemy
+
+    with interpolator.interpolated(0.5):
+        assert reused.position == (500, 32)
+
+    # from then on it blends from its new spot
+    interpolator.snapshot()
+    reused.center_x = 490
+    with interpolator.interpolated(0.5):
+        assert reused.position == (495, 32)
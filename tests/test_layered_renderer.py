@@ -0,0 +1,103 @@
+from functools import partial
+from random import Random
+
+import PIL.Image
+from arcade import Sprite, SpriteList, Texture
+
+from CatBurglar.entity.spawner import EnemySpawner
+from CatBurglar.graphics.layered_renderer import LayeredRenderer, RenderLayer
+from CatBurglar.util import StopwatchTimer
+
+
+def test_sprites_draw_by_layer_then_in_order_added():
+    rng = Random(4)
+    renderer = LayeredRenderer()
+    added = []
+    for number in range(200):
+        sprite = Sprite()
+        layer = rng.choice(list(RenderLayer) + [5, 15])
+        renderer.add_sprite(sprite, layer)
+        added.append((layer, number, sprite))
+
+    expected = [sprite for layer, number, sprite in sorted(added, key=lambda entry: entry[:2])]
+    assert list(renderer.batch) == expected
+    assert renderer.batch.sprite_idx == {sprite: index for index, sprite in enumerate(expected)}
+
+
+def test_sprite_lists_join_with_what_they_hold_now():
+    renderer = LayeredRenderer()
+    players = SpriteList()
+    player = Sprite()
+    players.append(player)
+    terrain = [Sprite(), Sprite()]
+    terrain_list = SpriteList()
+    terrain_list.extend(terrain)
+
+    renderer.add_sprite_list(players, RenderLayer.PLAYER)
+    renderer.add_sprite_list(terrain_list, RenderLayer.TERRAIN)
+    assert list(renderer.batch) == terrain + [player]
+
+    # later additions aren't picked up unless passed in
+    players.append(Sprite())
+    assert len(renderer) == 3
+
+
+def test_spawned_enemies_join_and_despawned_ones_leave():
+    renderer = LayeredRenderer()
+    player = Sprite()
+    renderer.add_sprite(player, RenderLayer.PLAYER)
+    ground = Sprite()
+    renderer.add_sprite(ground, RenderLayer.TERRAIN)
+
+    enemy_list = SpriteList(use_spatial_hash=False)
+    spawner = EnemySpawner(enemy_list, StopwatchTimer(), rng=Random(0))
+    spawner.spawn_listeners.append(partial(renderer.add_sprite, layer=RenderLayer.ENEMIES))
+
+    enemies = [spawner.spawn("cop"), spawner.spawn("drone"), spawner.spawn("cop")]
+    assert list(renderer.batch) == [ground, player] + enemies
+
+    enemies[1].center_x = -100
+    spawner.despawn_offscreen()
+    assert list(renderer.batch) == [ground, player, enemies[0], enemies[2]]
+
+    # reused from the pool, on top of the enemies already out
+    again = spawner.spawn("drone")
+    assert again is enemies[1]
+    assert list(renderer.batch) == [ground, player, enemies[0], enemies[2], again]
+
+
+class Drawable:
+    def __init__(self, name, drawn):
+        self.name = name
+        self.drawn = drawn
+
+    def draw(self):
+        self.drawn.append(self.name)
+
+
+def test_drawables_go_under_or_over_the_batch(monkeypatch):
+    drawn = []
+    renderer = LayeredRenderer()
+    monkeypatch.setattr(renderer.batch, "draw", lambda **kwargs: drawn.append("sprites"))
+
+    renderer.add_sprite(Sprite(), RenderLayer.PLAYER)
+    renderer.add_drawable(Drawable("over", drawn), RenderLayer.ENEMIES + 1)
+    renderer.add_drawable(Drawable("under", drawn), RenderLayer.PLAYER - 1)
+    renderer.add_drawable(Drawable("level", drawn), RenderLayer.PLAYER)
+    renderer.add_drawable(Drawable("under again", drawn), RenderLayer.PLAYER - 1)
+
+    renderer.draw()
+    assert drawn == ["under", "under again", "sprites", "level", "over"]
+    assert renderer.draw_calls == 5
+
+
+def test_preloaded_textures_are_queued_for_the_batch_atlas():
+    red = Texture("preload_red", image=PIL.Image.new("RGBA", (4, 4), (255, 0, 0, 255)))
+    blue = Texture("preload_blue", image=PIL.Image.new("RGBA", (2, 6), (0, 0, 255, 255)))
+
+    renderer = LayeredRenderer(preload=iter([red, blue, red]))
+    assert renderer.batch.array_of_texture_names == ["preload_red", "preload_blue"]
+    assert renderer.batch.array_of_images == [red.image, blue.image]
+
+    # nothing to preload leaves the atlas to be built on the first draw
+    assert not LayeredRenderer().batch.array_of_texture_names
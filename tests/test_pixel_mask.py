@@ -0,0 +1,129 @@
+from random import Random
+
+import PIL.Image
+import pytest
+from arcade import Sprite, Texture
+
+from CatBurglar.entity import NamedAnimationsSprite, STILL_RIGHT
+from CatBurglar.entity.collision import pixel_masks_collide, sprite_pixel_mask
+from CatBurglar.util.animation_table import compile_animation_table
+from CatBurglar.util.pixel_mask import PixelMask
+
+OPAQUE = (255, 255, 255, 255)
+CLEAR = (0, 0, 0, 0)
+
+
+def image_from_rows(rows):
+    """
+    Build an image from strings, top row first, # for opaque pixels.
+    """
+    image = PIL.Image.new("RGBA", (len(rows[0]), len(rows)), CLEAR)
+    for y, row in enumerate(rows):
+        for x, pixel in enumerate(row):
+            if pixel == "#":
+                image.putpixel((x, y), OPAQUE)
+    return image
+
+
+def random_image(rng: Random, width: int, height: int):
+    return image_from_rows([
+        "".join(rng.choice("#..") for _ in range(width))
+        for _ in range(height)
+    ])
+
+
+def opaque_pixels(image, offset_x=0, offset_y=0):
+    """
+    Opaque pixels in y-up coordinates, shifted by an offset.
+    """
+    width, height = image.size
+    return {
+        (x + offset_x, height - 1 - y + offset_y)
+        for y in range(height)
+        for x in range(width)
+        if image.getpixel((x, y))[3] > 0
+    }
+
+
+def test_rows_are_stored_bottom_first_with_bit_zero_leftmost():
+    mask = PixelMask.from_image(image_from_rows([
+        "#..",
+        ".##",
+    ]))
+    assert (mask.width, mask.height) == (3, 2)
+    assert mask.rows == (0b110, 0b001)
+
+
+def test_alpha_threshold():
+    image = PIL.Image.new("RGBA", (2, 1), CLEAR)
+    image.putpixel((0, 0), (0, 0, 0, 10))
+    image.putpixel((1, 0), (0, 0, 0, 200))
+
+    assert PixelMask.from_image(image).rows == (0b11,)
+    assert PixelMask.from_image(image, alpha_threshold=10).rows == (0b10,)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_overlaps_matches_comparing_pixels(seed):
+    rng = Random(seed)
+    image_a = random_image(rng, rng.randint(1, 12), rng.randint(1, 12))
+    image_b = random_image(rng, rng.randint(1, 12), rng.randint(1, 12))
+    mask_a = PixelMask.from_image(image_a)
+    mask_b = PixelMask.from_image(image_b)
+    pixels_a = opaque_pixels(image_a)
+
+    for offset_x in range(-14, 15):
+        for offset_y in range(-14, 15):
+            expected = bool(pixels_a & opaque_pixels(image_b, offset_x, offset_y))
+            assert mask_a.overlaps(mask_b, offset_x, offset_y) == expected
+
+
+def make_sprite(name, image, x, y):
+    sprite = Sprite()
+    # masks built on the fly are cached by texture name
+    sprite.texture = Texture(name, image=image)
+    sprite.position = x, y
+    return sprite
+
+
+def test_sprites_with_overlapping_boxes_but_no_shared_pixels_miss():
+    ring = image_from_rows([
+        "####",
+        "#..#",
+        "#..#",
+        "####",
+    ])
+    dot = image_from_rows(["#"])
+
+    outer = make_sprite("ring", ring, 10, 10)
+    # centered on the ring's hole
+    inner = make_sprite("dot", dot, 10.5, 10.5)
+    assert not pixel_masks_collide(outer, inner)
+
+    # one pixel left lands on the ring itself
+    inner.center_x = 8.5
+    assert pixel_masks_collide(outer, inner)
+
+
+def test_precomputed_masks_are_used_for_the_frame_on_screen():
+    frames = [Texture(f"frame_{index}", image=image_from_rows(["#" * (index + 1)])) for index in range(2)]
+    table = compile_animation_table({STILL_RIGHT: frames}, build_masks=True)
+    sprite = NamedAnimationsSprite(animations=table)
+
+    assert sprite_pixel_mask(sprite) is table.masks[sprite.current_animation_id][0]
+
+    # a texture set by hand isn't in the table, so a mask is built for it
+    sprite.texture = Texture("off_table", image=image_from_rows(["###"]))
+    assert sprite_pixel_mask(sprite).rows == (0b111,)
+
+
+def test_table_masks_are_built_on_first_use():
+    frames = [Texture(f"lazy_frame_{index}", image=image_from_rows(["#" * (index + 1)])) for index in range(2)]
+    table = compile_animation_table({STILL_RIGHT: frames})
+    sprite = NamedAnimationsSprite(animations=table)
+    assert table.masks is None
+
+    mask = sprite_pixel_mask(sprite)
+    assert table.masks is not None
+    assert mask is table.masks[sprite.current_animation_id][0]
+    assert table.masks[sprite.current_animation_id][1].rows == (0b11,)
@@ -0,0 +1,104 @@
+from random import Random
+
+from arcade import SpriteList
+
+from CatBurglar.entity.animation import BatchAnimator
+from CatBurglar.entity.cop import BasicRunnerCop, Drone
+from CatBurglar.entity.pool import EnemyPool, remove_sprites
+from CatBurglar.entity.spawner import EnemySpawner
+from CatBurglar.util import StopwatchTimer
+
+
+def check_index(sprite_list: SpriteList) -> None:
+    assert sprite_list.sprite_idx == {sprite: index for index, sprite in enumerate(sprite_list)}
+
+
+def test_released_enemies_are_reused():
+    pool = EnemyPool()
+    cop = pool.acquire(BasicRunnerCop, 10, 20)
+    assert cop.pool is pool
+    assert (pool.created, pool.reused) == (1, 0)
+
+    cop.change_x = 5
+    cop.despawn()
+    assert pool.idle_count(BasicRunnerCop) == 1
+
+    again = pool.acquire(BasicRunnerCop, 30, 40)
+    assert again is cop
+    assert again.position == (30, 40)
+    assert again.change_x == again.base_move_velocity
+    assert (pool.created, pool.reused) == (1, 1)
+
+
+def test_pool_is_per_type_and_capped():
+    pool = EnemyPool(max_pooled=1)
+    cops = [pool.acquire(BasicRunnerCop, 0, 0) for _ in range(2)]
+    drone = pool.acquire(Drone, 0, 0)
+
+    pool.release_all(cops + [drone])
+
+    assert pool.idle_count(BasicRunnerCop) == 1
+    assert pool.idle_count(Drone) == 1
+    assert pool.discarded == 1
+    assert isinstance(pool.acquire(Drone, 0, 0), Drone)
+
+
+def test_reused_enemies_draw_from_rng_like_new_ones():
+    pool = EnemyPool()
+    pool.release(pool.acquire(BasicRunnerCop, 0, 0))
+
+    new_rng, reused_rng = Random(7), Random(7)
+    BasicRunnerCop(rng=new_rng)
+    pool.acquire(BasicRunnerCop, 0, 0, reused_rng)
+
+    assert new_rng.random() == reused_rng.random()
+
+
+def test_remove_sprites_rebuilds_every_list_they_were_in():
+    pool = EnemyPool()
+    enemies = [pool.acquire(BasicRunnerCop, index, 0) for index in range(6)]
+    plain = SpriteList(use_spatial_hash=False)
+    hashed = SpriteList(use_spatial_hash=True)
+    for enemy in enemies:
+        plain.append(enemy)
+        hashed.append(enemy)
+
+    removed = enemies[1::2]
+    remove_sprites(removed)
+
+    kept = enemies[0::2]
+    for sprite_list in (plain, hashed):
+        assert list(sprite_list) == kept
+        check_index(sprite_list)
+
+    for enemy in removed:
+        assert enemy.sprite_lists == []
+        assert enemy not in hashed.spatial_hash.get_objects_for_box(enemy)
+    for enemy in kept:
+        assert enemy.sprite_lists == [plain, hashed]
+
+
+def test_despawn_offscreen_releases_only_enemies_past_the_edge():
+    enemy_list = SpriteList(use_spatial_hash=False)
+    animator = BatchAnimator()
+    pool = EnemyPool()
+    spawner = EnemySpawner(enemy_list, StopwatchTimer(), animator=animator, pool=pool, rng=Random(0))
+
+    spawned, despawned = [], []
+    spawner.spawn_listeners.append(spawned.append)
+    spawner.despawn_listeners.append(despawned.extend)
+
+    enemies = [spawner.spawn("cop") for _ in range(5)]
+    assert spawned == enemies
+    for enemy, x in zip(enemies, (-100, 50, -60, 200, -1)):
+        enemy.center_x = x
+
+    gone = [enemy for enemy in enemies if enemy.center_x + enemy.width / 2 <= 0]
+    assert spawner.despawn_offscreen(0.0) == len(gone)
+
+    assert despawned == gone
+    assert list(enemy_list) == [enemy for enemy in enemies if enemy not in gone]
+    check_index(enemy_list)
+    assert len(animator) == len(enemy_list)
+    assert all(enemy.animator is None and enemy.pool is None for enemy in gone)
+    assert pool.idle_count(BasicRunnerCop) == len(gone)
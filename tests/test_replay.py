@@ -0,0 +1,129 @@
+import argparse
+import struct
+
+import pytest
+
+from CatBurglar.entity.physics import NARROW_PHASE_PIXEL, NARROW_PHASE_POLYGON
+from CatBurglar.headless import play_replay, run_game
+from CatBurglar.input.scripted import ScriptedInput
+from CatBurglar.replay import (
+    REPLAY_FORMAT_VERSION,
+    REPLAY_HEADER,
+    REPLAY_MAX_SEED,
+    Replay,
+    ReplayFormatError,
+    ReplayPlayer,
+    ReplayRecorder,
+    seed_argument
+)
+from CatBurglar.simulation import SIMULATION_STEP_SEC
+
+
+def test_held_input_is_run_length_encoded():
+    replay = Replay(seed=1, step=SIMULATION_STEP_SEC)
+    for flags in [0, 0, 0, 1, 1, 0] + [2] * 300:
+        replay.append(flags)
+
+    assert replay.runs == [(3, 0), (2, 1), (1, 0), (300, 2)]
+    assert replay.tick_count == 306
+    assert list(replay.ticks())[:6] == [0, 0, 0, 1, 1, 0]
+
+    # 300 needs a two byte varint
+    assert len(replay.to_bytes()) == REPLAY_HEADER.size + len("default") + 2 * 3 + 3
+
+
+def test_round_trip_keeps_every_field():
+    replay = Replay(
+        seed=2 ** 63 + 5,
+        step=SIMULATION_STEP_SEC,
+        runs=[(1, 0), (200, 0b10101), (70000, 3)],
+        final_state=3,
+        digest=bytes(range(8)),
+        spawn_profile="profiles/ünïcode.json",
+        invulnerable=True,
+        narrow_phase=NARROW_PHASE_PIXEL
+    )
+
+    loaded = Replay.from_bytes(replay.to_bytes())
+
+    assert loaded.seed == replay.seed
+    assert loaded.step == replay.step
+    assert loaded.runs == replay.runs
+    assert loaded.final_state == replay.final_state
+    assert loaded.digest == replay.digest
+    assert loaded.spawn_profile == replay.spawn_profile
+    assert loaded.invulnerable
+    assert loaded.narrow_phase == NARROW_PHASE_PIXEL
+
+    assert Replay.from_bytes(Replay(seed=0, step=SIMULATION_STEP_SEC).to_bytes()).narrow_phase == NARROW_PHASE_POLYGON
+
+
+def test_save_and_load(tmp_path):
+    replay = Replay(seed=9, step=SIMULATION_STEP_SEC, runs=[(10, 1)])
+    path = tmp_path / "game.cbrp"
+    replay.save(path)
+    assert Replay.load(path).runs == [(10, 1)]
+
+
+@pytest.mark.parametrize("mangle, message", [
+    (lambda data: data[:10], "too short"),
+    (lambda data: b"NOPE" + data[4:], "Not a replay"),
+    (lambda data: data[:4] + struct.pack("<H", REPLAY_FORMAT_VERSION - 1) + data[6:], "Unsupported replay version"),
+    (lambda data: data[:REPLAY_HEADER.size + 3], "spawn profile name"),
+    (lambda data: data[:-1], "partway through a run"),
+    (lambda data: data[:-2], "partway through a run length"),
+])
+def test_malformed_replays_are_rejected(mangle, message):
+    data = Replay(seed=1, step=SIMULATION_STEP_SEC, runs=[(5, 1), (300, 0)]).to_bytes()
+    with pytest.raises(ReplayFormatError, match=message):
+        Replay.from_bytes(mangle(data))
+
+
+def test_recorder_and_player_agree_on_held_actions():
+    held = [set(), {"JUMP"}, {"JUMP", "RIGHT"}, {"RIGHT"}, set()]
+    recorder = ReplayRecorder(seed=0, step=SIMULATION_STEP_SEC)
+    for actions in held:
+        recorder.record(ScriptedInput(actions))
+
+    player = ReplayPlayer(Replay.from_bytes(recorder.replay.to_bytes()))
+    for actions in held + [set()]:
+        player.update(None)
+        assert {action for action in ("JUMP", "UP", "DOWN", "LEFT", "RIGHT") if player.input.is_pressed(action)} == actions
+
+
+@pytest.mark.parametrize("spawn_profile, narrow_phase", [
+    ("default", NARROW_PHASE_POLYGON),
+    ("bursts", NARROW_PHASE_POLYGON),
+    ("bursts", NARROW_PHASE_PIXEL),
+])
+def test_recorded_games_play_back_exactly(tmp_path, spawn_profile, narrow_phase):
+    result = run_game(
+        3, record_dir=tmp_path, spawn_profile=spawn_profile, max_ticks=1200, narrow_phase=narrow_phase
+    )
+    replay = Replay.load(tmp_path / "3.cbrp")
+
+    assert replay.tick_count == result.ticks
+    assert replay.spawn_profile == spawn_profile
+    assert replay.narrow_phase == narrow_phase
+
+    played, matched = play_replay(replay)
+    assert matched
+    assert played == result
+
+
+def test_replays_at_another_tick_length_are_refused():
+    replay = Replay(seed=0, step=1 / 30, runs=[(10, 0)])
+    with pytest.raises(ValueError, match="Ticks must be"):
+        play_replay(replay)
+
+
+def test_seeds_a_replay_cant_store_are_refused_up_front():
+    assert seed_argument("0") == 0
+    assert seed_argument(str(REPLAY_MAX_SEED)) == REPLAY_MAX_SEED
+    for text in ("-1", str(REPLAY_MAX_SEED + 1), "seven"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            seed_argument(text)
+
+    assert Replay.from_bytes(Replay(seed=REPLAY_MAX_SEED, step=SIMULATION_STEP_SEC).to_bytes()).seed == REPLAY_MAX_SEED
+    with pytest.raises(ValueError, match="seeds between"):
+        ReplayRecorder(seed=-1, step=SIMULATION_STEP_SEC)
@@ -0,0 +1,153 @@
+import json
+from random import Random
+
+import pytest
+from arcade import SpriteList, lerp
+
+from CatBurglar.entity.cop import BasicRunnerCop, Drone
+from CatBurglar.entity.pool import EnemyPool
+from CatBurglar.entity.spawn_profile import (
+    BurstSpec,
+    SpawnProfile,
+    SpawnProfileError,
+    available_spawn_profiles,
+    load_spawn_profile
+)
+from CatBurglar.entity.spawner import SPAWN_X, EnemySpawner
+from CatBurglar.entity.terrain import HEIGHT_IN_TILES, TILE_SIZE_PX
+from CatBurglar.simulation import GAME_LENGTH_SEC, SIMULATION_STEP_SEC
+from CatBurglar.util import CountdownTimer, StopwatchTimer
+
+
+def test_pick_enemy_follows_the_weights():
+    profile = SpawnProfile(enemy_mix={"drone": 1, "cop": 3})
+    assert profile.pick_enemy(0.0) == "drone"
+    assert profile.pick_enemy(0.25) == "drone"
+    assert profile.pick_enemy(0.26) == "cop"
+    assert profile.pick_enemy(1.0) == "cop"
+
+
+def test_mix_needs_a_positive_weight():
+    with pytest.raises(SpawnProfileError):
+        SpawnProfile(enemy_mix={"drone": 0})
+
+
+def test_gap_range_interpolates_between_keyframes():
+    # keyframes are sorted by completion whatever order they come in
+    profile = SpawnProfile(gap_curve=((1.0, 1.0, 1.0), (0.2, 2.0, 4.0), (0.6, 1.0, 2.0)))
+
+    assert profile.gap_range(0.0) == (2.0, 4.0)
+    assert profile.gap_range(0.2) == (2.0, 4.0)
+    assert profile.gap_range(0.4) == pytest.approx((1.5, 3.0))
+    assert profile.gap_range(0.8) == pytest.approx((1.0, 1.5))
+    assert profile.gap_range(1.0) == (1.0, 1.0)
+
+
+def test_gap_range_jumps_at_repeated_keyframes():
+    profile = SpawnProfile(gap_curve=((0.0, 2.0, 2.0), (0.5, 2.0, 2.0), (0.5, 1.0, 1.0)))
+    assert profile.gap_range(0.25) == (2.0, 2.0)
+    assert profile.gap_range(0.75) == (1.0, 1.0)
+
+
+@pytest.mark.parametrize("data", [
+    {"enemy_mixx": {"cop": 1}},
+    {"bursts": [{"start_sec": 1.0}]},
+    {"gap_curve": []},
+    {"batch_size": 0},
+])
+def test_bad_profiles_are_rejected(data):
+    with pytest.raises(SpawnProfileError):
+        SpawnProfile.from_dict("bad", data)
+
+
+def test_unknown_enemies_are_rejected_by_the_spawner():
+    profile = SpawnProfile(bursts=[BurstSpec(1.0, 1, enemy="tank")])
+    with pytest.raises(SpawnProfileError, match="tank"):
+        EnemySpawner(SpriteList(), StopwatchTimer(), profile=profile)
+
+
+@pytest.mark.parametrize("name", available_spawn_profiles())
+def test_shipped_profiles_load(name):
+    profile = load_spawn_profile(name)
+    EnemySpawner(SpriteList(), StopwatchTimer(), profile=profile)
+
+
+def test_profiles_load_from_a_path(tmp_path):
+    path = tmp_path / "mine.json"
+    path.write_text(json.dumps({"enemy_mix": {"cop": 1}, "max_concurrent": 3}))
+
+    profile = load_spawn_profile(path)
+    assert profile.enemy_names == ("cop",)
+    assert profile.max_concurrent == 3
+
+    with pytest.raises(FileNotFoundError):
+        load_spawn_profile("no such profile")
+
+
+def spawns_before_profiles(seed: int, ticks: int):
+    """
+    Spawns as the spawner made them before profiles existed.
+    """
+    rng = Random(seed)
+    pool = EnemyPool()
+    clock = StopwatchTimer(running=True, maximum=GAME_LENGTH_SEC)
+    time_till_next = CountdownTimer(remaining=5.0)
+
+    spawns = []
+    for tick in range(ticks):
+        clock.update(SIMULATION_STEP_SEC)
+        time_till_next.update(SIMULATION_STEP_SEC)
+        if time_till_next.remaining <= 0:
+            if rng.random() > 0.5:
+                enemy_type, y_position = BasicRunnerCop, TILE_SIZE_PX * 2
+            else:
+                enemy_type = Drone
+                y_position = rng.uniform(TILE_SIZE_PX * 1.5, TILE_SIZE_PX * HEIGHT_IN_TILES)
+
+            enemy = pool.acquire(enemy_type, SPAWN_X, y_position, rng)
+            spawns.append((tick, type(enemy), enemy.position, enemy.texture.name))
+            time_till_next.remaining = rng.uniform(1.0, lerp(2.0, 1.0, clock.completion))
+    return spawns
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42])
+def test_default_profile_spawns_like_the_spawner_before_profiles(seed):
+    clock = StopwatchTimer(running=True, maximum=GAME_LENGTH_SEC)
+    spawner = EnemySpawner(SpriteList(), clock, rng=Random(seed), profile=load_spawn_profile())
+
+    spawns = []
+    ticks = int(GAME_LENGTH_SEC / SIMULATION_STEP_SEC)
+    for tick in range(ticks):
+        spawner.spawn_listeners = [
+            lambda enemy, tick=tick: spawns.append((tick, type(enemy), enemy.position, enemy.texture.name))
+        ]
+        clock.update(SIMULATION_STEP_SEC)
+        spawner.update(SIMULATION_STEP_SEC)
+
+    assert spawns == spawns_before_profiles(seed, ticks)
+
+
+def test_bursts_fire_on_schedule_up_to_the_cap():
+    clock = StopwatchTimer(running=True)
+    profile = SpawnProfile(
+        grace_period_sec=1000.0,
+        max_concurrent=5,
+        bursts=[BurstSpec(start_sec=1.0, every_sec=2.0, count=3, spacing_px=10.0, enemy="cop")]
+    )
+    enemy_list = SpriteList()
+    spawner = EnemySpawner(enemy_list, clock, rng=Random(0), profile=profile)
+
+    counts = []
+    for _ in range(int(5.5 / SIMULATION_STEP_SEC)):
+        clock.update(SIMULATION_STEP_SEC)
+        spawner.update(SIMULATION_STEP_SEC)
+        counts.append(len(enemy_list))
+
+    first = counts.index(3)
+    assert first == pytest.approx(1.0 / SIMULATION_STEP_SEC, abs=1)
+    assert [enemy.center_x for enemy in enemy_list][:3] == [SPAWN_X, SPAWN_X + 10.0, SPAWN_X + 20.0]
+    assert all(isinstance(enemy, BasicRunnerCop) for enemy in enemy_list)
+
+    # the burst at 3s only fits two more, and the one at 5s none
+    assert max(counts) == 5
+    assert spawner.next_burst_times == [pytest.approx(7.0)]
@@ -0,0 +1,141 @@
+import PIL.Image
+import pytest
+from arcade import Sprite, SpriteList, Texture, check_for_collision
+
+from CatBurglar.entity.Player import MoveState, Player
+from CatBurglar.entity.collision import (
+    pixel_masks_collide,
+    sweep_interval,
+    swept_collide,
+    swept_collide_path
+)
+from CatBurglar.entity.physics import RunnerPhysicsEngine
+from CatBurglar.input.scripted import ScriptedInput
+
+
+def make_box(width, height, x=0.0, y=0.0, name=None) -> Sprite:
+    sprite = Sprite()
+    sprite.texture = Texture(
+        name or f"box_{width}x{height}",
+        image=PIL.Image.new("RGBA", (width, height), (255, 255, 255, 255))
+    )
+    sprite.position = x, y
+    return sprite
+
+
+def test_sweep_interval_head_on():
+    # a 2 wide box moving 10 right into a 2 wide box 4 away
+    assert sweep_interval((0, 2, 0, 2), (10, 0), (6, 8, 0, 2)) == (pytest.approx(0.4), pytest.approx(0.8))
+
+
+def test_sweep_interval_passing_by():
+    assert sweep_interval((0, 2, 0, 2), (10, 0), (6, 8, 3, 5)) is None
+
+
+def test_sweep_interval_diagonal():
+    # overlaps on x from 0.4 to 0.8, and on y from 0.6 to 1.0
+    assert sweep_interval((0, 2, 0, 2), (10, 5), (6, 8, 5, 7)) == (pytest.approx(0.6), pytest.approx(0.8))
+
+    # the same move clears a box the overlaps on each axis don't line up for
+    assert sweep_interval((0, 2, 0, 2), (10, 5), (6, 8, 0, 1)) is None
+
+
+def test_sweep_interval_standing_still():
+    assert sweep_interval((0, 2, 0, 2), (0, 0), (1, 3, 1, 3)) == (0.0, 1.0)
+    assert sweep_interval((0, 2, 0, 2), (0, 0), (3, 5, 0, 2)) is None
+
+
+@pytest.mark.parametrize("narrow_phase_test", [check_for_collision, pixel_masks_collide])
+def test_fast_enemy_tunneling_through_is_caught(narrow_phase_test):
+    player = make_box(16, 16, 100, 50)
+    # moved from 130 to 70 in one tick, ending clear of the player
+    enemy = make_box(8, 8, 70, 50)
+
+    assert not narrow_phase_test(player, enemy)
+    assert swept_collide(player, (100, 50), enemy, (130, 50), narrow_phase_test)
+
+
+@pytest.mark.parametrize("narrow_phase_test", [check_for_collision, pixel_masks_collide])
+def test_fast_enemy_passing_overhead_is_missed(narrow_phase_test):
+    player = make_box(16, 16, 100, 50)
+    enemy = make_box(8, 8, 70, 63)
+    assert not swept_collide(player, (100, 50), enemy, (130, 63), narrow_phase_test)
+
+
+def test_diagonal_moves_are_swept_together():
+    # the player rises through the lane the enemy crosses, but only after
+    # the enemy is already past
+    player = make_box(8, 8, 100, 80)
+    enemy = make_box(8, 8, 20, 60)
+    assert not swept_collide(player, (100, 40), enemy, (120, 60))
+
+    # slower, so the two are in the lane at once
+    enemy.position = 60, 60
+    assert swept_collide(player, (100, 40), enemy, (120, 60))
+
+
+@pytest.mark.parametrize("enemy_end_x", [20, 60])
+def test_positions_are_restored_after_sampling(enemy_end_x):
+    player = make_box(8, 8, 100, 80)
+    enemy = make_box(8, 8, enemy_end_x, 60)
+    swept_collide(player, (100, 40), enemy, (120, 60))
+
+    assert player.position == (100, 80)
+    assert enemy.position == (enemy_end_x, 60)
+
+
+def test_each_move_of_a_path_is_swept():
+    # the player dips into the lane and back out again within the tick
+    player = make_box(8, 8, 100, 40)
+    path = [(100, 40), (100, 60), (100, 40)]
+
+    early = make_box(8, 8, 60, 60)
+    assert swept_collide_path(player, path, early, (140, 60))
+    assert player.position == (100, 40)
+    assert early.position == (60, 60)
+
+    # straight from start to end never reaches the lane
+    assert not swept_collide(player, path[0], early, (140, 60))
+
+
+def falling_tick(enemy_start_x):
+    """
+    Run one tick in which the player falls through the top of an enemy's
+    lane and lands, while the enemy crosses the whole screen.
+    """
+    key_handler = ScriptedInput()
+    player = Player(key_handler)
+    enemy_list = SpriteList(use_spatial_hash=False)
+    engine = RunnerPhysicsEngine(player, key_handler, enemy_list, ground_level=16)
+
+    # 10px above the ground and falling 12px this tick
+    player.position = 32, 16 + 10 + player.height / 2
+    player.change_y = -12
+    player.move_state = MoveState.FALLING
+
+    # only the top of the player's hit box ever reaches the lane, before it lands
+    enemy = make_box(8, 4, enemy_start_x, player.center_y + 7, name="lane_enemy")
+    enemy.change_x = -100
+    enemy_list.append(enemy)
+    engine.broad_phase.insert(enemy)
+
+    # what GameSimulation.tick does, the sprite lists move before physics
+    player_start = player.position
+    player.update()
+    enemy.update()
+    collisions = engine.update(player_start=player_start)
+
+    # the move took the player below ground, so landing snapped it back up
+    assert player.bottom == 16
+    assert not check_for_collision(player, enemy)
+    return enemy, collisions
+
+
+def test_enemy_crossing_early_in_a_landing_tick_is_caught():
+    enemy, collisions = falling_tick(enemy_start_x=32 + 20)
+    assert collisions == [enemy]
+
+
+def test_enemy_crossing_after_the_landing_is_missed():
+    enemy, collisions = falling_tick(enemy_start_x=32 + 70)
+    assert collisions == []
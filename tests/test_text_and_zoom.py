@@ -0,0 +1,75 @@
+import PIL.Image
+import pytest
+
+from CatBurglar.graphics import text_cache
+from CatBurglar.graphics.pixel_canvas import centered_viewport, integer_zoom
+from CatBurglar.graphics.text_cache import CachedLabel, TextTextureCache
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """
+    Swap text rasterizing for something that doesn't depend on fonts,
+    recording what was rendered.
+    """
+    calls = []
+
+    def get_text_image(text, font_color, font_size, font_name, align, width):
+        calls.append((text, tuple(font_color)))
+        return PIL.Image.new("RGBA", (max(1, len(text)), 1), tuple(font_color))
+
+    monkeypatch.setattr(text_cache, "get_text_image", get_text_image)
+    return calls
+
+
+def test_each_text_and_style_renders_once(rendered):
+    cache = TextTextureCache("test")
+    red = cache.get("Ready", (255, 0, 0))
+
+    assert cache.get("Ready", (255, 0, 0)) is red
+    assert cache.get("Ready", [255, 0, 0], font_name="calibri") is not red
+    assert cache.get("Ready", (255, 0, 0), font_size=20) is not red
+    assert cache.get("Go", (255, 0, 0)) is not red
+    assert len(rendered) == len(cache) == 4
+
+
+def test_texture_names_are_stable(rendered):
+    cache = TextTextureCache("test")
+    names = [cache.get(text, (0, 0, 0)).name for text in ("a", "b", "a", "c")]
+    assert names == ["test/0", "test/1", "test/0", "test/2"]
+    assert [texture.name for texture in cache.textures] == ["test/0", "test/1", "test/2"]
+
+
+def test_labels_switching_back_to_old_text_reuse_textures(rendered):
+    cache = TextTextureCache("test")
+    label = CachedLabel("Press space", cache=cache, center_x=0, center_y=0)
+    first = label.normal_texture, label.hover_texture, label.press_texture
+
+    label.text = "Paused"
+    assert label.normal_texture not in first
+    label.text = "Press space"
+    assert (label.normal_texture, label.hover_texture, label.press_texture) == first
+
+    # once per hover state, and never again for text already shown
+    assert [text for text, color in rendered] == ["Press space"] * 3 + ["Paused"] * 3
+
+
+@pytest.mark.parametrize("window_size, zoom", [
+    ((320, 180), 1),
+    ((640, 360), 2),
+    ((1920, 1080), 6),
+    ((1920, 1200), 6),
+    ((2560, 1080), 6),
+    ((959, 540), 2),
+    ((100, 100), 1),
+])
+def test_integer_zoom_is_the_largest_whole_scale_that_fits(window_size, zoom):
+    assert integer_zoom((320, 180), window_size) == zoom
+
+
+def test_centered_viewport():
+    assert centered_viewport((320, 180), (1920, 1200), 6) == (0, 60, 1920, 1080)
+    assert centered_viewport((320, 180), (1000, 600), 3) == (20, 30, 960, 540)
+
+    # windows smaller than the canvas crop it evenly on both sides
+    assert centered_viewport((320, 180), (300, 160), 1) == (-10, -10, 320, 180)
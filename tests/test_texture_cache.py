@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import PIL.Image
+import pytest
+
+from CatBurglar.util.asset_loading import preload_entity_texture_table
+from CatBurglar.util.texture_cache import (
+    HEADER_STRUCT,
+    SourceStamp,
+    TextureDiskCache,
+    read_cache_entry,
+    write_cache_entry
+)
+
+
+def save_png(path, color=(255, 0, 0, 255), size=(8, 6)):
+    image = PIL.Image.new("RGBA", size, (0, 0, 0, 0))
+    # something other than a plain rectangle so the hit box isn't trivial
+    for x in range(2, size[0] - 1):
+        image.putpixel((x, 1), color)
+        image.putpixel((x, size[1] - 2), color)
+    image.save(path)
+    return image
+
+
+def touch(path, nanoseconds_later=10 ** 9):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + nanoseconds_later))
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "frame.png"
+    save_png(path)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TextureDiskCache(tmp_path / "cache")
+
+
+def test_cold_load_misses_and_warm_load_hits(cache, source):
+    cold = cache.load(source)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.entry_path(source).is_file()
+
+    warm = TextureDiskCache(cache.cache_dir).load(source)
+    assert warm.image.tobytes() == cold.image.tobytes()
+    assert warm.hit_box_points == cold.hit_box_points
+
+
+def test_warm_load_counts_a_hit(cache, source):
+    cache.load(source)
+    cache.load(source)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_touched_but_unchanged_file_is_still_a_hit(cache, source):
+    cache.load(source)
+    touch(source)
+
+    cache.load(source)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # restamped, so the next load doesn't need to hash the file again
+    _, _, stamp = read_cache_entry(cache.entry_path(source))
+    assert stamp.mtime_ns == source.stat().st_mtime_ns
+
+
+def test_edited_file_rebuilds_its_entry(cache, source):
+    cache.load(source)
+    save_png(source, color=(0, 0, 255, 255))
+    touch(source)
+
+    texture = cache.load(source)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert texture.image.getpixel((3, 1)) == (0, 0, 255, 255)
+
+
+def test_corrupt_entry_is_rebuilt(cache, source):
+    cache.load(source)
+    entry = cache.entry_path(source)
+    entry.write_bytes(entry.read_bytes()[:HEADER_STRUCT.size - 1])
+
+    texture = cache.load(source)
+    assert cache.misses == 2
+    assert texture.image.getpixel((3, 1)) == (255, 0, 0, 255)
+    read_cache_entry(entry)
+
+
+def test_prune_deletes_entries_not_loaded(cache, tmp_path, source):
+    stale_source = tmp_path / "stale.png"
+    save_png(stale_source)
+    TextureDiskCache(cache.cache_dir).load(stale_source)
+
+    cache.load(source)
+    assert cache.prune() == 1
+    assert cache.entry_path(source).is_file()
+    assert not cache.entry_path(stale_source).exists()
+
+
+def test_entry_round_trip(tmp_path):
+    image = save_png(tmp_path / "frame.png")
+    points = ((-1.5, -2.0), (1.5, -2.0), (0.0, 2.5))
+    stamp = SourceStamp(123456789, 42, bytes(range(20)))
+    entry = tmp_path / "entry.cbtx"
+
+    write_cache_entry(entry, image, points, stamp)
+    read_image, read_points, read_stamp = read_cache_entry(entry)
+
+    assert read_image.tobytes() == image.tobytes()
+    assert read_points == points
+    assert read_stamp == stamp
+
+
+def test_process_pool_loads_are_counted_and_kept_by_prune(tmp_path):
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    for index in range(4):
+        save_png(frames / f"walk_{index}.png", color=(index * 60, 0, 0, 255))
+
+    stale_source = tmp_path / "stale.png"
+    save_png(stale_source)
+    TextureDiskCache(tmp_path / "cache").load(stale_source)
+
+    serial = preload_entity_texture_table(frames, ["walk"])
+
+    cache = TextureDiskCache(tmp_path / "cache")
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        cold = preload_entity_texture_table(frames, ["walk"], executor=executor, texture_loader=cache)
+        warm = preload_entity_texture_table(frames, ["walk"], executor=executor, texture_loader=cache)
+
+    for loaded in (cold, warm):
+        assert [texture.image.tobytes() for texture in loaded["walk"]] ==\
+            [texture.image.tobytes() for texture in serial["walk"]]
+    assert (cache.hits, cache.misses) == (4, 4)
+
+    assert cache.prune() == 1
+    assert len(list(cache.cache_dir.iterdir())) == 4
@@ -0,0 +1,70 @@
+import PIL.Image
+from arcade import Texture
+
+from CatBurglar.util.asset_loading import preload_entity_texture_alt_skin_table
+from CatBurglar.util.texture_dedupe import TextureDeduplicator
+
+
+def make_texture(name: str, color, size=(4, 4)) -> Texture:
+    return Texture(name, image=PIL.Image.new("RGBA", size, color))
+
+
+def test_identical_pixels_share_the_first_texture():
+    deduplicator = TextureDeduplicator()
+    first = make_texture("first", (255, 0, 0, 255))
+    copy = make_texture("copy", (255, 0, 0, 255))
+
+    assert deduplicator.add(first) is first
+    assert deduplicator.add(copy) is first
+    assert deduplicator.duplicates_found == 1
+    assert deduplicator.bytes_saved == 4 * 4 * 4
+
+
+def test_different_sizes_are_not_shared():
+    deduplicator = TextureDeduplicator()
+    small = make_texture("small", (0, 0, 0, 0), size=(2, 8))
+    tall = make_texture("tall", (0, 0, 0, 0), size=(8, 2))
+
+    assert deduplicator.add(small) is small
+    assert deduplicator.add(tall) is tall
+    assert deduplicator.unique_textures == 2
+
+
+def test_textures_lists_unique_textures_in_order_first_seen():
+    deduplicator = TextureDeduplicator()
+    red = make_texture("red", (255, 0, 0, 255))
+    blue = make_texture("blue", (0, 0, 255, 255))
+
+    table = deduplicator.add_table({
+        "idle": [red, blue],
+        "run": [make_texture("red again", (255, 0, 0, 255)), blue]
+    })
+
+    assert table == {"idle": [red, blue], "run": [red, blue]}
+    assert deduplicator.textures == [red, blue]
+    assert deduplicator.textures_seen == 4
+
+
+def test_non_rgba_images_compare_by_rgba_pixels():
+    deduplicator = TextureDeduplicator()
+    rgba = make_texture("rgba", (10, 20, 30, 255))
+    rgb = Texture("rgb", image=PIL.Image.new("RGB", (4, 4), (10, 20, 30)))
+
+    assert deduplicator.add(rgba) is rgba
+    assert deduplicator.add(rgb) is rgba
+
+
+def test_alt_skins_share_frames_with_identical_pixels(tmp_path):
+    for skin, colors in (("blue", [(0, 0, 255, 255), (9, 9, 9, 255)]), ("red", [(255, 0, 0, 255), (9, 9, 9, 255)])):
+        skin_dir = tmp_path / skin
+        skin_dir.mkdir()
+        for index, color in enumerate(colors):
+            PIL.Image.new("RGBA", (4, 4), color).save(skin_dir / f"walk_{index}.png")
+
+    deduplicator = TextureDeduplicator()
+    blue, red = preload_entity_texture_alt_skin_table(tmp_path, ["walk"], deduplicator=deduplicator)
+
+    assert blue["walk"][0] is not red["walk"][0]
+    assert blue["walk"][1] is red["walk"][1]
+    assert deduplicator.unique_textures == 3
+    assert deduplicator.duplicates_found == 1
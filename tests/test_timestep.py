@@ -0,0 +1,45 @@
+import pytest
+
+from CatBurglar.util import FixedTimestep
+
+
+def test_partial_steps_carry_over_between_frames():
+    timestep = FixedTimestep(step=0.25)
+
+    assert timestep.advance(0.625) == 2
+    assert timestep.accumulator == 0.125
+    assert timestep.alpha == 0.5
+
+    # the leftover eighth plus this one make a whole step
+    assert timestep.advance(0.125) == 1
+    assert timestep.accumulator == 0.0
+    assert timestep.alpha == 0.0
+
+
+def test_frames_shorter_than_a_step_add_up():
+    timestep = FixedTimestep(step=0.25)
+    steps = [timestep.advance(0.0625) for _ in range(16)]
+
+    assert steps == [0, 0, 0, 1] * 4
+    assert timestep.dropped_steps == 0
+
+
+def test_slow_frames_are_clamped_to_max_steps():
+    timestep = FixedTimestep(step=0.25, max_steps=3)
+
+    assert timestep.advance(2.125) == 3
+    assert timestep.dropped_steps == 5
+
+    # the partial step is kept rather than the dropped ones
+    assert timestep.accumulator == 0.125
+    assert timestep.alpha == 0.5
+    assert timestep.advance(0.125) == 1
+    assert timestep.dropped_steps == 5
+
+
+@pytest.mark.parametrize("delta_time", [0.001, 1 / 144, 1 / 60, 1 / 30, 0.2, 3.0])
+def test_alpha_stays_within_a_step(delta_time):
+    timestep = FixedTimestep()
+    for _ in range(200):
+        timestep.advance(delta_time)
+        assert 0.0 <= timestep.alpha < 1.0